@@ -8,9 +8,31 @@ import io
 import os
 import re
 import json
+import uuid
 from PIL import Image
-from helper_functions import get_color_for_score, get_strength_comment, get_improvement_comment, get_recommendations
-from visualization_functions import create_radar_chart, create_gauge_chart, create_bar_chart
+from results_helpers import (
+    get_color_for_score, get_readiness_level, create_radar_chart, create_bar_chart, create_gauge_chart,
+    get_strength_comment, get_improvement_comment, get_recommendations
+)
+from assessment_store import AssessmentStore, DEFAULT_DB_PATH
+from answer_codec import serialize_answers, deserialize_answers, encode_responses, questionnaire_hash
+from report_export import render_html_report
+from report_jobs import ReportJobs
+import perf_timing
+import perf_log
+import metrics
+import perf_profile
+import session_memory
+from scoring_model import (
+    ScoringModel, IncrementalScorer, qlearning_weights, SCORE_SCALE, QLEARNING_DEFAULTS,
+    BOOTSTRAP_RESAMPLES, BOOTSTRAP_CONFIDENCE
+)
+from improvement_planner import plan_improvements, question_costs
+from weight_trainer import load_weights_artifact
+from scoring_profiles import DEFAULT_PROFILE_ID, ScoringProfile, get_profile_model, load_profiles
+from percentile_sketch import OVERALL
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import matplotlib.colors as mcolors
 from matplotlib.figure import Figure
 import matplotlib.patches as mpatches
@@ -26,8 +48,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this rerun when the performance panel (sidebar toggle or ?perf=1), the performance log or metrics are enabled
+perf_timing.start_rerun(
+    st.session_state.get("perf_panel", False) or st.query_params.get("perf") == "1"
+    or perf_log.is_enabled() or metrics.is_enabled()
+)
+
 # Custom CSS to style buttons
-st.markdown("""
+with perf_timing.span("css"):
+    st.markdown("""
 <style>
 /* General button styling */
 button, .stButton>button, div.stButton>button, .stButton>button:focus, .stButton>button:active {
@@ -58,7 +87,7 @@ div[data-testid="stButton"] button {
     font-weight: 600 !important;
 }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
 # Define color theme for the app - enterprise palette
 theme_colors = {
@@ -77,7 +106,8 @@ theme_colors = {
 }
 
 # Add custom CSS for enterprise-level design
-st.markdown("""
+with perf_timing.span("css"):
+    st.markdown("""
 <style>
     /* Google Fonts - Inter */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
@@ -608,10 +638,11 @@ st.markdown("""
         color: white;
     }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
 # Add custom CSS for enhanced styling
-st.markdown("""
+with perf_timing.span("css"):
+    st.markdown("""
 <style>
     /* Google Fonts - Inter */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
@@ -988,7 +1019,7 @@ button p { color: white !important; }
         color: white;
     }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
 # Define the questionnaire categories and their files
 questionnaire_files = {
@@ -1062,6 +1093,55 @@ fallback_questionnaires = {
     }
 }
 
+# Answer levels, in the order of the questionnaire's answer options
+ANSWER_LEVEL_NAMES = ["Not Implemented", "Initial", "Defined", "Managed", "Optimized"]
+
+# Number of highest-leverage questions listed on the Results page
+TOP_IMPROVEMENTS = 10
+
+# Overall scores where the readiness levels start (see get_readiness_level); the improvement plan
+# aims for the next one by default
+READINESS_THRESHOLDS = [30, 60, 80, 100]
+
+# Per-session caches, in the order they give way when a session exceeds its memory budget:
+# (key, n) keeps the last n items, (key, 0) evicts the key (it is rebuilt on demand)
+SESSION_CACHE_COMPACTION = [
+    ("perf_reruns", 50),
+    ("profile_paths", 5),
+    ("score_preview", 0),
+    ("perf_reruns", 0),
+]
+
+# Session state key holding the latest memory measurement (not charged to the session itself)
+SESSION_MEMORY_KEY = "session_memory"
+
+# Session state key holding the live score preview's incremental scorer
+SCORE_PREVIEW_KEY = "score_preview"
+
+# How the live score preview treats questions not answered yet (see scoring_model.UNANSWERED_POLICIES)
+UNANSWERED_POLICY_OPTIONS = {
+    "Leave them out": "exclude",
+    "Count as Not Implemented": "not_implemented",
+    "Count as Defined": "defined",
+}
+
+# Industries and organisation sizes an assessment can be filed under, for benchmarking against peers
+# (the first option is stored as unspecified)
+INDUSTRY_OPTIONS = [
+    "Not specified", "Financial services", "Healthcare", "Manufacturing", "Retail", "Technology",
+    "Telecommunications", "Energy & utilities", "Public sector", "Education", "Professional services", "Other",
+]
+ORGANISATION_SIZE_OPTIONS = [
+    "Not specified", "1-49 employees", "50-249 employees", "250-999 employees", "1,000-9,999 employees",
+    "10,000+ employees",
+]
+
+# Fewest assessments a benchmark population needs before the Results page shows percentiles against it
+BENCHMARK_MIN_ASSESSMENTS = 10
+
+# Seconds a process reuses benchmark sketches before reading them from the store again
+BENCHMARK_REFRESH_SECONDS = 60
+
 # Helper function to convert matplotlib fig to a format Streamlit can display
 def matplotlib_to_image(fig):
     buf = BytesIO()
@@ -1070,63 +1150,6 @@ def matplotlib_to_image(fig):
     img_str = base64.b64encode(buf.read()).decode()
     return f"data:image/png;base64,{img_str}"
 
-# Function to create a premium-looking radar chart with matplotlib
-def create_radar_chart(categories, values, title):
-    # Convert values to 0-100 scale
-    values_100 = [v * 100 / 4 for v in values]
-    
-    # Number of categories
-    N = len(categories)
-    
-    # Create angles for each category (in radians)
-    angles = [n / float(N) * 2 * np.pi for n in range(N)]
-    angles += angles[:1]  # Close the loop
-    
-    # Values also need to close the loop
-    values_100_closed = values_100 + values_100[:1]
-    
-    # Create figure and polar axis
-    plt.figure(figsize=(10, 8), facecolor='white')
-    ax = plt.subplot(111, polar=True)
-    
-    # Set background color
-    ax.set_facecolor('#F8F9FA')
-    
-    # Draw grid lines with custom style
-    plt.grid(color='gray', alpha=0.15)
-    
-    # Plot data
-    ax.plot(angles, values_100_closed, 'o-', linewidth=2.5, color=theme_colors["primary"], 
-            markersize=10, markerfacecolor=theme_colors["secondary"], markeredgecolor=theme_colors["primary"])
-    
-    # Fill area
-    ax.fill(angles, values_100_closed, alpha=0.25, color=theme_colors["secondary"])
-    
-    # Set radar chart axis limits
-    ax.set_ylim(0, 100)
-    
-    # Set category labels
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(categories, fontsize=12, fontweight='bold')
-    
-    # Add a title
-    plt.title(title, fontsize=16, fontweight='bold', pad=20, color=theme_colors["primary"])
-    
-    # Add score labels at each point
-    for angle, value in zip(angles[:-1], values_100):
-        ax.text(angle, value + 5, f"{value:.1f}%", 
-                ha='center', va='center', fontsize=10, fontweight='bold',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8, edgecolor=theme_colors["primary"]))
-    
-    # Adjust radial axes
-    ax.set_rgrids([20, 40, 60, 80, 100], angle=45, fontsize=9)
-    
-    # Convert to image
-    img = matplotlib_to_image(plt)
-    plt.close()
-    
-    return img
-
 # Function to create a bar chart with matplotlib for category scores
 def create_category_bar_chart(categories, scores, title):
     # Set seaborn style
@@ -1218,82 +1241,6 @@ def create_qvalue_weight_heatmap(categories, q_values, weights, title):
     
     return img
 
-# Function to create a gauge chart for the overall score
-def create_gauge_chart(score, title):
-    # Configure the figure
-    fig = plt.figure(figsize=(10, 6), facecolor='white')
-    ax = fig.add_subplot(111)
-    
-    # Hide axes
-    ax.set_axis_off()
-    
-    # Set score (0-100 scale)
-    score_100 = score * 100 / 4
-    
-    # Define gauge colors and ranges
-    cmap = LinearSegmentedColormap.from_list('gauge_colors', ['#FF5252', '#FFAB40', '#FFEE58', '#66BB6A'])
-    norm = mpl.colors.Normalize(vmin=0, vmax=100)
-    
-    # Create the gauge background
-    theta = np.linspace(3*np.pi/4, 9*np.pi/4, 100)
-    radius = 1.0
-    
-    # Draw the gauge outline
-    x = radius * np.cos(theta)
-    y = radius * np.sin(theta)
-    ax.plot(x, y, color='black', linewidth=2.5)
-    
-    # Draw colored segments
-    for t in np.linspace(3*np.pi/4, 9*np.pi/4, 100):
-        segment_value = 100 * (t - 3*np.pi/4) / (6*np.pi/4)
-        color = cmap(norm(segment_value))
-        segment_width = 0.1
-        ax.plot([radius * np.cos(t), (radius - segment_width) * np.cos(t)],
-                [radius * np.sin(t), (radius - segment_width) * np.sin(t)],
-                color=color, linewidth=3)
-    
-    # Draw segment labels
-    labels = ["Low", "Moderate", "High", "Excellent"]
-    positions = [15, 45, 70, 90]
-    for i, label in enumerate(labels):
-        angle = 3*np.pi/4 + (positions[i] / 100) * (6*np.pi/4)
-        ax.text(angle, radius + 0.1, label, 
-                ha='center', va='center', fontsize=10, 
-                color='#475569', fontweight='medium',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8, edgecolor=theme_colors["primary"]))
-    
-    # Draw tick marks
-    for value, angle in zip([0, 25, 50, 75, 100], [3*np.pi/4, 3*np.pi/4 + (25/100) * (6*np.pi/4), 3*np.pi/4 + (50/100) * (6*np.pi/4), 3*np.pi/4 + (75/100) * (6*np.pi/4), 9*np.pi/4]):
-        ax.text(0.95 * np.cos(angle), 0.95 * np.sin(angle), f"{value}%", 
-                ha='center', va='center', fontsize=9)
-    
-    # Draw the needle
-    needle_angle = 3*np.pi/4 + (score_100/100) * (6*np.pi/4)
-    ax.plot([0, 0.7 * np.cos(needle_angle)], [0, 0.7 * np.sin(needle_angle)], 
-            color='#E53935', linewidth=4)
-    
-    # Draw the center circle
-    circle = plt.Circle((0, 0), 0.1, color='#E53935', fill=True)
-    ax.add_patch(circle)
-    
-    # Add score text in the center
-    ax.text(0, -0.2, f"{score_100:.1f}%", ha='center', va='center', 
-            fontsize=24, fontweight='bold', color='#212121')
-    
-    # Add title
-    ax.text(0, -0.5, title, ha='center', va='center', 
-            fontsize=16, fontweight='bold', color=theme_colors["primary"])
-    
-    # Set limits
-    ax.set_xlim(-1, 1)
-    ax.set_ylim(-1, 1)
-    
-    # Convert to image
-    img = matplotlib_to_image(fig)
-    plt.close()
-    
-    return img
-
 # Function to extract questionnaire data directly from a Python file
 def extract_questionnaire_data(file_path):
     # Initial questionnaire structure
@@ -1358,6 +1305,335 @@ def load_all_questionnaires():
     
     return all_questionnaires
 
+# Shared assessment store (one per process, shared by all sessions)
+@st.cache_resource
+def get_assessment_store():
+    return AssessmentStore(DEFAULT_DB_PATH)
+
+# Function to save the current session's assessment to the store
+def save_current_assessment(questionnaires, status="draft", scores=None, overall_score=None, scoring_profile=None):
+    store = get_assessment_store()
+    layout_hash = store.register_questionnaire(questionnaires)
+    store.save_assessment(
+        st.session_state.assessment_id,
+        encode_responses(st.session_state.responses, questionnaires),
+        layout_hash,
+        organisation=st.session_state.organisation,
+        status=status,
+        scores=scores,
+        overall_score=overall_score,
+        scoring_profile=scoring_profile,
+        industry=segment_value(st.session_state.industry),
+        size_band=segment_value(st.session_state.size_band)
+    )
+
+# Function to return the stored value of an industry or size option (None for "Not specified")
+def segment_value(option):
+    return None if option in (INDUSTRY_OPTIONS[0], ORGANISATION_SIZE_OPTIONS[0]) else option
+
+# Benchmark sketches of the assessments scored with a profile version, optionally of one industry and/or size,
+# read at most every BENCHMARK_REFRESH_SECONDS per process. Each sketch is a fixed-size histogram kept up to date
+# by the store as assessments are submitted, so nothing here grows with the number of assessments.
+@st.cache_data(ttl=BENCHMARK_REFRESH_SECONDS, max_entries=256, show_spinner=False)
+def load_benchmark(profile_version, layout_hash, industry, size_band):
+    with perf_timing.span("benchmark"):
+        return get_assessment_store().benchmark_sketches(profile_version, layout_hash, industry, size_band)
+
+# Prometheus metrics endpoint (one per process), if AI_READINESS_METRICS_PORT is set
+@st.cache_resource
+def get_metrics_server():
+    try:
+        return metrics.start_metrics_server()
+    except OSError as exc:
+        # e.g. another app process on this host already serves the port
+        st.warning(f"Metrics endpoint could not be started: {exc}")
+        return None
+
+# Optional per-question effort costs for improvement plans, read once per process from the JSON file
+# named by AI_READINESS_EFFORT_COSTS ({dimension: cost or {sub-category: cost or [cost per question]}})
+@st.cache_resource
+def get_effort_cost_spec():
+    path = os.environ.get("AI_READINESS_EFFORT_COSTS")
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError) as exc:
+        st.warning(f"Effort costs could not be loaded, so every answer level counts the same: {exc}")
+        return None
+
+# Outcome-trained Q-values and weights from weight_trainer.py, read once per process from the artifact at
+# AI_READINESS_WEIGHTS (default scoring_weights.json next to the app); None when there is no artifact
+@st.cache_resource
+def get_trained_weights():
+    try:
+        return load_weights_artifact()
+    except (OSError, ValueError) as exc:
+        st.warning(f"Trained scoring weights could not be loaded, so their scoring profile is not offered: {exc}")
+        return None
+
+# Scoring profiles from scoring_profiles.json (AI_READINESS_SCORING_PROFILES) plus the trained weights artifact's,
+# read once per process; returns ({profile id: profile}, default profile id)
+@st.cache_resource
+def get_scoring_profiles():
+    try:
+        return load_profiles(weights_artifact=get_trained_weights())
+    except (OSError, ValueError, KeyError) as exc:
+        st.warning(f"Scoring profiles could not be loaded, so results use flat averages: {exc}")
+        return {DEFAULT_PROFILE_ID: ScoringProfile(DEFAULT_PROFILE_ID, "flat", name="Flat average")}, DEFAULT_PROFILE_ID
+
+# Function to return the scoring profiles that apply to the questionnaires and the default among them.
+# Each is compiled into its scoring model on first use in the process, so scoring only selects one by ID.
+def available_scoring_profiles(questionnaires):
+    profiles, default_id = get_scoring_profiles()
+    layout_hash = questionnaire_hash(questionnaires)
+    available = {profile_id: profile for profile_id, profile in profiles.items() if profile.applies_to(layout_hash)}
+    for profile in available.values():
+        get_profile_model(profile, questionnaires)
+    return available, default_id if default_id in available else DEFAULT_PROFILE_ID
+
+# Function to return the compiled scoring model of a profile
+def profile_scoring_model(profile_id, questionnaires):
+    return get_profile_model(get_scoring_profiles()[0][profile_id], questionnaires)
+
+# Function to return the scoring profile selected for this session
+def session_scoring_profile():
+    return get_scoring_profiles()[0][st.session_state.scoring_profile]
+
+# Background PDF report workers (one pool per process, shared by all sessions)
+@st.cache_resource
+def get_report_jobs():
+    workers = os.environ.get("AI_READINESS_REPORT_WORKERS")
+    return ReportJobs(max_workers=int(workers) if workers else 2)
+
+# Function to rerun this session's script when a background job finishes, so nothing waits on the script thread
+# in between. Returns False without a Streamlit server to ask (e.g. bare mode, or AppTest's mock runtime), where
+# the page offers a refresh.
+def rerun_session_when_done(future):
+    ctx = get_script_run_ctx()
+    session_mgr = getattr(Runtime.instance(), "_session_mgr", None) if ctx is not None and Runtime.exists() else None
+    if session_mgr is None:
+        return False
+    session_id = ctx.session_id
+    
+    def rerun(_):
+        # The server may have stopped while the job ran
+        if not Runtime.exists():
+            return
+        session_info = session_mgr.get_active_session_info(session_id)
+        if session_info is not None:
+            # With the session's last client state, as Streamlit does on a source change, so query parameters
+            # (e.g. a results link) and widget values carry over
+            session_info.session.request_rerun(session_info.session._client_state)
+    
+    future.add_done_callback(rerun)
+    return True
+
+# Function to restore an in-progress assessment from its saved draft in a single read
+def resume_draft(questionnaires):
+    assessment_id = st.query_params.get("assessment")
+    if not assessment_id:
+        return
+    
+    store = get_assessment_store()
+    draft = store.load_draft(assessment_id)
+    if draft is None or draft["questionnaire_hash"] != store.register_questionnaire(questionnaires):
+        return
+    
+    try:
+        responses = deserialize_answers(draft["answers"], questionnaires)
+    except ValueError:
+        return
+    
+    st.session_state.responses = responses
+    st.session_state.assessment_id = assessment_id
+    st.session_state.organisation = draft["organisation"] or ""
+    st.session_state.draft_saved_answers = draft["answers"]
+    st.session_state.assessment_started = True
+    st.session_state.nav = "Assessment"
+
+# Function to autosave the in-progress assessment as a compact draft
+def autosave_draft(questionnaires, flush=False):
+    store = get_assessment_store()
+    answers = serialize_answers(st.session_state.responses, questionnaires)
+    
+    # Only queue a write when the answers changed; the store coalesces queued drafts on its timer
+    if answers != st.session_state.get("draft_saved_answers"):
+        store.save_draft(
+            st.session_state.assessment_id,
+            answers,
+            store.register_questionnaire(questionnaires),
+            organisation=st.session_state.organisation
+        )
+        st.session_state.draft_saved_answers = answers
+    
+    if flush:
+        store.flush()
+
+# Function to start a fresh assessment with a new identifier
+def start_new_assessment():
+    st.session_state.responses = {}
+    st.session_state.assessment_id = uuid.uuid4().hex
+    st.session_state.draft_saved_answers = None
+    clear_results_link()
+
+# Function to drop results permalink parameters from the URL
+def clear_results_link():
+    for param in ("assessment", "results", "profile"):
+        if param in st.query_params:
+            del st.query_params[param]
+
+# Function to calculate the dimension scores shown on the results page (0-100 scale):
+# the weighted average answer of each dimension, and of the dimensions, from a profile's compiled scoring model
+def calculate_dimension_scores(responses, questionnaires, profile_id=DEFAULT_PROFILE_ID):
+    return profile_scoring_model(profile_id, questionnaires).score(responses, questionnaires)
+
+# Helper function to render a matplotlib figure to PNG bytes and release it
+def figure_to_png(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+# Function to compute scores and render charts for an encoded answer set.
+# The result is shared by every session in the process, keyed by the answer token and scoring profile version,
+# so repeat views of the same results (e.g. through a permalink) never recompute anything and a changed profile
+# never serves scores cached under its old weights.
+@st.cache_data(max_entries=1024, show_spinner=False)
+def build_results_view(token, profile_id, profile_version, _questionnaires):
+    responses = deserialize_answers(token, _questionnaires)
+    category_scores, overall_score = calculate_dimension_scores(responses, _questionnaires, profile_id)
+    
+    categories = list(category_scores.keys())
+    scores = [category_scores[cat] for cat in categories]
+    display_categories = [cat.replace('AI ', '') for cat in categories]
+    
+    # Only runs on a cache miss, so this span measures actual chart rendering
+    with perf_timing.span("chart_render"):
+        charts = {
+            "gauge": figure_to_png(create_gauge_chart(overall_score)),
+            "radar": figure_to_png(create_radar_chart(display_categories, scores)),
+            "bar": figure_to_png(create_bar_chart(categories, scores)),
+        }
+    
+    with perf_timing.span("what_if"):
+        improvements = rank_improvements(profile_scoring_model(profile_id, _questionnaires), responses, _questionnaires)
+    
+    return {
+        "token": token,
+        "profile_id": profile_id,
+        "profile_version": profile_version,
+        "category_scores": category_scores,
+        "overall_score": overall_score,
+        "charts": charts,
+        "improvements": improvements,
+    }
+
+# Function to find the questions whose next answers raise the overall score the most:
+# every single-answer improvement is evaluated in one vectorized pass and the best per question kept
+def rank_improvements(model, responses, questionnaires, limit=TOP_IMPROVEMENTS):
+    ranked = model.rank_improvements(model.answers_array(responses, questionnaires), per_question=True, limit=limit)
+    
+    improvements = []
+    for question, from_level, to_level, overall_gain, gain_per_step in zip(
+        ranked["question"], ranked["from_level"], ranked["to_level"], ranked["overall_gain"], ranked["gain_per_step"]
+    ):
+        category, q_category, j = model.question_slots[question]
+        improvements.append({
+            "category": category,
+            "q_category": q_category,
+            "question": questionnaires[category][q_category][j],
+            "from_level": None if np.isnan(from_level) else int(from_level),
+            "to_level": int(to_level),
+            "overall_gain": float(overall_gain),
+            "gain_per_step": float(gain_per_step),
+        })
+    return improvements
+
+# Function to plan the least-effort answer improvements that reach a target overall score.
+# Keyed like build_results_view plus the target, so each plan is solved once per process.
+@st.cache_data(max_entries=1024, show_spinner=False)
+def build_improvement_plan(token, profile_id, profile_version, target, _questionnaires):
+    responses = deserialize_answers(token, _questionnaires)
+    model = profile_scoring_model(profile_id, _questionnaires)
+    answers = model.answers_array(responses, _questionnaires)
+    with perf_timing.span("improvement_plan"):
+        plan = plan_improvements(
+            model,
+            answers,
+            target_overall=target,
+            costs=question_costs(model, get_effort_cost_spec())
+        )
+    
+    steps = []
+    dimension_gains = {}
+    for question, from_level, to_level, cost, overall_gain in zip(
+        plan["question"], plan["from_level"], plan["to_level"], plan["cost"], plan["overall_gain"]
+    ):
+        category, q_category, j = model.question_slots[question]
+        steps.append({
+            "category": category,
+            "q_category": q_category,
+            "question": _questionnaires[category][q_category][j],
+            "from_level": int(from_level),
+            "to_level": int(to_level),
+            "cost": float(cost),
+            "overall_gain": float(overall_gain),
+        })
+        dimension_gains[category] = dimension_gains.get(category, 0.0) + float(overall_gain)
+    
+    return {
+        "target": target,
+        "steps": steps,
+        "dimension_gains": dimension_gains,
+        "unanswered": int(np.isnan(answers).sum()),
+        "start_overall": plan["start_overall"],
+        "total_cost": plan["total_cost"],
+        "projected_overall": plan["projected_overall"],
+        "feasible": plan["feasible"],
+    }
+
+# Function to compute bootstrap confidence intervals for a results view and render the bar chart with error bars.
+# Keyed like build_results_view, so the resamples are scored once per distinct result and only when asked for.
+@st.cache_data(max_entries=1024, show_spinner=False)
+def build_score_intervals(token, profile_id, profile_version, _questionnaires):
+    responses = deserialize_answers(token, _questionnaires)
+    model = profile_scoring_model(profile_id, _questionnaires)
+    category_scores, _ = calculate_dimension_scores(responses, _questionnaires, profile_id)
+    categories = list(category_scores.keys())
+    scores = [category_scores[cat] for cat in categories]
+    
+    # Its own stage rather than chart_render, which marks a results view cache miss
+    with perf_timing.span("bootstrap"):
+        intervals = model.bootstrap_intervals(model.answers_array(responses, _questionnaires))
+        dimension_intervals = {
+            category: tuple(intervals["dimensions"][0][model.dimensions.index(category)].tolist())
+            for category in categories
+        }
+        errors = [
+            (max(score - dimension_intervals[cat][0], 0.0), max(dimension_intervals[cat][1] - score, 0.0))
+            for cat, score in zip(categories, scores)
+        ]
+        bar = figure_to_png(create_bar_chart(categories, scores, errors=errors))
+    
+    return {
+        "dimensions": dimension_intervals,
+        "overall": tuple(intervals["overall"][0].tolist()),
+        "bar": bar,
+    }
+
+# Function to return the default plan target: the start of the next readiness level
+def next_readiness_target(score):
+    return next((threshold for threshold in READINESS_THRESHOLDS if threshold > score), READINESS_THRESHOLDS[-1])
+
+# Function to render the self-contained HTML report for a results view.
+# Keyed like build_results_view, so each distinct result is rendered once per process.
+@st.cache_data(max_entries=256, show_spinner=False)
+def build_html_report(token, profile_version, organisation, _category_scores, _overall_score):
+    with perf_timing.span("html_render"):
+        return render_html_report(_category_scores, _overall_score, organisation=organisation or None)
+
 # Function to calculate scores using Q-learning
 def calculate_scores(responses):
     category_scores = {}
@@ -1367,301 +1643,149 @@ def calculate_scores(responses):
     
     # For each assessment category (Governance, Culture, etc.)
     for assessment_category, assessment_data in responses.items():
-        # Initialize category scores for this assessment
-        category_scores[assessment_category] = {}
-        
-        # Calculate mean score for each question category
-        for question_category, answers in assessment_data.items():
-            if answers:  # Only calculate if there are answers
-                category_scores[assessment_category][question_category] = np.mean(answers)
-        
         # Initialize Q-values for this assessment
         q_values[assessment_category] = {cat: np.random.uniform(0, 1) for cat in assessment_data.keys()}
         
-        # Q-learning parameters
-        alpha = 0.1  # Learning rate
-        gamma = 0.9  # Discount factor
-        reward = 1  # Assume a reward of 1 for simplicity
-        
-        # Update Q-values
-        for _ in range(10):
-            for cat in assessment_data.keys():
-                if cat in q_values[assessment_category]:
-                    q_values[assessment_category][cat] = q_values[assessment_category][cat] + alpha * (
-                        reward + gamma * max(q_values[assessment_category].values()) - q_values[assessment_category][cat]
-                    )
-        
-        # Calculate softmax weights
-        eta = 1.0
-        q_vals = np.array(list(q_values[assessment_category].values()))
-        exp_q_values = np.exp(eta * q_vals)
-        softmax_weights[assessment_category] = exp_q_values / np.sum(exp_q_values)
-        
-        # Calculate overall score for this assessment
-        if category_scores[assessment_category]:
-            overall_scores[assessment_category] = sum(
-                category_scores[assessment_category][cat] * softmax_weights[assessment_category][i] 
-                for i, cat in enumerate(assessment_data.keys())
-                if cat in category_scores[assessment_category]
-            )
+        # Q-learning updates and softmax weights, with the parameters in QLEARNING_DEFAULTS
+        final_q, weights = qlearning_weights(list(q_values[assessment_category].values()), **QLEARNING_DEFAULTS)
+        q_values[assessment_category] = dict(zip(assessment_data.keys(), final_q[0].tolist()))
+        softmax_weights[assessment_category] = weights[0]
+    
+    # Score every level in one pass with the softmax weights folded into the aggregation matrices.
+    # The responses have the questionnaire's shape, so they serve as the layout.
+    model = ScoringModel(responses, sub_category_weights=softmax_weights)
+    result = model.score_batch(model.answers_array(responses, responses))
+    
+    # Mean answer of each question category and weighted score of each assessment (0-4 scale)
+    for (assessment_category, question_category), score in zip(model.sub_categories, result["sub_categories"][0]):
+        category_scores.setdefault(assessment_category, {})
+        if not np.isnan(score):
+            category_scores[assessment_category][question_category] = score / SCORE_SCALE
+    for assessment_category, score in zip(model.dimensions, result["dimensions"][0]):
+        category_scores.setdefault(assessment_category, {})
+        if not np.isnan(score):
+            overall_scores[assessment_category] = score / SCORE_SCALE
     
     return category_scores, q_values, softmax_weights, overall_scores
 
-# Helper functions for results visualization
+# Function to record this rerun's timings for the session and the process
+def record_rerun_timing():
+    if 'perf_reruns' not in st.session_state:
+        st.session_state.perf_reruns = perf_timing.new_session_reruns()
+    rerun = perf_timing.finish_rerun(st.session_state.get("nav", "Home"), st.session_state.perf_reruns)
+    if rerun is not None and perf_log.is_enabled():
+        perf_log.log_rerun(rerun, figures=len(plt.get_fignums()))
+    if rerun is not None and metrics.is_enabled():
+        ctx = get_script_run_ctx()
+        metrics.observe_rerun(rerun, ctx.session_id if ctx else None)
 
-def get_color_for_score(score):
-    """Return a color based on the score value."""
-    if score < 30:
-        return "#EF4444"  # Red for low scores
-    elif score < 60:
-        return "#F59E0B"  # Amber for medium scores
-    elif score < 80:
-        return "#10B981"  # Green for good scores
-    else:
-        return "#0284C7"  # Blue for excellent scores
+# Function to group session state keys for memory accounting (all answer widgets form one entry)
+def session_state_group(key):
+    category = key.split("_", 1)[0]
+    return "answer widgets" if category in questionnaire_files and key != category else key
 
-def create_radar_chart(categories, scores):
-    """Create a radar chart for the category scores."""
-    # Number of variables
-    N = len(categories)
-    
-    # What will be the angle of each axis in the plot
-    angles = [n / float(N) * 2 * np.pi for n in range(N)]
-    angles += angles[:1]  # Close the loop
-    
-    # Scores need to be in the same order and length as angles
-    scores_for_plot = scores.copy()
-    scores_for_plot += scores_for_plot[:1]  # Close the loop
-    
-    # Initialize the figure
-    fig = plt.figure(figsize=(8, 6), facecolor='white')
-    ax = fig.add_subplot(111, polar=True)
-    
-    # Draw one axis per variable and add labels
-    plt.xticks(angles[:-1], categories, color='#475569', size=10)
-    
-    # Draw the y-axis labels (0-100)
-    ax.set_rlabel_position(0)
-    plt.yticks([25, 50, 75, 100], ["25", "50", "75", "100"], color="#475569", size=8)
-    plt.ylim(0, 100)
-    
-    # Plot the scores on the radar chart
-    ax.plot(angles, scores_for_plot, linewidth=2, linestyle='solid', color='#0284C7')
-    ax.fill(angles, scores_for_plot, alpha=0.1, color='#0284C7')
-    
-    # Add a grid
-    ax.grid(True, color='#E2E8F0')
-    
-    # Set the background color
-    ax.set_facecolor('#F8FAFC')
-    
-    # Add a title
-    plt.title('AI Readiness by Dimension', size=14, color='#1E293B', pad=20)
-    
-    # Adjust the layout
-    plt.tight_layout()
+# Function to measure this session's state and compact its caches when it exceeds the budget
+def account_session_memory():
+    budget = session_memory.session_budget_bytes()
+    if budget is None:
+        return
     
-    return fig
+    with perf_timing.span("session_memory"):
+        usage, applied = session_memory.compact_state(
+            st.session_state, budget, SESSION_CACHE_COMPACTION,
+            group=session_state_group, exclude={SESSION_MEMORY_KEY}
+        )
+    st.session_state[SESSION_MEMORY_KEY] = {
+        "total": usage["total"],
+        "keys": usage["keys"],
+        "budget": budget,
+        "compacted": [key for key, _ in applied],
+    }
+    perf_timing.record_size("session_state", usage["total"])
+    if metrics.is_enabled():
+        ctx = get_script_run_ctx()
+        if ctx:
+            metrics.observe_session_memory(ctx.session_id, usage["total"], [key for key, _ in applied])
 
-def create_bar_chart(categories, scores):
-    """Create a horizontal bar chart for category scores."""
-    # Format categories for display
-    display_categories = [cat.replace('AI ', '') for cat in categories]
+# Function to show the opt-in performance panel in the sidebar
+def show_performance_panel():
+    if st.query_params.get("perf") == "1" and 'perf_panel' not in st.session_state:
+        st.session_state.perf_panel = True
     
-    # Create the bar chart
-    fig, ax = plt.figure(figsize=(10, 6)), plt.axes()
-    
-    # Plot horizontal bars
-    bars = ax.barh(display_categories, scores, color='#0284C7', alpha=0.7, height=0.5)
+    if not st.checkbox("Performance panel", key="perf_panel"):
+        return
     
-    # Add value labels to the right of each bar
-    for bar in bars:
-        width = bar.get_width()
-        ax.text(width + 2, bar.get_y() + bar.get_height()/2, f'{int(width)}%',
-                ha='left', va='center', color='#475569', fontweight='bold')
-    
-    # Customize the chart
-    ax.set_xlim(0, 100)
-    ax.set_xlabel('Score (%)', color='#475569')
-    ax.set_title('Dimension Scores', color='#1E293B', pad=20)
-    
-    # Customize the grid
-    ax.grid(axis='x', linestyle='--', alpha=0.7, color='#E2E8F0')
-    ax.set_axisbelow(True)
-    
-    # Remove the frame
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-    
-    # Set background color
-    ax.set_facecolor('#F8FAFC')
-    fig.patch.set_facecolor('#F8FAFC')
-    
-    plt.tight_layout()
-    return fig
-
-def create_gauge_chart(score):
-    """Create a gauge chart for the overall score."""
-    # Define the score ranges and colors
-    ranges = [0, 30, 60, 80, 100]
-    colors = ['#EF4444', '#F59E0B', '#10B981', '#0284C7']
-    
-    # Create the figure
-    fig, ax = plt.subplots(figsize=(4, 4), subplot_kw={'projection': 'polar'})
-    
-    # Set the gauge limits (in radians)
-    start_angle = 3*np.pi/4
-    end_angle = -np.pi/4
-    
-    # Define radius for consistent use
-    radius = 1.0
-    
-    # Plot the colored ranges
-    for i in range(len(ranges)-1):
-        # Convert score range to angles in radians
-        angle1 = start_angle - (ranges[i] / 100) * (start_angle - end_angle)
-        angle2 = start_angle - (ranges[i+1] / 100) * (start_angle - end_angle)
-        
-        # Create a colored region
-        arc = patches.Wedge(
-            (0, 0), radius * 0.9, 
-            np.degrees(angle1), np.degrees(angle2),
-            width=0.2, color=colors[i], alpha=0.6
+    scope = st.radio("Timings for", ["This session", "All sessions"], horizontal=True, key="perf_scope")
+    reruns = list(st.session_state.get("perf_reruns", [])) if scope == "This session" else perf_timing.process_reruns()
+    if reruns:
+        summary = pd.DataFrame.from_dict(perf_timing.summarize(reruns), orient="index")
+        summary.index.name = "Stage"
+        st.dataframe(
+            summary.style.format({"latest": "{:.1f}", "p50": "{:.1f}", "p95": "{:.1f}"}),
+            use_container_width=True
         )
-        ax.add_patch(arc)
-    
-    # Create the pointer for the current score
-    score_angle = start_angle - (score / 100) * (start_angle - end_angle)
-    arrow_length = 0.75
-    
-    # Plot the arrow
-    ax.arrow(0, 0, arrow_length * np.cos(score_angle), arrow_length * np.sin(score_angle),
-             width=0.05, head_width=0.15, head_length=0.15, fc='#1E293B', ec='#1E293B')
-    
-    # Add a circle at the arrow base
-    circle = plt.Circle((0, 0), 0.1, fc='#1E293B', ec='#1E293B')
-    ax.add_patch(circle)
-    
-    # Add score text
-    ax.text(0, -0.2, f'{int(score)}%', ha='center', va='center', fontsize=24, fontweight='bold', color='#1E293B')
-    
-    # Add a label
-    labels = ["Low", "Moderate", "High", "Excellent"]
-    label_positions = [15, 45, 70, 90]
-    for i, label in enumerate(labels):
-        angle = start_angle - (label_positions[i] / 100) * (start_angle - end_angle)
-        ax.text(angle, radius + 0.1, label, 
-                ha='center', va='center', fontsize=8, 
-                color='#475569', fontweight='medium',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8, edgecolor=theme_colors["primary"]))
-    
-    # Draw tick marks
-    for value, angle in zip([0, 25, 50, 75, 100], [3*np.pi/4, 3*np.pi/4 + (25/100) * (6*np.pi/4), 3*np.pi/4 + (50/100) * (6*np.pi/4), 3*np.pi/4 + (75/100) * (6*np.pi/4), 9*np.pi/4]):
-        ax.text(0.95 * np.cos(angle), 0.95 * np.sin(angle), f"{value}%", 
-                ha='center', va='center', fontsize=9)
-    
-    # Remove ticks, labels, and grid
-    ax.set_xticks([])
-    ax.set_yticks([])
-    ax.set_frame_on(False)
-    
-    # Set limits to ensure proper aspect ratio
-    ax.set_ylim(-1, 1)
-    
-    # Set background color
-    ax.set_facecolor('#F8FAFC')
-    fig.patch.set_facecolor('#F8FAFC')
-    
-    return fig
-
-def get_strength_comment(category, score):
-    """Return a comment about the organization's strength in a specific category."""
-    if "Data" in category:
-        return "Strong data management practices and governance provide a solid foundation for AI initiatives."
-    elif "Infrastructure" in category:
-        return "Robust technical infrastructure and computing resources enable efficient AI model training and deployment."
-    elif "Talent" in category:
-        return "Well-developed AI talent acquisition, training, and retention strategies support AI capabilities."
-    elif "Strategy" in category:
-        return "Clear AI strategy aligned with business objectives provides direction for AI initiatives."
-    elif "Culture" in category:
-        return "Strong innovation culture and change management capabilities enable AI adoption."
-    elif "Governance" in category:
-        return "Established governance frameworks ensure ethical and responsible AI implementation."
+        st.caption(f"Milliseconds over the last {len(reruns)} timed reruns")
     else:
-        return "Your organization demonstrates significant strengths in this area."
-
-def get_improvement_comment(category, score):
-    """Return a comment about areas for improvement in a specific category."""
-    if "Data" in category:
-        return "Enhance data quality, accessibility, governance, and management practices to build a stronger foundation for AI."
-    elif "Infrastructure" in category:
-        return "Invest in technical infrastructure, cloud resources, and MLOps capabilities to support AI initiatives."
-    elif "Talent" in category:
-        return "Develop structured talent acquisition, upskilling programs, and retention strategies for AI professionals."
-    elif "Strategy" in category:
-        return "Create a more comprehensive AI strategy aligned with business objectives and develop clear roadmaps."
-    elif "Culture" in category:
-        return "Foster a more innovative culture with stronger change management capabilities to accelerate AI adoption."
-    elif "Governance" in category:
-        return "Establish more robust governance frameworks to ensure ethical, responsible AI implementation."
-    else:
-        return "Focus on improving capabilities in this area to enhance overall AI readiness."
-
-def get_recommendations(category, score):
-    """Return specific recommendations based on category and score."""
-    recommendations = []
-    
-    if "Data" in category:
-        recommendations = [
-            "Implement a comprehensive data governance framework with clear ownership and quality standards",
-            "Develop a centralized data catalog to improve accessibility and discoverability",
-            "Establish data quality monitoring processes specific to AI use cases",
-            "Create standardized data preparation pipelines for common AI scenarios"
-        ]
-    elif "Infrastructure" in category:
-        recommendations = [
-            "Evaluate and scale cloud infrastructure to support AI workloads effectively",
-            "Implement MLOps practices for model deployment, monitoring, and lifecycle management",
-            "Establish a standardized AI development environment with necessary tools and frameworks",
-            "Create clear infrastructure scaling strategies to handle growing AI demands"
-        ]
-    elif "Talent" in category:
-        recommendations = [
-            "Develop a structured AI talent acquisition strategy with clear role definitions",
-            "Create internal upskilling programs for existing technical staff",
-            "Establish partnerships with academic institutions or AI research centers",
-            "Implement knowledge sharing mechanisms for AI expertise across teams"
-        ]
-    elif "Strategy" in category:
-        recommendations = [
-            "Define a clear enterprise AI strategy with specific business outcomes",
-            "Create a prioritized roadmap for AI use cases aligned with business value",
-            "Establish processes to measure and communicate AI initiative ROI",
-            "Develop a structured approach to AI security and risk management"
-        ]
-    elif "Culture" in category:
-        recommendations = [
-            "Foster executive-level AI championship and visible leadership support",
-            "Implement structured change management processes for AI initiatives",
-            "Create mechanisms for cross-functional collaboration on AI projects",
-            "Establish innovation channels for employees to propose AI use cases"
-        ]
-    elif "Governance" in category:
-        recommendations = [
-            "Create a comprehensive AI ethics framework and review process",
-            "Establish AI governance committee with clear responsibilities",
-            "Develop processes for ongoing compliance monitoring of AI systems",
-            "Implement transparent AI documentation standards and model cards"
-        ]
+        st.caption("No reruns timed yet. Interact with the app to collect timings.")
     
-    # Return top 3 recommendations based on score
-    if score < 30:
-        return recommendations[:3]  # Return first 3 for low scores
-    elif score < 60:
-        return recommendations[1:4]  # Return middle 3 for medium scores
-    else:
-        return recommendations[1:]  # Return last 3 for higher scores
+    show_session_memory()
+    show_profiling_controls()
+
+# Function to show this session's memory use by session state key
+def show_session_memory():
+    usage = st.session_state.get(SESSION_MEMORY_KEY)
+    if not usage:
+        return
+    st.markdown("**Session memory**")
+    st.caption(f"{usage['total'] / 1024:.1f} KiB of a {usage['budget'] / 1024:.0f} KiB budget"
+               + (f"; compacted {', '.join(usage['compacted'])}" if usage["compacted"] else ""))
+    st.dataframe(
+        pd.DataFrame(
+            [(key, size / 1024) for key, size in usage["keys"].items()], columns=["Key", "KiB"]
+        ).style.format({"KiB": "{:.1f}"}),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# Function to show the per-session profiling controls and the latest profile's hottest functions
+def show_profiling_controls():
+    st.markdown("**Profiling**")
+    reruns = st.number_input("Reruns to profile", min_value=1, max_value=perf_profile.MAX_PROFILED_RERUNS,
+                             value=3, key="profile_rerun_count")
+    if st.button("Profile next reruns", key="profile_start"):
+        # Profiling starts with the next rerun of this session
+        st.session_state.profile_reruns_remaining = int(reruns)
+    
+    remaining = st.session_state.get("profile_reruns_remaining", 0)
+    if remaining:
+        st.caption(f"Profiling the next {remaining} rerun(s) of this session")
+    
+    profiles = st.session_state.get("profile_paths", [])
+    if not profiles:
+        return
+    path = st.selectbox("Saved profiles", profiles[::-1], format_func=os.path.basename, key="profile_selected")
+    try:
+        total_seconds, rows = perf_profile.top_functions(path)
+    except OSError:
+        st.caption("This profile is no longer on disk.")
+        return
+    st.caption(f"{total_seconds * 1000:.0f} ms profiled. Open {path} with snakeviz or flameprof for a flame graph.")
+    st.dataframe(
+        pd.DataFrame(rows).style.format({"tottime_ms": "{:.1f}", "cumtime_ms": "{:.1f}"}),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# Function to run main(), under cProfile while this session has profiled reruns pending
+def run_main():
+    if not st.session_state.get("profile_reruns_remaining"):
+        main()
+        return
+    
+    st.session_state.profile_reruns_remaining -= 1
+    if 'profile_paths' not in st.session_state:
+        st.session_state.profile_paths = []
+    perf_profile.profile_call(main, st.session_state.get("nav", "Home"), st.session_state.profile_paths)
 
 # Main application function
 def main():
@@ -1679,6 +1803,60 @@ def main():
     if 'nav' not in st.session_state:
         st.session_state.nav = "Home"
     
+    # Identify this assessment for persistence
+    if 'assessment_id' not in st.session_state:
+        st.session_state.assessment_id = uuid.uuid4().hex
+    
+    if 'organisation' not in st.session_state:
+        st.session_state.organisation = ""
+    
+    if 'industry' not in st.session_state:
+        st.session_state.industry = INDUSTRY_OPTIONS[0]
+        st.session_state.size_band = ORGANISATION_SIZE_OPTIONS[0]
+
+    # Benchmark population on the Results page
+    if 'benchmark_industry' not in st.session_state:
+        st.session_state.benchmark_industry = "All industries"
+        st.session_state.benchmark_size = "All sizes"
+    
+    # Kept across pages, so the live preview remembers how unanswered questions count
+    # and the Results page its plan target (reset for each new result)
+    if 'preview_policy' not in st.session_state:
+        st.session_state.preview_policy = next(iter(UNANSWERED_POLICY_OPTIONS))
+    
+    if 'plan_target' not in st.session_state:
+        st.session_state.plan_target = READINESS_THRESHOLDS[0]
+        st.session_state.plan_target_token = None
+    
+    if 'show_intervals' not in st.session_state:
+        st.session_state.show_intervals = False
+    
+    if metrics.is_enabled():
+        get_metrics_server()
+    
+    # Load all questionnaires
+    with perf_timing.span("load_questionnaires"):
+        questionnaires = load_all_questionnaires()
+    
+    # Trained weights and scoring profiles are loaded and compiled on the first run of the process;
+    # later runs only select one
+    scoring_profiles, default_profile_id = available_scoring_profiles(questionnaires)
+    if st.session_state.get('scoring_profile') not in scoring_profiles:
+        st.session_state.scoring_profile = default_profile_id
+    
+    # Streamlit drops the state of widgets a run did not render, and a page change reruns before the sidebar
+    # renders; holding these choices as plain session state keeps them across pages and for the submission
+    for key in ("organisation", "industry", "size_band", "scoring_profile", "preview_policy"):
+        st.session_state[key] = st.session_state[key]
+    
+    # Resume an in-progress assessment when returning through its link
+    if 'draft_checked' not in st.session_state:
+        st.session_state.draft_checked = True
+        if st.query_params.get("results"):
+            st.session_state.nav = "Results"
+        else:
+            resume_draft(questionnaires)
+    
     # App title and description
     st.markdown("""
     <div style="text-align: center; padding: 20px 0;">
@@ -1712,19 +1890,38 @@ def main():
         
         # Update session state based on selection
         if selected_nav != st.session_state.nav:
+            # Leaving the questionnaire flushes the draft so nothing is lost
+            if st.session_state.nav == "Assessment":
+                autosave_draft(questionnaires, flush=True)
+            # A shared results link only applies to the Results page
+            if st.session_state.nav == "Results":
+                for param in ("results", "profile"):
+                    if param in st.query_params:
+                        del st.query_params[param]
             st.session_state.nav = selected_nav
             st.experimental_rerun()
         
+        # Organisation name used to file the assessment
+        st.text_input("Organisation", key="organisation", placeholder="Your organisation name")
+        st.selectbox("Industry", INDUSTRY_OPTIONS, key="industry")
+        st.selectbox("Organisation size", ORGANISATION_SIZE_OPTIONS, key="size_band")
+        
+        # Scoring profile for the preview, submitted scores and results (only offered when there is a choice)
+        if len(scoring_profiles) > 1:
+            st.selectbox("Scoring profile", list(scoring_profiles), key="scoring_profile",
+                         help="How answers are weighted into dimension and overall scores")
+            st.caption(scoring_profiles[st.session_state.scoring_profile].name)
+        
         # Reset button
         if st.button("Reset Assessment", type="secondary"):
-            st.session_state.responses = {}
+            get_assessment_store().discard_draft(st.session_state.assessment_id)
+            start_new_assessment()
             st.session_state.assessment_started = False
             st.session_state.show_results = False
             st.session_state.nav = "Home"
             st.experimental_rerun()
-    
-    # Load all questionnaires
-    questionnaires = load_all_questionnaires()
+        
+        show_performance_panel()
     
     # Display different sections based on navigation
     if st.session_state.nav == "Home":
@@ -1734,15 +1931,27 @@ def main():
             st.error("No questionnaires could be loaded. Please check your installation.")
         else:
             st.session_state.assessment_started = True
-            show_questionnaire(questionnaires)
+            # Keep the assessment addressable so a refresh resumes the draft
+            if st.query_params.get("assessment") != st.session_state.assessment_id:
+                st.query_params["assessment"] = st.session_state.assessment_id
+            with perf_timing.span("questionnaire_widgets"):
+                show_questionnaire(questionnaires)
+            autosave_draft(questionnaires)
     elif st.session_state.nav == "Results":
-        if not st.session_state.responses:
+        if st.query_params.get("results"):
+            show_shared_results(st.query_params.get("results"), st.query_params.get("profile"), questionnaires)
+        elif not st.session_state.responses:
             st.warning("Please complete the assessment first.")
             st.markdown('<style>div.stButton > button:first-child { background-color: #FFFFFF !important; color: #0284C7 !important; }</style>', unsafe_allow_html=True)
             st.button("Start Assessment", on_click=lambda: setattr(st.session_state, 'nav', 'Assessment'))
         else:
             st.session_state.show_results = True
-            show_results()
+            token = serialize_answers(st.session_state.responses, questionnaires)
+            with perf_timing.span("results_view"):
+                profile = session_scoring_profile()
+                view = build_results_view(token, profile.id, profile.version, questionnaires)
+            with perf_timing.span("results_page"):
+                show_results(view, questionnaires)
     elif st.session_state.nav == "About":
         show_about_page()
 
@@ -2058,6 +2267,8 @@ def show_questionnaire(all_questionnaires):
                             # Store the response
                             st.session_state.responses[category][q_category][question_index] = response
     
+    show_score_preview(all_questionnaires)
+    
     # Submit button with enhanced styling
     st.markdown("""
     <div class="submit-container">
@@ -2081,6 +2292,13 @@ def show_questionnaire(all_questionnaires):
                     unanswered_categories.append(f"{category} - {q_category}")
         
         if all_answered:
+            profile = session_scoring_profile()
+            category_scores, overall_score = calculate_dimension_scores(
+                st.session_state.responses, all_questionnaires, profile.id
+            )
+            save_current_assessment(all_questionnaires, status="completed", scores=category_scores,
+                                    overall_score=overall_score, scoring_profile=profile.version)
+            get_assessment_store().discard_draft(st.session_state.assessment_id)
             st.session_state.show_results = True
             st.session_state.assessment_started = False
             # Update navigation to Results page
@@ -2089,28 +2307,66 @@ def show_questionnaire(all_questionnaires):
         else:
             st.error(f"Please answer all questions before submitting. Unanswered sections: {', '.join(unanswered_categories[:3])}{'...' if len(unanswered_categories) > 3 else ''}")
 
-# Function to show the results
-def show_results():
-    # Calculate the overall score and category scores
-    overall_score = 0
-    category_scores = {}
+# Function to show a live preview of the dimension scores in the sidebar while answering.
+# The session's incremental scorer only rescores answers that changed since the last rerun; no charts are drawn.
+def show_score_preview(all_questionnaires):
+    model = profile_scoring_model(st.session_state.scoring_profile, all_questionnaires)
     
-    for category, category_responses in st.session_state.responses.items():
-        category_score = 0
-        question_count = 0
+    with st.sidebar:
+        st.markdown("**Live score preview**")
+        policy_label = st.selectbox("Unanswered questions", list(UNANSWERED_POLICY_OPTIONS), key="preview_policy")
+        policy = UNANSWERED_POLICY_OPTIONS[policy_label]
         
-        for q_category, responses in category_responses.items():
-            for response in responses:
-                if response is not None:
-                    category_score += response
-                    question_count += 1
+        with perf_timing.span("score_preview"):
+            answers = model.answers_array(st.session_state.responses, all_questionnaires)
+            scorer = st.session_state.get(SCORE_PREVIEW_KEY)
+            if scorer is None or scorer.model is not model or scorer.policy != policy:
+                scorer = st.session_state[SCORE_PREVIEW_KEY] = IncrementalScorer(model, answers, policy)
+            else:
+                scorer.set_answers(answers)
         
-        if question_count > 0:
-            avg_category_score = (category_score / question_count) * 25  # Scale to 100
-            category_scores[category] = avg_category_score
-            overall_score += avg_category_score
+        for dimension, score, answered, size in zip(
+            model.dimensions, scorer.dimension_scores, scorer.answered, model.dimension_sizes
+        ):
+            label = dimension.replace('AI ', '')
+            if np.isnan(score):
+                st.progress(0, text=f"{label}: not started")
+            else:
+                st.progress(int(round(score)), text=f"{label}: {score:.0f} ({answered}/{size} answered)")
+        
+        if np.isnan(scorer.overall):
+            st.caption("Answer a question to see your scores.")
+        else:
+            st.progress(int(round(scorer.overall)),
+                        text=f"Overall: {scorer.overall:.0f} ({get_readiness_level(scorer.overall)})")
+
+# Function to show results addressed by a permalink, without any session state
+def show_shared_results(token, profile_id, questionnaires):
+    profiles, default_id = available_scoring_profiles(questionnaires)
+    profile_id = profile_id or default_id
+    if profile_id not in profiles:
+        st.error(f"This results link uses scoring profile '{profile_id}', which is not available. "
+                 f"Results are shown with the default profile '{default_id}'.")
+        profile_id = default_id
+    profile = profiles[profile_id]
+    
+    try:
+        with perf_timing.span("results_view"):
+            view = build_results_view(token, profile.id, profile.version, questionnaires)
+    except ValueError:
+        st.error("This results link is invalid or was created for a different version of the questionnaire.")
+        return
     
-    overall_score = overall_score / len(category_scores) if category_scores else 0
+    with perf_timing.span("results_page"):
+        show_results(view, questionnaires)
+
+# Function to show the results
+def show_results(view, questionnaires):
+    # Scores and charts come precomputed from build_results_view
+    category_scores = view["category_scores"]
+    overall_score = view["overall_score"]
+    charts = view["charts"]
+    perf_timing.record_size("chart_images", sum(len(png) for png in charts.values()))
 
     # Header
     st.markdown("""
@@ -2120,6 +2376,9 @@ def show_results():
     </div>
     """, unsafe_allow_html=True)
     
+    profile = get_scoring_profiles()[0].get(view["profile_id"])
+    st.caption(f"Scored with the {profile.name if profile else view['profile_id']} profile ({view['profile_version']})")
+    
     # Executive summary
     st.markdown("""
     <div class="card primary">
@@ -2136,12 +2395,11 @@ def show_results():
         # Display the overall score with a gauge chart
         st.markdown("<h3>Overall Readiness Score</h3>", unsafe_allow_html=True)
         
-        # Create a gauge chart
-        fig_gauge = create_gauge_chart(overall_score)
-        st.pyplot(fig_gauge)
+        # Display the gauge chart
+        st.image(charts["gauge"], use_column_width=True)
         
         # Readiness level text
-        readiness_level = "Low" if overall_score < 30 else "Moderate" if overall_score < 60 else "High" if overall_score < 80 else "Advanced"
+        readiness_level = get_readiness_level(overall_score)
         st.markdown(f"""
         <div class="card" style="margin-top: 1rem;">
             <h4>AI Readiness Level: <span style="color:{get_color_for_score(overall_score)};">{readiness_level}</span></h4>
@@ -2153,15 +2411,8 @@ def show_results():
         # Display the radar chart
         st.markdown("<h3>Dimension Analysis</h3>", unsafe_allow_html=True)
         
-        # Create and display the radar chart
-        categories = list(category_scores.keys())
-        scores = [category_scores[cat] for cat in categories]
-        
-        # Format categories for display (remove 'AI ' prefix)
-        display_categories = [cat.replace('AI ', '') for cat in categories]
-        
-        fig_radar = create_radar_chart(display_categories, scores)
-        st.pyplot(fig_radar)
+        # Display the radar chart
+        st.image(charts["radar"], use_column_width=True)
     
     # Strength and improvement areas
     st.markdown("<h3>Strengths & Improvement Areas</h3>", unsafe_allow_html=True)
@@ -2222,9 +2473,18 @@ def show_results():
     # Detailed scores section
     st.markdown("<h3>Detailed Dimension Scores</h3>", unsafe_allow_html=True)
     
-    # Create a bar chart for all categories
-    fig_bar = create_bar_chart(categories, scores)
-    st.pyplot(fig_bar)
+    # Display the bar chart for all categories, with bootstrap confidence intervals on request
+    if st.checkbox("Show confidence intervals", key="show_intervals",
+                   help="Each dimension score averages a handful of answers per sub-category, so it is an estimate. "
+                        "The intervals show how much it could vary with a different draw of those answers."):
+        intervals = build_score_intervals(view["token"], view["profile_id"], view["profile_version"], questionnaires)
+        st.image(intervals["bar"], use_column_width=True)
+        overall_low, overall_high = intervals["overall"]
+        st.caption(f"Error bars show {BOOTSTRAP_CONFIDENCE:.0%} bootstrap confidence intervals from "
+                   f"{BOOTSTRAP_RESAMPLES:,} resamples of each sub-category's answers. "
+                   f"Overall score: {overall_score:.0f}% ({overall_low:.0f}-{overall_high:.0f}%).")
+    else:
+        st.image(charts["bar"], use_column_width=True)
     
     # Create columns for the detailed scores with circular visualizations
     cols = st.columns(3)
@@ -2246,15 +2506,124 @@ def show_results():
             </div>
             """, unsafe_allow_html=True)
     
+    # Percentiles against the stored assessments scored with the same profile, optionally of one industry or size
+    st.markdown("<h3>How You Compare</h3>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        industry = st.selectbox("Compare with industry", ["All industries", *INDUSTRY_OPTIONS[1:]],
+                                key="benchmark_industry")
+    with col2:
+        size_band = st.selectbox("Compare with organisation size", ["All sizes", *ORGANISATION_SIZE_OPTIONS[1:]],
+                                 key="benchmark_size")
+    sketches = load_benchmark(
+        view["profile_version"],
+        questionnaire_hash(questionnaires),
+        None if industry == "All industries" else industry,
+        None if size_band == "All sizes" else size_band
+    )
+    population = sketches[OVERALL].total if OVERALL in sketches else 0
+    if population < BENCHMARK_MIN_ASSESSMENTS:
+        st.info(f"Percentiles appear once {BENCHMARK_MIN_ASSESSMENTS} matching assessments have been submitted "
+                f"with this scoring profile ({population} so far).")
+    else:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Dimension": name.replace('AI ', ''),
+                    "Your score": score,
+                    "Percentile": sketches[name].percentile(score),
+                    "Median": sketches[name].quantile(0.5),
+                }
+                for name, score in [*category_scores.items(), (OVERALL, overall_score)]
+                if name in sketches
+            ]).style.format({"Your score": "{:.0f}%", "Percentile": "{:.0f}", "Median": "{:.0f}%"}),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption(f"Percentile is the share of the {population:,} matching assessments that scored lower.")
+    
+    # Single answers with the largest effect on the overall score
+    if view.get("improvements"):
+        st.markdown("<h3>Highest-Leverage Questions</h3>", unsafe_allow_html=True)
+        st.markdown("""
+        <div class="card">
+            <p>Improving your answer to these questions raises your overall score the most for each maturity level gained.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        leverage = pd.DataFrame([
+            {
+                "Dimension": item["category"].replace('AI ', ''),
+                "Question": item["question"],
+                "Current": "Unanswered" if item["from_level"] is None else ANSWER_LEVEL_NAMES[item["from_level"]],
+                "Raise to": ANSWER_LEVEL_NAMES[item["to_level"]],
+                "Overall gain": item["overall_gain"],
+                "Gain per level": item["gain_per_step"],
+            }
+            for item in view["improvements"]
+        ])
+        st.dataframe(
+            leverage.style.format({"Overall gain": "+{:.1f}", "Gain per level": "+{:.2f}"}),
+            use_container_width=True,
+            hide_index=True
+        )
+    
     # Recommendations section
     st.markdown("<h3>Recommended Actions</h3>", unsafe_allow_html=True)
     
-    # Sort categories by score (lowest first)
-    priority_categories = sorted(category_scores.items(), key=lambda x: x[1])
+    # Least-effort plan to a target score; the dimensions it invests in come first below.
+    # The target starts at the next readiness level for each new result.
+    if st.session_state.get("plan_target_token") != view["token"]:
+        st.session_state.plan_target = next_readiness_target(overall_score)
+        st.session_state.plan_target_token = view["token"]
+    target = st.slider("Target overall score", min_value=0, max_value=100, step=1, key="plan_target")
+    plan = build_improvement_plan(view["token"], view["profile_id"], view["profile_version"], target, questionnaires)
+    # The scores above leave unanswered questions out, but a plan needs a level to raise each question from
+    if plan["unanswered"]:
+        st.caption(f"The plan counts the {plan['unanswered']} unanswered questions as {ANSWER_LEVEL_NAMES[0]}, "
+                   f"so it starts from an overall score of {plan['start_overall']:.1f} rather than "
+                   f"{overall_score:.1f}.")
+    if not plan["steps"]:
+        st.success(f"Your overall score of {overall_score:.0f} already meets the target of {target}.")
+    else:
+        outcome = "reaches" if plan["feasible"] else "is the closest you can get to"
+        st.markdown(f"""
+        <div class="card">
+            <h4>Plan to reach {target}</h4>
+            <p>Raising these {len(plan['steps'])} answers {outcome} the target, with a projected overall score of
+            <strong>{plan['projected_overall']:.1f}</strong> for {plan['total_cost']:g} effort points
+            (one point per level unless effort costs are configured).</p>
+        </div>
+        """, unsafe_allow_html=True)
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Dimension": step["category"].replace('AI ', ''),
+                    "Question": step["question"],
+                    "Current": ANSWER_LEVEL_NAMES[step["from_level"]],
+                    "Raise to": ANSWER_LEVEL_NAMES[step["to_level"]],
+                    "Effort": step["cost"],
+                    "Overall gain": step["overall_gain"],
+                }
+                for step in plan["steps"]
+            ]).style.format({"Effort": "{:g}", "Overall gain": "+{:.1f}"}),
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    # Dimensions with the most planned gain first, then the lowest scores
+    planned_gains = plan["dimension_gains"]
+    priority_categories = sorted(category_scores.items(), key=lambda x: (-planned_gains.get(x[0], 0.0), x[1]))
     
     for i, (category, score) in enumerate(priority_categories[:3]):
         display_name = category.replace('AI ', '')
         recommendations = get_recommendations(category, score)
+        planned_steps = [step for step in plan["steps"] if step["category"] == category]
+        if planned_steps:
+            recommendations = [
+                f"Raise {len(planned_steps)} answer{'s' if len(planned_steps) > 1 else ''} in this dimension "
+                f"(+{planned_gains[category]:.1f} overall), starting with: {planned_steps[0]['question']}"
+            ] + list(recommendations)
         
         st.markdown(f"""
         <div class="card primary">
@@ -2281,6 +2650,16 @@ def show_results():
         </div>
         """, unsafe_allow_html=True)
     
+    # Permalink for sharing these results
+    st.markdown("<h3>Share Results</h3>", unsafe_allow_html=True)
+    st.markdown("""
+    <div class="card">
+        <p>Anyone with this link can view these results without retaking the assessment. 
+        Append it to the app address.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    st.code(f"?results={view['token']}&profile={view['profile_id']}", language=None)
+    
     # Next steps and export options
     st.markdown("<h3>Next Steps</h3>", unsafe_allow_html=True)
     
@@ -2295,7 +2674,7 @@ def show_results():
         """, unsafe_allow_html=True)
         
         if st.button("New Assessment", type="primary", use_container_width=True):
-            st.session_state.responses = {}
+            start_new_assessment()
             st.session_state.show_results = False
             st.session_state.assessment_started = True
             st.session_state.nav = "Assessment"
@@ -2305,7 +2684,7 @@ def show_results():
         st.markdown("""
         <div class="card">
             <h4>Export Results</h4>
-            <p>Download your assessment results as a PDF report.</p>
+            <p>Download your assessment results as a standalone HTML or PDF report.</p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -2318,8 +2697,60 @@ def show_results():
         }
         </style>
         """, unsafe_allow_html=True)
+        if st.button("Export as HTML", use_container_width=True):
+            st.session_state.html_report_token = view["token"]
+        
+        # Both reports are prepared for the session's organisation
+        organisation = st.session_state.get("organisation", "")
+        
+        # The report is rendered once on request, then offered as a single self-contained file
+        if st.session_state.get("html_report_token") == view["token"]:
+            with perf_timing.span("html_report_lookup"):
+                html_report = build_html_report(view["token"], view["profile_version"], organisation,
+                                                category_scores, overall_score)
+            perf_timing.record_size("html_report", len(html_report))
+            st.download_button(
+                "Download HTML Report",
+                data=html_report,
+                file_name="ai-readiness-report.html",
+                mime="text/html",
+                use_container_width=True
+            )
+        
+        # PDFs render in background worker processes; identical results share one job and file
+        pdf_key = (view["token"], view["profile_version"], organisation)
         if st.button("Export as PDF", use_container_width=True):
-            st.info("PDF export functionality will be available in the next version.")
+            get_report_jobs().submit(pdf_key, category_scores, overall_score, organisation or None)
+            st.session_state.pdf_report_key = pdf_key
+        
+        if st.session_state.get("pdf_report_key") == pdf_key:
+            pdf_job = get_report_jobs().get(pdf_key) or get_report_jobs().submit(
+                pdf_key, category_scores, overall_score, organisation or None
+            )
+            if not pdf_job.done():
+                st.info("Generating your PDF report...")
+                # One rerun request per job, made when it finishes
+                if st.session_state.get("pdf_rerun_job") != id(pdf_job):
+                    if rerun_session_when_done(pdf_job):
+                        st.session_state.pdf_rerun_job = id(pdf_job)
+                if st.session_state.get("pdf_rerun_job") != id(pdf_job):
+                    st.button("Check again", use_container_width=True)
+            elif pdf_job.exception() is not None:
+                st.error("The PDF report could not be generated. Please try again.")
+                del st.session_state["pdf_report_key"]
+            else:
+                perf_timing.record_size("pdf_report", len(pdf_job.result()))
+                st.download_button(
+                    "Download PDF Report",
+                    data=pdf_job.result(),
+                    file_name="ai-readiness-report.pdf",
+                    mime="application/pdf",
+                    use_container_width=True
+                )
 
 if __name__ == "__main__":
-    main()
+    try:
+        run_main()
+    finally:
+        account_session_memory()
+        record_rerun_timing()
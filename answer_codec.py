@@ -0,0 +1,176 @@
+"""
+Compact bit-packed encoding of questionnaire answers for URLs, caches and storage
+"""
+import base64
+import hashlib
+import json
+import struct
+
+import numpy as np
+
+# Encoding layout: version byte, first 4 bytes of the questionnaire hash, answer count,
+# then 3 bits per answer (0-4 are answer levels, 7 marks an unanswered question)
+CODEC_VERSION = 1
+BITS_PER_ANSWER = 3
+MAX_ANSWER = 4
+UNANSWERED_CODE = 7
+HEADER = struct.Struct(">B4sH")
+
+
+def questionnaire_hash(all_questionnaires):
+    """
+    Return a short, stable hash identifying the questionnaire layout (dimension, sub-category and question order)
+    """
+    layout = json.dumps(all_questionnaires, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(layout.encode("utf-8")).hexdigest()[:16]
+
+
+def iter_question_slots(all_questionnaires):
+    """
+    Yield (category, question category, question index) for every question in layout order
+    """
+    for category, questionnaire in all_questionnaires.items():
+        for q_category, questions in questionnaire.items():
+            for j in range(len(questions)):
+                yield category, q_category, j
+
+
+def flatten_answers(responses, all_questionnaires):
+    """
+    Return answers as a flat list in layout order, with None for unanswered questions
+    """
+    answers = []
+    for category, q_category, j in iter_question_slots(all_questionnaires):
+        given = responses.get(category, {}).get(q_category, [])
+        answers.append(given[j] if j < len(given) else None)
+    return answers
+
+
+def unflatten_answers(answers, all_questionnaires):
+    """
+    Rebuild the nested responses structure used in session state from a flat answer list
+    """
+    responses = {}
+    for value, (category, q_category, j) in zip(answers, iter_question_slots(all_questionnaires)):
+        responses.setdefault(category, {}).setdefault(q_category, []).append(value)
+    return responses
+
+
+def pack_answers(answers):
+    """
+    Pack a flat answer list into 3 bits per answer (little-endian)
+    """
+    packed = 0
+    for i, value in enumerate(answers):
+        code = UNANSWERED_CODE if value is None else int(value)
+        if code != UNANSWERED_CODE and not 0 <= code <= MAX_ANSWER:
+            raise ValueError(f"Answer {value!r} at position {i} is outside 0-{MAX_ANSWER}")
+        packed |= code << (BITS_PER_ANSWER * i)
+    return packed.to_bytes((BITS_PER_ANSWER * len(answers) + 7) // 8, "little")
+
+
+def unpack_answers(data, count):
+    """
+    Unpack count answers produced by pack_answers()
+    """
+    packed = int.from_bytes(data, "little")
+    mask = (1 << BITS_PER_ANSWER) - 1
+    answers = []
+    for i in range(count):
+        code = (packed >> (BITS_PER_ANSWER * i)) & mask
+        if code == UNANSWERED_CODE:
+            answers.append(None)
+        elif code <= MAX_ANSWER:
+            answers.append(code)
+        else:
+            raise ValueError(f"Invalid answer code {code} at position {i}")
+    return answers
+
+
+def encode_answers(answers, layout_hash):
+    """
+    Encode a flat answer list into the canonical binary form for a questionnaire hash
+    """
+    return HEADER.pack(CODEC_VERSION, bytes.fromhex(layout_hash[:8]), len(answers)) + pack_answers(answers)
+
+
+def decode_answers(data, layout_hash):
+    """
+    Decode canonical binary answers; raises ValueError if the version or questionnaire does not match
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Encoded answers are truncated")
+    version, hash_prefix, count = HEADER.unpack_from(data)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported answer encoding version {version}")
+    if hash_prefix != bytes.fromhex(layout_hash[:8]):
+        raise ValueError("Encoded answers belong to a different questionnaire")
+    body = data[HEADER.size:]
+    if len(body) != (BITS_PER_ANSWER * count + 7) // 8:
+        raise ValueError("Encoded answers have the wrong length")
+    return unpack_answers(body, count)
+
+
+def decode_answers_array(blobs, layout_hash, count):
+    """
+    Decode many canonical answer blobs for one questionnaire at once into an (n, count) float array,
+    NaN for unanswered questions; raises ValueError if any blob does not match
+    """
+    header = HEADER.pack(CODEC_VERSION, bytes.fromhex(layout_hash[:8]), count)
+    size = HEADER.size + (BITS_PER_ANSWER * count + 7) // 8
+    if any(len(blob) != size or blob[:HEADER.size] != header for blob in blobs):
+        raise ValueError("Encoded answers do not all belong to this questionnaire")
+    body = np.frombuffer(b"".join(blobs), dtype=np.uint8).reshape(len(blobs), size)[:, HEADER.size:]
+    bits = np.unpackbits(body, axis=1, bitorder="little")[:, :BITS_PER_ANSWER * count]
+    codes = bits.reshape(len(blobs), count, BITS_PER_ANSWER) @ (1 << np.arange(BITS_PER_ANSWER))
+    if np.any((codes > MAX_ANSWER) & (codes != UNANSWERED_CODE)):
+        raise ValueError("Invalid answer code in encoded answers")
+    return np.where(codes == UNANSWERED_CODE, np.nan, codes.astype(float))
+
+
+def encode_responses(responses, all_questionnaires):
+    """
+    Encode session-state responses into the canonical binary form
+    """
+    return encode_answers(flatten_answers(responses, all_questionnaires), questionnaire_hash(all_questionnaires))
+
+
+def decode_responses(data, all_questionnaires):
+    """
+    Decode canonical binary answers back into session-state responses
+    """
+    answers = decode_answers(data, questionnaire_hash(all_questionnaires))
+    if len(answers) != sum(1 for _ in iter_question_slots(all_questionnaires)):
+        raise ValueError("Encoded answers do not match the questionnaire length")
+    return unflatten_answers(answers, all_questionnaires)
+
+
+def to_token(data):
+    """
+    Return a URL-safe text token for encoded answers
+    """
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def from_token(token):
+    """
+    Return the encoded answers carried by a token from to_token(); raises ValueError if malformed
+    """
+    try:
+        return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Malformed answer token") from exc
+
+
+def serialize_answers(responses, all_questionnaires):
+    """
+    Serialise responses to a URL-safe token (used for drafts and share links)
+    """
+    return to_token(encode_responses(responses, all_questionnaires))
+
+
+def deserialize_answers(token, all_questionnaires):
+    """
+    Rebuild responses from serialize_answers() output; raises ValueError if it does not fit the layout
+    """
+    return decode_responses(from_token(token), all_questionnaires)
@@ -0,0 +1,684 @@
+"""
+SQLite persistence for AI Readiness assessments and their computed scores
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from answer_codec import questionnaire_hash, decode_responses
+from percentile_sketch import OVERALL, SKETCH_BINS, PercentileSketch, score_bins
+
+logger = logging.getLogger(__name__)
+
+# Bump when the table layout changes (and add a migration for older databases to _migrate)
+SCHEMA_VERSION = 1
+
+# Default database location (override with the AI_READINESS_DB environment variable)
+DEFAULT_DB_PATH = os.environ.get(
+    "AI_READINESS_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assessments.db")
+)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS schema_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS questionnaires (
+    hash TEXT PRIMARY KEY,
+    layout TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS assessments (
+    id TEXT PRIMARY KEY,
+    organisation TEXT,
+    industry TEXT,
+    size_band TEXT,
+    status TEXT NOT NULL,
+    questionnaire_hash TEXT NOT NULL REFERENCES questionnaires(hash),
+    answers BLOB NOT NULL,
+    overall_score REAL,
+    scoring_profile TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scores (
+    assessment_id TEXT NOT NULL REFERENCES assessments(id) ON DELETE CASCADE,
+    dimension TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (assessment_id, dimension)
+);
+
+CREATE TABLE IF NOT EXISTS outcomes (
+    assessment_id TEXT PRIMARY KEY REFERENCES assessments(id) ON DELETE CASCADE,
+    outcome REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS benchmark_sketches (
+    scoring_profile TEXT NOT NULL,
+    questionnaire_hash TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    size_band TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    bin INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (scoring_profile, questionnaire_hash, industry, size_band, dimension, bin)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS drafts (
+    assessment_id TEXT PRIMARY KEY,
+    organisation TEXT,
+    questionnaire_hash TEXT NOT NULL,
+    answers TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_assessments_organisation ON assessments (organisation, updated_at);
+CREATE INDEX IF NOT EXISTS idx_assessments_updated ON assessments (updated_at);
+"""
+
+UPSERT_ASSESSMENT_SQL = """
+INSERT INTO assessments (id, organisation, industry, size_band, status, questionnaire_hash, answers, overall_score,
+                         scoring_profile, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    organisation = excluded.organisation,
+    industry = excluded.industry,
+    size_band = excluded.size_band,
+    status = excluded.status,
+    questionnaire_hash = excluded.questionnaire_hash,
+    answers = excluded.answers,
+    overall_score = COALESCE(excluded.overall_score, overall_score),
+    scoring_profile = COALESCE(excluded.scoring_profile, scoring_profile),
+    updated_at = excluded.updated_at
+"""
+
+UPSERT_DRAFT_SQL = """
+INSERT OR REPLACE INTO drafts (assessment_id, organisation, questionnaire_hash, answers, updated_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+UPDATE_SKETCH_SQL = """
+INSERT INTO benchmark_sketches (scoring_profile, questionnaire_hash, industry, size_band, dimension, bin, count)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(scoring_profile, questionnaire_hash, industry, size_band, dimension, bin) DO UPDATE SET
+    count = count + excluded.count
+"""
+
+
+def _connect(db_path):
+    """
+    Open a connection configured for many concurrent readers and one writer per process
+    """
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+class AssessmentStore:
+    """
+    Assessment store backed by SQLite in WAL mode.
+
+    Writes are buffered in memory and flushed by a background thread in a single
+    transaction, so saving an answer never waits on disk. Repeated saves of the same
+    assessment before a flush are coalesced into one row write. Drafts of in-progress
+    assessments are held for draft_flush_interval seconds so a burst of answer changes
+    becomes a single write. get_assessment() and load_draft() check the pending buffer
+    first, so callers always see their latest save; listing and benchmark reads see
+    what the writer has committed, so call flush() first where a read must include
+    the caller's own buffered saves.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, flush_interval=0.5, batch_size=64, draft_flush_interval=5.0):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.draft_flush_interval = draft_flush_interval
+
+        self._local = threading.local()
+        self._pending = {}
+        self._inflight = {}
+        self._pending_drafts = {}
+        self._inflight_drafts = {}
+        self._drafts_due_at = None
+        self._pending_lock = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._registered_hashes = set()
+        self._layouts = {}
+
+        self._writer_conn = _connect(db_path)
+        self._migrate()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="assessment-store-writer", daemon=True)
+        self._writer.start()
+
+    # Schema management
+
+    def _migrate(self):
+        conn = self._writer_conn
+        conn.execute("CREATE TABLE IF NOT EXISTS schema_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = conn.execute("SELECT value FROM schema_meta WHERE key = 'schema_version'").fetchone()
+        current = int(row["value"]) if row else SCHEMA_VERSION
+        if current > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database {self.db_path} uses schema version {current}, newer than supported version {SCHEMA_VERSION}"
+            )
+        conn.executescript(SCHEMA_SQL)
+        conn.execute(
+            "INSERT OR REPLACE INTO schema_meta (key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),)
+        )
+
+    def register_questionnaire(self, all_questionnaires):
+        """
+        Record the questionnaire layout and return its hash; rows are versioned against this hash
+        """
+        layout_hash = questionnaire_hash(all_questionnaires)
+        if layout_hash not in self._registered_hashes:
+            self._read_conn().execute(
+                "INSERT OR IGNORE INTO questionnaires (hash, layout, created_at) VALUES (?, ?, ?)",
+                (layout_hash, json.dumps(all_questionnaires, ensure_ascii=False), time.time())
+            )
+            self._registered_hashes.add(layout_hash)
+        return layout_hash
+
+    def get_questionnaire(self, layout_hash):
+        """
+        Return the questionnaire layout recorded for a hash, or None
+        """
+        if layout_hash not in self._layouts:
+            row = self._read_conn().execute("SELECT layout FROM questionnaires WHERE hash = ?", (layout_hash,)).fetchone()
+            if row is None:
+                return None
+            self._layouts[layout_hash] = json.loads(row["layout"])
+        return self._layouts[layout_hash]
+
+    def record_outcomes(self, outcomes):
+        """
+        Record observed outcomes (e.g. 1 for a successful AI project, 0 otherwise) for completed assessments,
+        as {assessment id: outcome}; returns the ids that matched no stored assessment
+        """
+        self.flush()
+        ids = list(outcomes)
+        with self._write_lock:
+            conn = self._writer_conn
+            known = set()
+            # Chunked to stay under SQLite's limit on query parameters
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                known.update(row["id"] for row in conn.execute(
+                    f"SELECT id FROM assessments WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO outcomes (assessment_id, outcome, recorded_at) VALUES (?, ?, ?)",
+                    [(assessment_id, float(outcome), now) for assessment_id, outcome in outcomes.items()
+                     if assessment_id in known]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [assessment_id for assessment_id in outcomes if assessment_id not in known]
+
+    # Writes (buffered)
+
+    def save_assessment(self, assessment_id, answers, layout_hash, organisation=None, status="draft",
+                        scores=None, overall_score=None, scoring_profile=None, industry=None, size_band=None):
+        """
+        Queue an assessment (answers encoded with answer_codec, and optionally its dimension scores and the
+        version of the scoring profile that produced them) for writing. Saving without scores keeps any stored
+        scores. Completed assessments with scores are counted into the benchmark sketches of their profile,
+        industry and size when written.
+        """
+        now = time.time()
+        record = {
+            "id": assessment_id,
+            "organisation": organisation or None,
+            "industry": industry or None,
+            "size_band": size_band or None,
+            "status": status,
+            "questionnaire_hash": layout_hash,
+            "answers": bytes(answers),
+            "overall_score": overall_score,
+            "scoring_profile": scoring_profile,
+            "scores": dict(scores) if scores else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self._pending_lock:
+            if self._closed:
+                raise RuntimeError("Assessment store is closed")
+            previous = self._pending.get(assessment_id)
+            if previous is not None:
+                record["created_at"] = previous["created_at"]
+            self._pending[assessment_id] = record
+            if len(self._pending) >= self.batch_size:
+                self._pending_lock.notify()
+
+    def save_draft(self, assessment_id, answers, layout_hash, organisation=None):
+        """
+        Queue a serialised in-progress answer set; drafts are written on the draft timer or on flush()
+        """
+        record = {
+            "assessment_id": assessment_id,
+            "organisation": organisation or None,
+            "questionnaire_hash": layout_hash,
+            "answers": answers,
+            "updated_at": time.time(),
+        }
+        with self._pending_lock:
+            if self._closed:
+                raise RuntimeError("Assessment store is closed")
+            self._pending_drafts[assessment_id] = record
+            if self._drafts_due_at is None:
+                self._drafts_due_at = record["updated_at"] + self.draft_flush_interval
+
+    def discard_draft(self, assessment_id):
+        """
+        Queue removal of a draft, e.g. once its assessment has been submitted
+        """
+        with self._pending_lock:
+            self._pending_drafts[assessment_id] = None
+            if self._drafts_due_at is None:
+                self._drafts_due_at = time.time() + self.draft_flush_interval
+
+    def flush(self):
+        """
+        Write all buffered records (including drafts) now
+        """
+        self._flush_pending(include_drafts=True)
+
+    def close(self):
+        """
+        Flush buffered records and stop the writer thread
+        """
+        with self._pending_lock:
+            self._closed = True
+            self._pending_lock.notify()
+        self._writer.join()
+        self._writer_conn.close()
+
+    def _writer_loop(self):
+        while True:
+            with self._pending_lock:
+                if not self._closed and len(self._pending) < self.batch_size:
+                    self._pending_lock.wait(self.flush_interval)
+                closed = self._closed
+            # Any failure is logged and the batch retried on the next pass; letting it escape would
+            # end this thread and leave every later save unwritten
+            try:
+                self._flush_pending(include_drafts=closed)
+            except Exception:
+                logger.exception("Failed to write assessment batch; will retry")
+            if closed:
+                return
+
+    def _flush_pending(self, include_drafts=False):
+        # The write lock serialises the writer thread and flush() callers on the writer connection
+        with self._write_lock:
+            with self._pending_lock:
+                batch = self._pending
+                self._pending = {}
+                self._inflight = batch
+                drafts = {}
+                if include_drafts or (self._drafts_due_at is not None and time.time() >= self._drafts_due_at):
+                    drafts = self._pending_drafts
+                    self._pending_drafts = {}
+                    self._inflight_drafts = drafts
+                    self._drafts_due_at = None
+            if not batch and not drafts:
+                return
+            try:
+                self._write_batch(list(batch.values()), drafts)
+            except Exception:
+                # Put the batch back without clobbering anything saved since
+                with self._pending_lock:
+                    self._pending = {**batch, **self._pending}
+                    self._pending_drafts = {**drafts, **self._pending_drafts}
+                    if self._pending_drafts and self._drafts_due_at is None:
+                        self._drafts_due_at = time.time() + self.draft_flush_interval
+                raise
+            finally:
+                with self._pending_lock:
+                    self._inflight = {}
+                    self._inflight_drafts = {}
+
+    def _write_batch(self, batch, drafts):
+        conn = self._writer_conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(UPSERT_DRAFT_SQL, [
+                (r["assessment_id"], r["organisation"], r["questionnaire_hash"], r["answers"], r["updated_at"])
+                for r in drafts.values() if r is not None
+            ])
+            conn.executemany(
+                "DELETE FROM drafts WHERE assessment_id = ?",
+                [(assessment_id,) for assessment_id, r in drafts.items() if r is None]
+            )
+            # Read before the upsert: a resubmitted assessment's previous scores leave the sketches
+            sketch_changes = self._sketch_changes(batch)
+            conn.executemany(UPSERT_ASSESSMENT_SQL, [
+                (r["id"], r["organisation"], r["industry"], r["size_band"], r["status"], r["questionnaire_hash"],
+                 r["answers"], r["overall_score"], r["scoring_profile"], r["created_at"], r["updated_at"])
+                for r in batch
+            ])
+            scored = [r for r in batch if r["scores"] is not None]
+            conn.executemany("DELETE FROM scores WHERE assessment_id = ?", [(r["id"],) for r in scored])
+            conn.executemany(
+                "INSERT INTO scores (assessment_id, dimension, score) VALUES (?, ?, ?)",
+                [(r["id"], dimension, float(score)) for r in scored for dimension, score in r["scores"].items()]
+            )
+            conn.executemany(UPDATE_SKETCH_SQL, [(*key, change) for key, change in sketch_changes.items() if change])
+            conn.executemany(
+                "DELETE FROM benchmark_sketches WHERE scoring_profile = ? AND questionnaire_hash = ? AND industry = ? "
+                "AND size_band = ? AND dimension = ? AND bin = ? AND count <= 0",
+                [key for key, change in sketch_changes.items() if change < 0]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # Benchmark sketches
+
+    def _sketch_changes(self, batch):
+        """
+        Return {sketch key: count change} for a batch: each completed, scored assessment adds one count per
+        dimension (and overall) and takes away the counts of its previously stored version. A save without
+        scores keeps the stored ones, so they are counted again under its (possibly changed) segment.
+        """
+        conn = self._writer_conn
+        changes = defaultdict(int)
+        stored = {}
+        ids = [r["id"] for r in batch]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            stored.update(
+                (row["id"], dict(row, scores={})) for row in conn.execute(
+                    f"SELECT id, status, industry, size_band, questionnaire_hash, overall_score, scoring_profile "
+                    f"FROM assessments WHERE id IN ({placeholders})", chunk
+                )
+            )
+            for row in conn.execute(
+                f"SELECT assessment_id, dimension, score FROM scores WHERE assessment_id IN ({placeholders})", chunk
+            ):
+                stored[row["assessment_id"]]["scores"][row["dimension"]] = row["score"]
+        for record in stored.values():
+            if record["status"] == "completed":
+                for key in _sketch_keys(record):
+                    changes[key] -= 1
+        for record in batch:
+            if record["status"] != "completed":
+                continue
+            previous = stored.get(record["id"])
+            if previous is not None:
+                # What the upsert keeps of the stored version (see UPSERT_ASSESSMENT_SQL and _write_batch)
+                record = dict(record)
+                for field in ("scores", "overall_score", "scoring_profile"):
+                    if record[field] is None:
+                        record[field] = previous[field]
+            for key in _sketch_keys(record):
+                changes[key] += 1
+        return changes
+
+    def _rebuild_sketches(self):
+        conn = self._writer_conn
+        scores = defaultdict(list)
+        rows = conn.execute(
+            "SELECT a.scoring_profile, a.questionnaire_hash, a.industry, a.size_band, s.dimension, s.score "
+            "FROM assessments a JOIN scores s ON s.assessment_id = a.id "
+            "WHERE a.status = 'completed' AND a.scoring_profile IS NOT NULL "
+            "UNION ALL "
+            "SELECT a.scoring_profile, a.questionnaire_hash, a.industry, a.size_band, ?, a.overall_score "
+            "FROM assessments a WHERE a.status = 'completed' AND a.scoring_profile IS NOT NULL "
+            "AND a.overall_score IS NOT NULL "
+            "AND EXISTS (SELECT 1 FROM scores s WHERE s.assessment_id = a.id)",
+            (OVERALL,)
+        )
+        for profile, layout_hash, industry, size_band, dimension, score in rows:
+            scores[(profile, layout_hash, industry or "", size_band or "", dimension)].append(score)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM benchmark_sketches")
+            for key, values in scores.items():
+                values = np.asarray(values, dtype=float)
+                counts = np.bincount(score_bins(values[np.isfinite(values)]), minlength=SKETCH_BINS)
+                conn.executemany(
+                    "INSERT INTO benchmark_sketches (scoring_profile, questionnaire_hash, industry, size_band, "
+                    "dimension, bin, count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(*key, int(b), int(counts[b])) for b in np.flatnonzero(counts)]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def rebuild_sketches(self):
+        """
+        Rebuild every benchmark sketch from the stored scores (the sketches are otherwise only updated
+        incrementally as assessments are written)
+        """
+        self.flush()
+        with self._write_lock:
+            self._rebuild_sketches()
+
+    def benchmark_sketches(self, scoring_profile, layout_hash, industry=None, size_band=None):
+        """
+        Return {dimension or OVERALL: PercentileSketch} of the completed assessments scored with a profile
+        version, optionally only those of one industry and/or size band ("" for unspecified)
+        """
+        clauses = ["scoring_profile = ?", "questionnaire_hash = ?"]
+        params = [scoring_profile, layout_hash]
+        if industry is not None:
+            clauses.append("industry = ?")
+            params.append(industry)
+        if size_band is not None:
+            clauses.append("size_band = ?")
+            params.append(size_band)
+
+        rows = self._read_conn().execute(
+            f"SELECT dimension, bin, SUM(count) AS n FROM benchmark_sketches WHERE {' AND '.join(clauses)} "
+            f"GROUP BY dimension, bin",
+            params
+        ).fetchall()
+        bins = defaultdict(lambda: ([], []))
+        for row in rows:
+            bins[row["dimension"]][0].append(row["bin"])
+            bins[row["dimension"]][1].append(row["n"])
+        return {dimension: PercentileSketch.from_bins(*pairs) for dimension, pairs in bins.items()}
+
+    # Reads
+
+    def _read_conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _connect(self.db_path)
+            self._local.conn = conn
+        return conn
+
+    def get_assessment(self, assessment_id):
+        """
+        Return a single assessment as a dict (including pending writes), or None.
+        The decoded nested responses are included alongside the encoded answers.
+        """
+        with self._pending_lock:
+            pending = self._pending.get(assessment_id) or self._inflight.get(assessment_id)
+        if pending is not None:
+            return self._decode_record(dict(pending))
+
+        row = self._read_conn().execute("SELECT * FROM assessments WHERE id = ?", (assessment_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["scores"] = self.get_scores(assessment_id)
+        return self._decode_record(record)
+
+    def load_draft(self, assessment_id):
+        """
+        Return the latest draft for an assessment as a dict, or None
+        """
+        with self._pending_lock:
+            for buffer in (self._pending_drafts, self._inflight_drafts):
+                if assessment_id in buffer:
+                    record = buffer[assessment_id]
+                    return dict(record) if record is not None else None
+
+        row = self._read_conn().execute("SELECT * FROM drafts WHERE assessment_id = ?", (assessment_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_scores(self, assessment_id):
+        """
+        Return the stored dimension scores for an assessment
+        """
+        rows = self._read_conn().execute(
+            "SELECT dimension, score FROM scores WHERE assessment_id = ?", (assessment_id,)
+        ).fetchall()
+        return {row["dimension"]: row["score"] for row in rows} or None
+
+    def list_assessments(self, organisation=None, status="completed", since=None, until=None,
+                         layout_hash=None, limit=100):
+        """
+        Return assessment summaries, newest first, filtered by organisation, status, time range and questionnaire
+        """
+        clauses = []
+        params = []
+        if organisation is not None:
+            clauses.append("organisation = ?")
+            params.append(organisation)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("updated_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("updated_at < ?")
+            params.append(until)
+        if layout_hash is not None:
+            clauses.append("questionnaire_hash = ?")
+            params.append(layout_hash)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+
+        rows = self._read_conn().execute(
+            f"SELECT id, organisation, industry, size_band, status, questionnaire_hash, overall_score, scoring_profile, "
+            f"created_at, updated_at "
+            f"FROM assessments {where} ORDER BY updated_at DESC LIMIT ?",
+            params
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def questionnaire_counts(self, status="completed"):
+        """
+        Return {questionnaire hash: number of assessments} for assessments with the given status
+        """
+        rows = self._read_conn().execute(
+            "SELECT questionnaire_hash, COUNT(*) AS n FROM assessments WHERE status = ? GROUP BY questionnaire_hash",
+            (status,)
+        ).fetchall()
+        return {row["questionnaire_hash"]: row["n"] for row in rows}
+
+    def list_answers(self, layout_hash, status="completed"):
+        """
+        Return (id, organisation, encoded answers) for every assessment recorded against a questionnaire,
+        oldest first, for batch decoding with answer_codec.decode_answers_array()
+        """
+        rows = self._read_conn().execute(
+            "SELECT id, organisation, answers FROM assessments WHERE questionnaire_hash = ? AND status = ? "
+            "ORDER BY created_at",
+            (layout_hash, status)
+        ).fetchall()
+        return [(row["id"], row["organisation"], bytes(row["answers"])) for row in rows]
+
+    def list_labelled_answers(self, layout_hash):
+        """
+        Return (id, encoded answers, outcome) for every completed assessment of a questionnaire with a
+        recorded outcome, oldest first
+        """
+        rows = self._read_conn().execute(
+            "SELECT a.id, a.answers, o.outcome FROM assessments a JOIN outcomes o ON o.assessment_id = a.id "
+            "WHERE a.questionnaire_hash = ? AND a.status = 'completed' ORDER BY a.created_at",
+            (layout_hash,)
+        ).fetchall()
+        return [(row["id"], bytes(row["answers"]), row["outcome"]) for row in rows]
+
+    def latest_assessments_by_organisation(self, organisations=None):
+        """
+        Yield the most recent completed assessment (with scores) for every named organisation
+        """
+        query = """
+            SELECT a.id, a.organisation, a.questionnaire_hash, a.answers, a.overall_score, a.updated_at
+            FROM assessments a
+            WHERE a.status = 'completed' AND a.organisation IS NOT NULL
+              AND a.updated_at = (
+                  SELECT MAX(b.updated_at) FROM assessments b
+                  WHERE b.organisation = a.organisation AND b.status = 'completed'
+              )
+            ORDER BY a.organisation
+        """
+        wanted = set(organisations) if organisations else None
+        for row in self._read_conn().execute(query).fetchall():
+            if wanted is not None and row["organisation"] not in wanted:
+                continue
+            record = dict(row)
+            record["scores"] = self.get_scores(record["id"])
+            yield record
+
+    def _decode_record(self, record):
+        layout = self.get_questionnaire(record["questionnaire_hash"])
+        record["responses"] = decode_responses(record["answers"], layout) if layout else None
+        return record
+
+
+def load_completed_answers(db_path, layout_hash=None):
+    """
+    Return (questionnaire hash, layout, answer rows) for the completed assessments of one questionnaire in a
+    store (default: the one with most assessments), with rows as from list_answers(); raises ValueError if
+    there are none
+    """
+    store = AssessmentStore(db_path)
+    try:
+        counts = store.questionnaire_counts()
+        layout_hash = layout_hash or max(counts, key=counts.get, default=None)
+        layout = store.get_questionnaire(layout_hash) if layout_hash else None
+        if layout is None:
+            raise ValueError("No completed assessments for a known questionnaire")
+        rows = store.list_answers(layout_hash)
+    finally:
+        store.close()
+    if not rows:
+        raise ValueError(f"No completed assessments for questionnaire {layout_hash[:8]}")
+    return layout_hash, layout, rows
+
+
+def _sketch_keys(record):
+    """
+    Return the benchmark sketch keys a scored assessment counts towards: one per dimension and one overall
+    """
+    prefix = (record["scoring_profile"], record["questionnaire_hash"], record["industry"] or "", record["size_band"] or "")
+    if prefix[0] is None or not record["scores"]:
+        return []
+    scores = dict(record["scores"])
+    if record["overall_score"] is not None:
+        scores[OVERALL] = record["overall_score"]
+    finite = {dimension: score for dimension, score in scores.items() if np.isfinite(score)}
+    return [(*prefix, dimension, int(b)) for dimension, b in zip(finite, score_bins(list(finite.values())))]
@@ -0,0 +1,86 @@
+"""
+Shared setup for the benchmark scripts: repository imports, synthetic answers and baselines
+"""
+import json
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+APP_PATH = os.path.join(ROOT, "ai_readiness_assessment_app.py")
+
+# Seed used for synthetic answers and for the app's own np.random calls
+SEED = 20240501
+
+
+def import_app():
+    """
+    Import the Streamlit app module in bare mode (no server); Streamlit logs warnings but the functions work
+    """
+    os.environ.setdefault("AI_READINESS_DB", os.path.join(ROOT, "benchmarks", ".benchmark.db"))
+    import ai_readiness_assessment_app
+    return ai_readiness_assessment_app
+
+
+def synthetic_responses(all_questionnaires, rng, answered=1.0):
+    """
+    Return session-state style responses with random answers (0-4); a share 1 - answered is left unanswered
+    """
+    responses = {}
+    for category, questionnaire in all_questionnaires.items():
+        responses[category] = {}
+        for q_category, questions in questionnaire.items():
+            values = rng.integers(0, 5, size=len(questions))
+            mask = rng.random(len(questions)) < answered
+            responses[category][q_category] = [int(v) if keep else None for v, keep in zip(values, mask)]
+    return responses
+
+
+def seeded_rng(offset=0):
+    """
+    Return a numpy Generator seeded for reproducible runs, and seed the legacy global generator too
+    """
+    np.random.seed(SEED + offset)
+    return np.random.default_rng(SEED + offset)
+
+
+def restore_radio_labels(at):
+    """
+    AppTest reports radios that use a format_func by index; set them back to their option labels
+    """
+    for radio in at.radio:
+        if isinstance(radio.value, int):
+            radio.set_value(radio.options[radio.value])
+
+
+def question_radios(at):
+    """
+    Return the questionnaire answer radios on the current page (their keys are built from the question position)
+    """
+    return [radio for radio in at.radio if radio.key and "_" in radio.key and not radio.key.startswith("perf")]
+
+
+def load_baseline(path):
+    """
+    Return the stored baseline results, or an empty dict if there is none
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(path, results):
+    """
+    Store results as the new baseline
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
@@ -0,0 +1,131 @@
+"""
+Headless end-to-end rerun benchmark: drives the app through Streamlit's AppTest with no browser.
+
+Usage:
+    python benchmarks/e2e.py --journeys 5
+    python benchmarks/e2e.py --save-baseline --baseline benchmarks/e2e_baseline.json
+
+Each journey goes Home -> Assessment -> answer every question -> Submit -> Results -> Results
+(rerun), with a different fixed-seed answer set per journey. For every step it reports wall time
+(script execution, widget tree building and delta serialisation) and the size of the messages the
+rerun sends to the browser.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from common import APP_PATH, seeded_rng, restore_radio_labels, question_radios, load_baseline, save_baseline
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+from perf_timing import percentile
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "e2e_baseline.json")
+
+# Sizes of the forward messages parsed after each AppTest run
+_message_sizes = []
+
+
+def _measure_messages(parse_tree):
+    def parse(messages):
+        _message_sizes.append((sum(message.ByteSize() for message in messages), len(messages)))
+        return parse_tree(messages)
+    return parse
+
+
+local_script_runner.parse_tree_from_messages = _measure_messages(local_script_runner.parse_tree_from_messages)
+
+
+def timed_run(at, step, samples, action=None):
+    """
+    Apply action (a widget interaction) and rerun the app, recording wall time and message size for step
+    """
+    started = time.perf_counter()
+    (action() if action else at).run()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"{step} raised: {at.exception[0].message}")
+    message_bytes, message_count = _message_sizes[-1]
+    samples.setdefault(step, []).append((elapsed, message_bytes, message_count))
+    restore_radio_labels(at)
+
+
+def run_journey(journey, samples, timeout):
+    """
+    Run one Home -> Results journey with answers seeded by the journey number
+    """
+    rng = seeded_rng(journey)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    timed_run(at, "home", samples)
+    timed_run(at, "open assessment", samples, lambda: at.sidebar.radio[0].set_value("Assessment"))
+
+    radios = question_radios(at)
+    for radio in radios:
+        radio.set_value(radio.options[int(rng.integers(len(radio.options)))])
+    timed_run(at, f"answer {len(radios)} questions", samples)
+
+    submit = next(button for button in at.button if button.label == "Submit Assessment")
+    timed_run(at, "submit", samples, submit.click)
+    # AppTest does not follow st.experimental_rerun, so run the Results page explicitly
+    timed_run(at, "results (first view)", samples)
+    timed_run(at, "results (rerun)", samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the headless end-to-end rerun benchmark.")
+    parser.add_argument("--journeys", type=int, default=5, help="Number of full Home -> Results journeys")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-rerun timeout in seconds")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="Allowed p50 wall time increase (fraction)")
+    parser.add_argument("--max-size-growth", type=float, default=0.10, help="Allowed message size increase (fraction)")
+    args = parser.parse_args(argv)
+
+    # A throwaway store, so journeys never touch real assessments
+    os.environ["AI_READINESS_DB"] = os.path.join(tempfile.mkdtemp(prefix="ai-readiness-e2e-"), "assessments.db")
+
+    samples = {}
+    for journey in range(args.journeys):
+        run_journey(journey, samples, args.timeout)
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    failures = []
+    print(f"{'step':<28} {'p50 ms':>9} {'p95 ms':>9} {'msg KiB':>9} {'msgs':>6} {'vs base':>8}")
+    for step, values in samples.items():
+        times = [elapsed * 1000 for elapsed, _, _ in values]
+        result = {
+            "p50_ms": percentile(times, 50),
+            "p95_ms": percentile(times, 95),
+            "message_kib": max(size for _, size, _ in values) / 1024,
+            "messages": max(count for _, _, count in values),
+        }
+        results[step] = result
+        reference = baseline.get(step)
+        change = f"{result['p50_ms'] / reference['p50_ms'] - 1:+.0%}" if reference else "new"
+        print(f"{step:<28} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['message_kib']:>9.1f} "
+              f"{result['messages']:>6} {change:>8}")
+        if reference and result["p50_ms"] > reference["p50_ms"] * (1 + args.max_slowdown):
+            failures.append(f"{step}: p50 {result['p50_ms']:.1f} ms vs baseline {reference['p50_ms']:.1f} ms")
+        if reference and result["message_kib"] > reference["message_kib"] * (1 + args.max_size_growth):
+            failures.append(f"{step}: {result['message_kib']:.1f} KiB sent vs baseline {reference['message_kib']:.1f} KiB")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if failures:
+        print("\nRegressions against the baseline:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Concurrent-session load test: N simulated users each run a full assessment and view their results.
+
+Usage:
+    python benchmarks/load_test.py --users 1,2,4,8
+
+Sessions run in one process on their own script threads, sharing one Streamlit runtime and its
+caches, as they would on a real server. For each concurrency level the harness reports
+throughput, p50/p95 rerun latency, CPU utilisation (close to 1.0 x cores means the GIL or the
+matplotlib lock is the limit), resident memory growth per session and the mean deep size of
+each session's state.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock
+from urllib import parse
+
+from common import APP_PATH, seeded_rng, restore_radio_labels, question_radios
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+from perf_log import current_rss_bytes
+from perf_timing import percentile
+
+
+class SessionAppTest(AppTest):
+    """
+    An AppTest that runs against one shared runtime, so several can run concurrently.
+    AppTest.run() installs and removes a global mock runtime on every rerun, which would race between threads.
+    """
+
+    def __init__(self, script_path, session_id, default_timeout):
+        super().__init__(script_path, default_timeout=default_timeout)
+        self.session_id = session_id
+
+    def _run(self, widget_state=None, timeout=None):
+        script_runner = LocalScriptRunner(self._script_path, self.session_state)
+        script_runner._session_id = self.session_id  # per-session ids, as on a server
+        self._tree = script_runner.run(widget_state, self.query_params, timeout or self.default_timeout)
+        self._tree._runner = self
+        query_string = script_runner.event_data[-1]["client_state"].query_string
+        self.query_params = parse.parse_qs(query_string)
+        return self
+
+
+def install_shared_runtime():
+    """
+    Install the mock runtime every session shares (media storage and cache storage, like one server process)
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+
+
+def run_user(user, level, latencies, errors, timeout, shared_answers):
+    """
+    One simulated user: Home -> Assessment -> answer all -> Submit -> Results -> Results (rerun)
+    """
+    rng = seeded_rng(0 if shared_answers else level * 1000 + user)
+    at = SessionAppTest(APP_PATH, f"load-{level}-{user}", timeout)
+
+    def rerun(action=None):
+        started = time.perf_counter()
+        (action() if action else at).run()
+        latencies.append(time.perf_counter() - started)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        restore_radio_labels(at)
+
+    try:
+        rerun()
+        rerun(lambda: at.sidebar.radio[0].set_value("Assessment"))
+        for radio in question_radios(at):
+            radio.set_value(radio.options[int(rng.integers(len(radio.options)))])
+        rerun()
+        rerun(next(button for button in at.button if button.label == "Submit Assessment").click)
+        rerun()
+        rerun()
+    except Exception as exc:
+        errors.append(f"user {user}: {exc}")
+    return at
+
+
+def run_level(users, timeout, shared_answers):
+    """
+    Run users concurrent sessions and return the measurements for this concurrency level
+    """
+    latencies = []
+    errors = []
+    sessions = [None] * users
+
+    def target(user):
+        sessions[user] = run_user(user, users, latencies, errors, timeout, shared_answers)
+
+    gc.collect()
+    rss_before = current_rss_bytes()
+    cpu_before = sum(os.times()[:2])
+    started = time.perf_counter()
+    threads = [threading.Thread(target=target, args=(user,)) for user in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    cpu = sum(os.times()[:2]) - cpu_before
+    gc.collect()
+    # Sessions are still referenced here, so the growth includes their state
+    rss_growth = current_rss_bytes() - rss_before
+    state_sizes = [
+        at.session_state["session_memory"]["total"]
+        for at in sessions if at is not None and "session_memory" in at.session_state
+    ]
+
+    result = {
+        "users": users,
+        "reruns": len(latencies),
+        "wall_s": wall,
+        "reruns_per_s": len(latencies) / wall,
+        "journeys_per_s": (users - len(errors)) / wall,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "cpu_utilisation": cpu / wall,
+        "rss_growth_mib": rss_growth / 1024 / 1024,
+        "per_session_mib": rss_growth / users / 1024 / 1024,
+        "state_kib": sum(state_sizes) / len(state_sizes) / 1024 if state_sizes else None,
+        "errors": errors,
+    }
+    del sessions
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the app with concurrent simulated sessions.")
+    parser.add_argument("--users", default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-rerun timeout in seconds")
+    parser.add_argument("--shared-answers", action="store_true",
+                        help="Give every user the same answers (measures the shared results cache)")
+    args = parser.parse_args(argv)
+
+    # A throwaway store, so simulated users never touch real assessments
+    os.environ["AI_READINESS_DB"] = os.path.join(tempfile.mkdtemp(prefix="ai-readiness-load-"), "assessments.db")
+    install_shared_runtime()
+
+    levels = [int(level) for level in args.users.split(",")]
+    # One unmeasured journey first, so imports, fonts and process-wide caches do not count as session memory
+    warmup_errors = []
+    run_user(0, 0, [], warmup_errors, args.timeout, args.shared_answers)
+    if warmup_errors:
+        print(f"Warm-up failed: {warmup_errors[0]}", file=sys.stderr)
+        return 1
+    print(f"{os.cpu_count()} CPUs; start RSS {current_rss_bytes() / 1024 / 1024:.0f} MiB")
+    print(f"{'users':>5} {'reruns/s':>9} {'journeys/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'CPU util':>9} "
+          f"{'RSS +MiB':>9} {'MiB/session':>12} {'state KiB':>10}")
+    failed = False
+    for users in levels:
+        result = run_level(users, args.timeout, args.shared_answers)
+        print(f"{users:>5} {result['reruns_per_s']:>9.2f} {result['journeys_per_s']:>11.2f} "
+              f"{result['p50_ms']:>9.0f} {result['p95_ms']:>9.0f} {result['cpu_utilisation']:>9.2f} "
+              f"{result['rss_growth_mib']:>9.1f} {result['per_session_mib']:>12.2f} "
+              f"{result['state_kib'] if result['state_kib'] is not None else float('nan'):>10.1f}")
+        for error in result["errors"]:
+            failed = True
+            print(f"      error: {error}")
+    print(f"End RSS {current_rss_bytes() / 1024 / 1024:.0f} MiB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Micro-benchmarks for the questionnaire parsing, scoring and chart rendering hot paths.
+
+Usage:
+    python benchmarks/micro.py                    # run and compare against benchmarks/baseline.json
+    python benchmarks/micro.py --save-baseline    # run and store the results as the new baseline
+    python benchmarks/micro.py -k chart           # only benchmarks whose name contains "chart"
+
+Each benchmark reports ops/sec (fastest of 5 rounds over --min-time seconds in total) and the peak
+memory allocated by a single call (tracemalloc). A run fails if a benchmark is slower than the
+baseline by more than --max-slowdown or allocates more than --max-alloc-growth above it, or if a
+benchmark raises (unless it is listed in KNOWN_BROKEN, or --allow-errors is given).
+Baselines are machine-specific, so record one on the machine that runs the comparison.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from common import ROOT, import_app, synthetic_responses, seeded_rng, load_baseline, save_baseline
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Benchmarks that are expected to raise, with the reason; any other error fails the run
+KNOWN_BROKEN = {
+    "visualization_functions.create_gauge_chart":
+        "legacy gauge passes width twice to Axes.barh (the app renders results_helpers.create_gauge_chart)",
+}
+
+
+def close_figures(_=None):
+    plt.close("all")
+
+
+def run_benchmark(func, setup=None, teardown=None, min_time=1.0, rounds=5, min_calls=2):
+    """
+    Time func(setup()) over several rounds (setup and teardown are not timed) and keep the fastest round,
+    which is the least disturbed by other load on the machine; then measure one call's peak allocation
+    """
+    func(setup() if setup else None)  # warm-up (imports, caches, font loading)
+    if teardown:
+        teardown(None)
+
+    best = None
+    for _ in range(rounds):
+        elapsed = 0.0
+        calls = 0
+        while elapsed < min_time / rounds or calls < min_calls:
+            arg = setup() if setup else None
+            started = time.perf_counter()
+            result = func(arg)
+            elapsed += time.perf_counter() - started
+            calls += 1
+            if teardown:
+                teardown(result)
+        if best is None or elapsed / calls < best[0] / best[1]:
+            best = (elapsed, calls)
+    elapsed, calls = best
+
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        result = func(arg)
+        peak_bytes = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    finally:
+        tracemalloc.stop()
+    if teardown:
+        teardown(result)
+
+    return {
+        "ops_per_sec": calls / elapsed,
+        "mean_ms": elapsed / calls * 1000,
+        "peak_alloc_kib": peak_bytes / 1024,
+        "calls": calls,
+    }
+
+
+def build_benchmarks(app):
+    """
+    Return (name, func, setup, teardown) for every benchmarked function, with fixed inputs
+    """
+    import results_helpers
+    import visualization_functions
+    from scoring_model import IncrementalScorer, ScoringModel, get_scoring_model
+    from improvement_planner import plan_improvements
+    from percentile_sketch import OVERALL, PercentileSketch
+
+    rng = seeded_rng()
+    questionnaires = app.load_all_questionnaires()
+    responses = synthetic_responses(questionnaires, rng)
+    partial_responses = synthetic_responses(questionnaires, rng, answered=0.6)
+    question_files = [os.path.join(ROOT, name) for name in app.questionnaire_files.values()]
+
+    category_scores, overall_score = app.calculate_dimension_scores(responses, questionnaires)
+    categories = list(category_scores.keys())
+    scores = [category_scores[cat] for cat in categories]
+    display_categories = [cat.replace('AI ', '') for cat in categories]
+
+    # Sub-category means (0-4) and Q-learning outputs for the app's per-dimension charts
+    first = categories[0]
+    sub_categories = list(responses[first].keys())
+    sub_means = [float(np.mean(responses[first][sub])) for sub in sub_categories]
+    _, q_values, weights, _ = app.calculate_scores(responses)
+    q_list = [q_values[first][sub] for sub in sub_categories]
+    weight_list = list(weights[first])
+
+    # A batch of 1000 assessments, a tenth of answers missing, for vectorized scoring
+    model = get_scoring_model(questionnaires)
+    batch = rng.integers(0, 5, size=(1000, model.question_count)).astype(float)
+    batch[rng.random(batch.shape) < 0.1] = np.nan
+    # One assessment rescored answer by answer, cycling through every question and level
+    scorer = IncrementalScorer(model, batch[0])
+    changes = [(i, (i * 7) % 5, (i * 7 + 1) % 5) for i in range(model.question_count)]
+
+    # A question bank a few hundred times today's (10 dimensions x 50 sub-categories x 100 questions)
+    large_bank = {
+        f"Dimension {d}": {f"Area {d}.{a}": [f"Question {d}.{a}.{j}" for j in range(100)] for a in range(50)}
+        for d in range(10)
+    }
+    large_model = ScoringModel(large_bank)
+    large_answers = rng.integers(0, 5, size=large_model.question_count).astype(float)
+    large_costs = rng.integers(1, 6, size=large_model.question_count).astype(float)
+    next_target = app.next_readiness_target(float(model.score_batch(batch[0])["overall"][0]))
+    large_target = min(100.0, float(large_model.score_batch(large_answers)["overall"][0]) + 20)
+
+    # A population of a million stored scores per dimension, as the store's sketches would hold them
+    sketches = {}
+    for category in [*categories, OVERALL]:
+        sketches[category] = PercentileSketch()
+        sketches[category].add(np.clip(rng.normal(55, 18, size=1_000_000), 0, 100))
+    benchmarked = [*zip(categories, scores), (OVERALL, overall_score)]
+
+    def change_answers():
+        # Two values per question, so no update is a no-op
+        for question, first_value, second_value in changes:
+            scorer.update(question, first_value)
+            scorer.update(question, second_value)
+
+    def reseed(offset):
+        # calculate_scores draws its initial Q-values from the global generator
+        return lambda: np.random.seed(offset)
+
+    return [
+        ("extract_questionnaire_data (6 files)",
+         lambda _: [app.extract_questionnaire_data(path) for path in question_files], None, None),
+        ("load_all_questionnaires", lambda _: app.load_all_questionnaires(), None, None),
+        ("calculate_scores", lambda _: app.calculate_scores(responses), reseed(1), None),
+        ("calculate_dimension_scores", lambda _: app.calculate_dimension_scores(responses, questionnaires), None, None),
+        ("calculate_dimension_scores (60% answered)",
+         lambda _: app.calculate_dimension_scores(partial_responses, questionnaires), None, None),
+        ("ScoringModel.score_batch (1000 assessments)", lambda _: model.score_batch(batch), None, None),
+        (f"IncrementalScorer.update ({2 * len(changes)} answer changes)", lambda _: change_answers(), None, None),
+        ("ScoringModel.rank_improvements", lambda _: model.rank_improvements(batch[0], per_question=True), None, None),
+        ("plan_improvements (overall target)",
+         lambda _: plan_improvements(model, batch[0], target_overall=next_target), None, None),
+        (f"plan_improvements ({large_model.question_count} questions, costs)",
+         lambda _: plan_improvements(large_model, large_answers, target_overall=large_target, costs=large_costs),
+         None, None),
+        ("ScoringModel.bootstrap_intervals (1 assessment)", lambda _: model.bootstrap_intervals(batch[0]), None, None),
+        ("ScoringModel.bootstrap_intervals (100 assessments)",
+         lambda _: model.bootstrap_intervals(batch[:100]), None, None),
+        ("PercentileSketch lookups (1M assessments)",
+         lambda _: [(sketches[name].percentile(score), sketches[name].quantile(0.5)) for name, score in benchmarked],
+         None, None),
+        ("app.create_category_bar_chart",
+         lambda _: app.create_category_bar_chart(sub_categories, sub_means, first), None, close_figures),
+        ("app.create_qvalue_weight_heatmap",
+         lambda _: app.create_qvalue_weight_heatmap(sub_categories, q_list, weight_list, first), None, close_figures),
+        ("results_helpers.create_radar_chart",
+         lambda _: results_helpers.create_radar_chart(display_categories, scores), None, close_figures),
+        ("results_helpers.create_bar_chart",
+         lambda _: results_helpers.create_bar_chart(categories, scores), None, close_figures),
+        ("results_helpers.create_bar_chart (error bars)",
+         lambda _: results_helpers.create_bar_chart(categories, scores, errors=[(5, 5)] * len(scores)),
+         None, close_figures),
+        ("results_helpers.create_gauge_chart",
+         lambda _: results_helpers.create_gauge_chart(overall_score), None, close_figures),
+        ("visualization_functions.create_radar_chart",
+         lambda _: visualization_functions.create_radar_chart(display_categories, scores), None, close_figures),
+        ("visualization_functions.create_bar_chart",
+         lambda _: visualization_functions.create_bar_chart(categories, scores), None, close_figures),
+        ("visualization_functions.create_gauge_chart",
+         lambda _: visualization_functions.create_gauge_chart(overall_score), None, close_figures),
+        ("matplotlib_to_image (gauge)",
+         app.matplotlib_to_image, lambda: results_helpers.create_gauge_chart(overall_score), close_figures),
+        ("figure_to_png (gauge)",
+         app.figure_to_png, lambda: results_helpers.create_gauge_chart(overall_score), close_figures),
+    ]
+
+
+def compare(name, result, baseline, max_slowdown, max_alloc_growth):
+    """
+    Return a list of threshold violations for one benchmark
+    """
+    reference = baseline.get(name)
+    if not reference:
+        return []
+    failures = []
+    if result["ops_per_sec"] < reference["ops_per_sec"] * (1 - max_slowdown):
+        failures.append(f"{name}: {result['ops_per_sec']:.1f} ops/s vs baseline {reference['ops_per_sec']:.1f}")
+    # Small allocations are noisy; only flag growth above 64 KiB
+    allowed = max(reference["peak_alloc_kib"] * (1 + max_alloc_growth), reference["peak_alloc_kib"] + 64)
+    if result["peak_alloc_kib"] > allowed:
+        failures.append(f"{name}: {result['peak_alloc_kib']:.0f} KiB peak vs baseline {reference['peak_alloc_kib']:.0f}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the AI Readiness micro-benchmarks.")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to spend timing each benchmark")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="Allowed ops/sec drop (fraction)")
+    parser.add_argument("--max-alloc-growth", type=float, default=0.25, help="Allowed peak allocation growth (fraction)")
+    parser.add_argument("--allow-errors", action="store_true", help="Report benchmarks that raise without failing")
+    args = parser.parse_args(argv)
+
+    app = import_app()
+    baseline = load_baseline(args.baseline)
+    results = {}
+    failures = []
+
+    print(f"{'benchmark':<46} {'ops/sec':>10} {'mean ms':>10} {'peak KiB':>10} {'vs base':>8}")
+    for name, func, setup, teardown in build_benchmarks(app):
+        if args.pattern and args.pattern not in name:
+            continue
+        try:
+            result = run_benchmark(func, setup, teardown, min_time=args.min_time)
+        except Exception as exc:
+            # Report functions that cannot run at all without hiding the rest of the suite
+            close_figures()
+            print(f"{name:<46} error: {type(exc).__name__}: {exc}")
+            if name in KNOWN_BROKEN:
+                print(f"{'':<46} known broken: {KNOWN_BROKEN[name]}")
+            elif not args.allow_errors:
+                failures.append(f"{name}: raised {type(exc).__name__}: {exc}")
+            continue
+        if name in KNOWN_BROKEN:
+            print(f"{name:<46} ran; remove it from KNOWN_BROKEN")
+        results[name] = result
+        reference = baseline.get(name)
+        change = f"{result['ops_per_sec'] / reference['ops_per_sec'] - 1:+.0%}" if reference else "new"
+        print(f"{name:<46} {result['ops_per_sec']:>10.1f} {result['mean_ms']:>10.2f} "
+              f"{result['peak_alloc_kib']:>10.0f} {change:>8}")
+        failures.extend(compare(name, result, baseline, args.max_slowdown, args.max_alloc_growth))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nWarning: no baseline at {args.baseline}, so no regression gate ran; "
+              f"record one on the reference machine with --save-baseline")
+    if failures:
+        print("\nFailures:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
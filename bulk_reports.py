@@ -0,0 +1,184 @@
+"""
+Bulk rendering of AI Readiness reports for every organisation in an assessment store.
+
+Usage:
+    python bulk_reports.py assessments.db --output-dir reports --format pdf --workers 8
+
+Renders the latest completed assessment of each organisation. Organisations with
+identical scores share one set of chart renders. Progress is appended to a checkpoint
+file, so an interrupted run picks up where it stopped when started again.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import perf_log
+from assessment_store import AssessmentStore
+from report_export import render_report_figures, render_report_svgs, render_pdf_report, render_html_report
+
+
+def slugify(name):
+    """
+    Return a filesystem-safe version of an organisation name
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower()
+    return slug or "organisation"
+
+
+def chart_key(scores, overall_score):
+    """
+    Return the key identifying a set of chart inputs. Charts and report text show scores as whole
+    percentages (truncated, like int()), so scores that display the same share one chart set.
+    """
+    return (tuple(sorted((dimension, int(score)) for dimension, score in scores.items())), int(overall_score))
+
+
+def load_checkpoint(path):
+    """
+    Return {(organisation, report format): assessment id} for reports already written by a previous run
+    """
+    done = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a partial line from a crash mid-write
+                done[(entry["organisation"], entry["format"])] = entry["assessment_id"]
+    return done
+
+
+def render_group(group, output_dir, report_format):
+    """
+    Render reports for organisations sharing the same chart inputs; charts are rendered once per group.
+    Returns the written (member, path) pairs and the group's performance stats.
+    """
+    scores = group["scores"]
+    overall_score = group["overall_score"]
+    written = []
+    report_bytes = 0
+
+    started = time.perf_counter()
+    if report_format == "pdf":
+        figures = render_report_figures(scores, overall_score)
+        charts_done = time.perf_counter()
+        try:
+            for member in group["members"]:
+                path = os.path.join(output_dir, f"{slugify(member['organisation'])}-{member['id'][:8]}.pdf")
+                data = render_pdf_report(scores, overall_score, organisation=member["organisation"], figures=figures)
+                with open(path, "wb") as file:
+                    file.write(data)
+                report_bytes += len(data)
+                written.append((member, path))
+        finally:
+            for fig in figures.values():
+                plt.close(fig)
+    else:
+        charts = render_report_svgs(scores, overall_score)
+        charts_done = time.perf_counter()
+        for member in group["members"]:
+            path = os.path.join(output_dir, f"{slugify(member['organisation'])}-{member['id'][:8]}.html")
+            html = render_html_report(scores, overall_score, organisation=member["organisation"], charts=charts)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(html)
+            report_bytes += len(html)
+            written.append((member, path))
+    finished = time.perf_counter()
+
+    stats = {
+        "reports": len(written),
+        "total_ms": round((finished - started) * 1000, 2),
+        "stages_ms": {
+            "chart_render": round((charts_done - started) * 1000, 2),
+            "report_render": round((finished - charts_done) * 1000, 2),
+        },
+        "sizes": {f"{report_format}_reports": report_bytes},
+        "figures": len(plt.get_fignums()),
+        "worker_pid": os.getpid(),
+        "worker_rss_bytes": perf_log.current_rss_bytes(),
+    }
+    return written, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render AI Readiness reports for every organisation in an assessment store.")
+    parser.add_argument("db_path", help="Path to the SQLite assessment store")
+    parser.add_argument("--output-dir", default="reports", help="Directory for the rendered reports")
+    parser.add_argument("--format", choices=["pdf", "html"], default="pdf", dest="report_format")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel render processes")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output-dir>/.bulk_reports_checkpoint.jsonl)")
+    parser.add_argument("--organisation", action="append", help="Only render these organisations (repeatable)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db_path):
+        parser.error(f"Assessment store not found: {args.db_path}")
+    os.makedirs(args.output_dir, exist_ok=True)
+    checkpoint_path = args.checkpoint or os.path.join(args.output_dir, ".bulk_reports_checkpoint.jsonl")
+    done = load_checkpoint(checkpoint_path)
+
+    # Group pending organisations by chart inputs so identical charts are rendered once
+    store = AssessmentStore(args.db_path)
+    groups = {}
+    skipped = 0
+    try:
+        for record in store.latest_assessments_by_organisation(args.organisation):
+            if done.get((record["organisation"], args.report_format)) == record["id"]:
+                skipped += 1
+                continue
+            if not record["scores"]:
+                print(f"Skipping {record['organisation']}: no stored scores", file=sys.stderr)
+                continue
+            key = chart_key(record["scores"], record["overall_score"])
+            group = groups.setdefault(key, {
+                "scores": record["scores"],
+                "overall_score": record["overall_score"],
+                "members": [],
+            })
+            group["members"].append({"id": record["id"], "organisation": record["organisation"]})
+    finally:
+        store.close()
+
+    total = sum(len(group["members"]) for group in groups.values())
+    print(f"{total} reports to render in {len(groups)} unique chart sets ({skipped} already done)")
+
+    started = time.perf_counter()
+    completed = 0
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+            ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(render_group, group, args.output_dir, args.report_format)
+            for group in groups.values()
+        ]
+        for future in as_completed(futures):
+            written, stats = future.result()
+            # Workers return their stats so only this process writes the (rotating) log
+            perf_log.log_event("bulk_group", page="bulk_reports", report_format=args.report_format, **stats)
+            for member, path in written:
+                checkpoint.write(json.dumps({
+                    "organisation": member["organisation"],
+                    "assessment_id": member["id"],
+                    "format": args.report_format,
+                    "path": path,
+                }) + "\n")
+                completed += 1
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+            print(f"  {completed}/{total} reports written", end="\r")
+
+    elapsed = time.perf_counter() - started
+    perf_log.log_event("bulk_run", page="bulk_reports", report_format=args.report_format, reports=completed,
+                       groups=len(groups), workers=args.workers, total_ms=round(elapsed * 1000, 2))
+    print(f"\nRendered {completed} reports in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
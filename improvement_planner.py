@@ -0,0 +1,115 @@
+"""
+Least-effort plans of answer improvements that reach a target overall or per-dimension score
+"""
+import numpy as np
+
+from scoring_model import ANSWER_LEVELS, SCORE_SCALE
+
+# Slack for floating point error when comparing projected scores with targets
+TARGET_TOLERANCE = 1e-9
+
+
+def question_costs(model, spec=None):
+    """
+    Return the effort of raising each question by one level, in layout order.
+    spec maps a dimension to a cost, or to {sub-category: cost or [cost per question]}; anything unlisted costs 1.
+    """
+    spec = spec or {}
+    costs = np.ones(model.question_count)
+    for question, (dimension, q_category, j) in enumerate(model.question_slots):
+        entry = spec.get(dimension, 1)
+        if isinstance(entry, dict):
+            entry = entry.get(q_category, 1)
+        if isinstance(entry, (list, tuple)):
+            entry = entry[j] if j < len(entry) else 1
+        costs[question] = entry
+    if not np.all(costs > 0):
+        raise ValueError("Effort costs must be positive")
+    return costs
+
+
+def level_gains(model, answers):
+    """
+    Return the (dimension, overall) score gain of raising each question of a fully answered assessment by one level
+    """
+    _, counts = model.sub_totals(answers[np.newaxis, :])
+    dimension_weights = np.bincount(model.sub_dimension, counts[0] * model.sub_weights, len(model.dimensions))
+    d = model.question_dimension
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dimension_gain = np.nan_to_num(model.sub_weights[model.question_sub] / dimension_weights[d] * SCORE_SCALE)
+    overall_gain = dimension_gain * model.dimension_weights[d] / model.dimension_weights.sum()
+    return dimension_gain, overall_gain
+
+
+def _cover(gains, costs, deficit):
+    # Greedy covering knapsack over unit steps: best gain per cost first, then swap the last (overshooting)
+    # step for the cheapest single remaining step that covers what is left. Returns (picked, covered).
+    if deficit <= TARGET_TOLERANCE:
+        return np.array([], dtype=np.intp), True
+    order = np.lexsort((costs, -gains / costs))
+    cumulative = np.cumsum(gains[order])
+    k = int(np.searchsorted(cumulative, deficit - TARGET_TOLERANCE)) + 1
+    if k > len(order):
+        return order, False
+    left = deficit - (cumulative[k - 2] if k > 1 else 0.0)
+    candidates = order[k - 1:]
+    candidates = candidates[gains[candidates] >= left - TARGET_TOLERANCE]
+    return np.append(order[:k - 1], candidates[np.argmin(costs[candidates])]), True
+
+
+def plan_improvements(model, answers, target_overall=None, dimension_targets=None, costs=None,
+                      policy="not_implemented"):
+    """
+    Return a least-effort set of answer improvements that reaches the targets.
+    Dimension targets ({dimension: score}) are met first, then the overall target with the remaining steps.
+    Unanswered questions are imputed under policy, since plans start from a complete assessment.
+
+    Every level a question is raised is one step with that question's cost and a fixed score gain, so
+    steps are picked greedily by gain per cost in O(steps log steps) rather than searching combinations.
+    Returns a dict: question, from_level, to_level, cost and overall_gain arrays for the planned questions
+    (best gain per cost first), plus start_overall (the imputed assessment's score), total_cost,
+    projected_overall, projected_dimensions and feasible.
+    """
+    answers = model.impute(np.asarray(answers, dtype=float), policy)
+    if np.isnan(answers).any():
+        raise ValueError("Plans start from a complete assessment; use an imputing policy for unanswered questions")
+    costs = np.ones(model.question_count) if costs is None else np.asarray(costs, dtype=float)
+
+    base = model.score_batch(answers)
+    dimension_gain, overall_gain = level_gains(model, answers)
+    step_question = np.repeat(np.arange(model.question_count), (ANSWER_LEVELS - 1 - answers).astype(int))
+    available = np.ones(len(step_question), dtype=bool)
+    raised = np.zeros(model.question_count, dtype=int)
+    feasible = True
+
+    def take(steps, gains, deficit):
+        picked, covered = _cover(gains[step_question[steps]], costs[step_question[steps]], deficit)
+        available[steps[picked]] = False
+        np.add.at(raised, step_question[steps[picked]], 1)
+        return covered
+
+    for dimension, target in (dimension_targets or {}).items():
+        d = model.dimensions.index(dimension)
+        steps = np.flatnonzero(available & (model.question_dimension[step_question] == d))
+        feasible &= take(steps, dimension_gain, target - base["dimensions"][0][d])
+
+    if target_overall is not None:
+        achieved = np.nan_to_num(base["overall"][0]) + overall_gain @ raised
+        feasible &= take(np.flatnonzero(available), overall_gain, target_overall - achieved)
+
+    planned = answers + raised
+    projected = model.score_batch(planned)
+    question = np.flatnonzero(raised)
+    question = question[np.lexsort((question, -overall_gain[question] / costs[question]))]
+    return {
+        "question": question,
+        "from_level": answers[question],
+        "to_level": planned[question],
+        "cost": costs[question] * raised[question],
+        "overall_gain": overall_gain[question] * raised[question],
+        "start_overall": float(base["overall"][0]),
+        "total_cost": float(costs @ raised),
+        "projected_overall": float(projected["overall"][0]),
+        "projected_dimensions": projected["dimensions"][0],
+        "feasible": bool(feasible),
+    }
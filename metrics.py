@@ -0,0 +1,258 @@
+"""
+Prometheus text-format metrics for the app, served from a small local HTTP endpoint
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import perf_log
+
+# Port for the metrics endpoint; metrics are off unless this is set
+METRICS_PORT_ENV = "AI_READINESS_METRICS_PORT"
+METRICS_HOST_ENV = "AI_READINESS_METRICS_HOST"
+
+# A session counts as active if it reran within this many seconds
+ACTIVE_SESSION_WINDOW_SECONDS = 300
+
+# Latency buckets in seconds (reruns take tens of milliseconds; uncached chart renders take about a second)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = [*zip(labelnames, values), *extra]
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets and optional labels
+    """
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            series["counts"][bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip([*self.buckets, "+Inf"], series["counts"]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else repr(float(bound))
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, [('le', le)])} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Gauge whose value is read from a callback at scrape time
+    """
+
+    def __init__(self, name, documentation, read):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def render(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge", f"{self.name} {self.read()}"]
+
+
+_session_last_seen = {}
+_session_state_bytes = {}
+_sessions_lock = threading.Lock()
+
+
+def _prune_sessions():
+    # Callers hold _sessions_lock
+    cutoff = time.time() - ACTIVE_SESSION_WINDOW_SECONDS
+    for session_id in [s for s, seen in _session_last_seen.items() if seen < cutoff]:
+        del _session_last_seen[session_id]
+        _session_state_bytes.pop(session_id, None)
+
+
+def active_sessions():
+    """
+    Return the number of sessions that reran within the active window, forgetting older ones
+    """
+    with _sessions_lock:
+        _prune_sessions()
+        return len(_session_last_seen)
+
+
+def session_state_bytes_total():
+    """
+    Return the summed session state size of active sessions
+    """
+    with _sessions_lock:
+        _prune_sessions()
+        return sum(_session_state_bytes.values())
+
+
+def session_state_bytes_max():
+    """
+    Return the largest session state size among active sessions
+    """
+    with _sessions_lock:
+        _prune_sessions()
+        return max(_session_state_bytes.values(), default=0)
+
+
+def open_figures():
+    """
+    Return the number of matplotlib figures currently open in this process
+    """
+    import matplotlib.pyplot as plt
+    return len(plt.get_fignums())
+
+
+RERUN_SECONDS = Histogram("ai_readiness_rerun_seconds", "Script rerun latency by page.", ["page"])
+QUESTIONNAIRE_LOAD_SECONDS = Histogram("ai_readiness_questionnaire_load_seconds", "Time spent loading questionnaires per rerun.")
+CHART_RENDER_SECONDS = Histogram("ai_readiness_chart_render_seconds", "Time spent rendering results charts (cache misses).")
+CACHE_REQUESTS = Counter("ai_readiness_cache_requests_total", "Results cache lookups by cache and outcome.", ["cache", "result"])
+RERUNS = Counter("ai_readiness_reruns_total", "Script reruns by page.", ["page"])
+SESSION_COMPACTIONS = Counter("ai_readiness_session_compactions_total", "Session state compactions by evicted or trimmed key.", ["key"])
+
+REGISTRY = [
+    RERUN_SECONDS,
+    RERUNS,
+    QUESTIONNAIRE_LOAD_SECONDS,
+    CHART_RENDER_SECONDS,
+    CACHE_REQUESTS,
+    SESSION_COMPACTIONS,
+    Gauge("ai_readiness_active_sessions", f"Sessions that reran in the last {ACTIVE_SESSION_WINDOW_SECONDS} seconds.", active_sessions),
+    Gauge("ai_readiness_session_state_bytes", "Deep size of all active sessions' state.", session_state_bytes_total),
+    Gauge("ai_readiness_session_state_max_bytes", "Deep size of the largest active session's state.", session_state_bytes_max),
+    Gauge("ai_readiness_matplotlib_figures", "Open matplotlib figures in this process.", open_figures),
+    Gauge("ai_readiness_process_resident_memory_bytes", "Resident memory of this process.", perf_log.current_rss_bytes),
+]
+
+# Cache lookups are inferred from the stages of a rerun: a lookup stage without its render stage was a hit
+CACHE_STAGES = {
+    "results_view": ("results_view", "chart_render"),
+    "html_report": ("html_report_lookup", "html_render"),
+}
+
+
+def observe_rerun(rerun, session_id=None):
+    """
+    Record a rerun from perf_timing.finish_rerun() in the process metrics
+    """
+    stages = rerun["stages"]
+    RERUN_SECONDS.observe(rerun["total"], rerun["page"])
+    RERUNS.inc(rerun["page"])
+    if "load_questionnaires" in stages:
+        QUESTIONNAIRE_LOAD_SECONDS.observe(stages["load_questionnaires"])
+    if "chart_render" in stages:
+        CHART_RENDER_SECONDS.observe(stages["chart_render"])
+    for cache, (lookup_stage, render_stage) in CACHE_STAGES.items():
+        if lookup_stage in stages:
+            CACHE_REQUESTS.inc(cache, "miss" if render_stage in stages else "hit")
+    if session_id is not None:
+        with _sessions_lock:
+            _session_last_seen[session_id] = time.time()
+
+
+def observe_session_memory(session_id, state_bytes, compacted_keys=()):
+    """
+    Record a session's measured state size and any compaction applied to it
+    """
+    with _sessions_lock:
+        _session_state_bytes[session_id] = state_bytes
+        _session_last_seen[session_id] = time.time()
+    for key in compacted_keys:
+        SESSION_COMPACTIONS.inc(key)
+
+
+def render_metrics():
+    """
+    Return all metrics in the Prometheus text exposition format
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """
+    Serves /metrics; every other path is a 404
+    """
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes would otherwise flood stderr
+
+
+def is_enabled():
+    """
+    Return True when the metrics endpoint is configured
+    """
+    return bool(os.environ.get(METRICS_PORT_ENV))
+
+
+def start_metrics_server(port=None, host=None):
+    """
+    Serve /metrics from a daemon thread; returns the server (its port is server.server_port)
+    """
+    port = int(port if port is not None else os.environ.get(METRICS_PORT_ENV, 0))
+    host = host or os.environ.get(METRICS_HOST_ENV, "127.0.0.1")
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,203 @@
+"""
+Sensitivity of assessment scores and rankings to the Q-learning scoring parameters.
+
+Usage:
+    python parameter_sweep.py assessments.db --alpha 0.05,0.1,0.2 --gamma 0.8,0.9,0.95 \
+        --reward 1 --iterations 5,10,20 --eta 0.5,1,2 [--json sweep.json]
+
+Scores every completed assessment in the store under every parameter profile in the grid
+(the cartesian product of the given values) with batched NumPy, and compares each profile
+with the app's defaults (QLEARNING_DEFAULTS): spread of overall scores per assessment, rank
+correlation and rank changes across assessments, and readiness level changes. Initial
+Q-values are drawn once from --seed and shared by all profiles, so differences between
+profiles come from the parameters alone.
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+
+from answer_codec import decode_answers_array
+from assessment_store import load_completed_answers
+from scoring_model import QLEARNING_DEFAULTS, SCORE_SCALE, get_scoring_model, qlearning_weights
+
+PARAMETERS = ("alpha", "gamma", "reward", "iterations", "eta")
+
+# Overall scores where the Moderate, High and Advanced readiness levels start (see get_readiness_level)
+READINESS_LEVEL_STARTS = (30, 60, 80)
+
+# Profiles scored per batch; bounds the (assessments x profiles x dimensions) working array
+PROFILE_CHUNK = 32
+
+
+def parse_values(text, kind=float):
+    """
+    Return the values of a comma-separated command-line list
+    """
+    return [kind(value) for value in text.split(",") if value.strip()]
+
+
+def profile_grid(**values):
+    """
+    Return the cartesian product of parameter values as {parameter: (P,) array}, baseline profile first
+    """
+    baseline = tuple(QLEARNING_DEFAULTS[name] for name in PARAMETERS)
+    combos = [baseline] + [
+        combo for combo in itertools.product(*(values[name] for name in PARAMETERS)) if combo != baseline
+    ]
+    return {name: np.array([combo[i] for combo in combos]) for i, name in enumerate(PARAMETERS)}
+
+
+def profile_sub_weights(model, profiles, seed=0):
+    """
+    Return (P, S) sub-category weights per profile, from Q-learning with initial Q-values drawn once per seed
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((len(profiles["alpha"]), len(model.sub_categories)))
+    for subs in model.dimension_subs:
+        _, weights[:, subs] = qlearning_weights(rng.uniform(0, 1, len(subs)), **profiles)
+    return weights
+
+
+def sweep_overall(model, answers, sub_weights):
+    """
+    Return (n, P) overall scores of an (n, questions) answer array under each profile's sub-category weights,
+    scored like ScoringModel with sub_category_weights (unanswered questions left out)
+    """
+    totals, counts = model.sub_totals(answers)
+    question_weights = np.divide(sub_weights, model.sub_sizes, out=np.zeros_like(sub_weights), where=model.sub_sizes > 0)
+    overall = np.empty((len(answers), len(sub_weights)))
+    for start in range(0, len(sub_weights), PROFILE_CHUNK):
+        chunk = question_weights[start:start + PROFILE_CHUNK]
+        dimensions = np.stack([
+            totals[:, subs] @ chunk[:, subs].T / (counts[:, subs] @ chunk[:, subs].T)
+            for subs in model.dimension_subs
+        ], axis=-1) * SCORE_SCALE
+        scored = ~np.isnan(dimensions)
+        overall[:, start:start + PROFILE_CHUNK] = (
+            np.where(scored, dimensions, 0.0) @ model.dimension_weights / (scored @ model.dimension_weights)
+        )
+    return overall
+
+
+def ranks(overall):
+    """
+    Return 0-based ranks of assessments (best first) under each profile; ties keep store order
+    """
+    order = np.argsort(-overall, axis=0, kind="stable")
+    result = np.empty_like(order)
+    np.put_along_axis(result, order, np.arange(len(overall))[:, np.newaxis], axis=0)
+    return result
+
+
+def summarise_sweep(overall, profiles):
+    """
+    Return per-profile comparisons with the baseline (column 0), the per-assessment spread and per-parameter means
+    """
+    n = len(overall)
+    ranked = ranks(overall)
+    rank_change = np.abs(ranked - ranked[:, :1])
+    spearman = (
+        1 - 6 * np.sum((ranked - ranked[:, :1]) ** 2, axis=0) / (n * (n ** 2 - 1)) if n > 1
+        else np.ones(overall.shape[1])
+    )
+    levels = np.digitize(overall, READINESS_LEVEL_STARTS)
+    spread = overall.max(axis=1) - overall.min(axis=1)
+
+    rows = []
+    for p in range(overall.shape[1]):
+        rows.append({
+            **{name: profiles[name][p].item() for name in PARAMETERS},
+            "baseline": p == 0,
+            "mean": float(overall[:, p].mean()),
+            "std": float(overall[:, p].std()),
+            "spearman": float(spearman[p]),
+            "mean_rank_change": float(rank_change[:, p].mean()),
+            "max_rank_change": int(rank_change[:, p].max()),
+            "level_changes": float(np.mean(levels[:, p] != levels[:, 0])),
+        })
+
+    by_parameter = {
+        name: {
+            str(value.item()): {
+                "mean": float(overall[:, profiles[name] == value].mean()),
+                "spearman": float(spearman[profiles[name] == value].mean()),
+            }
+            for value in np.unique(profiles[name])
+        }
+        for name in PARAMETERS
+    }
+    return {
+        "profiles": rows,
+        "spread": {
+            "p50": float(np.percentile(spread, 50)),
+            "p95": float(np.percentile(spread, 95)),
+            "max": float(spread.max()),
+        },
+        "by_parameter": by_parameter,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep the Q-learning scoring parameters over stored assessments.")
+    parser.add_argument("db_path", help="Path to the SQLite assessment store")
+    parser.add_argument("--alpha", default="0.05,0.1,0.2", help="Learning rates (comma-separated)")
+    parser.add_argument("--gamma", default="0.8,0.9,0.95", help="Discount factors (comma-separated)")
+    parser.add_argument("--reward", default="1", help="Rewards (comma-separated)")
+    parser.add_argument("--iterations", default="5,10,20", help="Update sweeps (comma-separated)")
+    parser.add_argument("--eta", default="0.5,1,2", help="Softmax temperatures (comma-separated)")
+    parser.add_argument("--layout", help="Questionnaire hash to sweep (default: the one with most assessments)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the initial Q-values")
+    parser.add_argument("--top", type=int, default=10, help="Profiles to list, least rank-consistent first")
+    parser.add_argument("--json", dest="json_path", help="Write the full results to this JSON file")
+    args = parser.parse_args(argv)
+
+    profiles = profile_grid(
+        alpha=parse_values(args.alpha), gamma=parse_values(args.gamma), reward=parse_values(args.reward),
+        iterations=parse_values(args.iterations, int), eta=parse_values(args.eta)
+    )
+
+    try:
+        layout_hash, layout, rows = load_completed_answers(args.db_path, args.layout)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    model = get_scoring_model(layout)
+    answers = decode_answers_array([row[2] for row in rows], layout_hash, model.question_count)
+    overall = sweep_overall(model, answers, profile_sub_weights(model, profiles, args.seed))
+    summary = summarise_sweep(overall, profiles)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(rows)} assessments x {overall.shape[1]} profiles in {elapsed:.2f} s (questionnaire {layout_hash[:8]})")
+    spread = summary["spread"]
+    print(f"Overall score spread per assessment across profiles: "
+          f"p50 {spread['p50']:.1f}  p95 {spread['p95']:.1f}  max {spread['max']:.1f} points\n")
+
+    print(f"{'alpha':>6} {'gamma':>6} {'reward':>6} {'iter':>5} {'eta':>5} {'mean':>7} {'std':>6} "
+          f"{'spearman':>9} {'mean |dr|':>10} {'max |dr|':>9} {'level chg':>10}")
+    baseline = summary["profiles"][0]
+    listed = sorted(summary["profiles"][1:], key=lambda row: row["spearman"])[:args.top]
+    for row in [baseline, *listed]:
+        print(f"{row['alpha']:>6g} {row['gamma']:>6g} {row['reward']:>6g} {row['iterations']:>5} {row['eta']:>5g} "
+              f"{row['mean']:>7.2f} {row['std']:>6.2f} {row['spearman']:>9.4f} {row['mean_rank_change']:>10.2f} "
+              f"{row['max_rank_change']:>9} {row['level_changes']:>9.1%}" + ("  (baseline)" if row["baseline"] else ""))
+
+    print("\nMean over profiles by parameter value")
+    for name, values in summary["by_parameter"].items():
+        cells = "  ".join(f"{value}: {stats['mean']:.2f} (rho {stats['spearman']:.3f})" for value, stats in values.items())
+        print(f"  {name:<10} {cells}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump({"assessments": len(rows), "layout": layout_hash, "seed": args.seed,
+                       "elapsed_s": elapsed, **summary}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
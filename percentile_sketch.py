@@ -0,0 +1,92 @@
+"""
+Fixed-bin percentile sketches of stored scores, for benchmarking a result against all assessments
+"""
+import numpy as np
+
+# Bins over the 0-100 score range (half a point each); sketches of any population have this size
+SKETCH_BINS = 200
+SCORE_RANGE = (0.0, 100.0)
+
+# Sketch row holding the overall score, next to one row per dimension
+OVERALL = "Overall"
+
+
+def score_bins(scores):
+    """
+    Return the sketch bin of each score (scores outside 0-100 fall in the first or last bin)
+    """
+    low, high = SCORE_RANGE
+    scaled = (np.asarray(scores, dtype=float) - low) / (high - low) * SKETCH_BINS
+    return np.clip(np.floor(scaled), 0, SKETCH_BINS - 1).astype(int)
+
+
+class PercentileSketch:
+    """
+    Histogram of scores over SKETCH_BINS fixed bins. Sketches of disjoint populations merge by adding
+    counts, so a population is updated one score at a time and segments combine without the scores
+    themselves. Percentile lookups index the cumulative counts, so they cost the same for any population.
+    """
+
+    def __init__(self, counts=None):
+        self.counts = np.zeros(SKETCH_BINS, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        if self.counts.shape != (SKETCH_BINS,):
+            raise ValueError(f"A percentile sketch has {SKETCH_BINS} bins, not {self.counts.shape}")
+        self._cumulative = None
+
+    @classmethod
+    def from_bins(cls, bins, counts):
+        """
+        Return a sketch from sparse (bin, count) pairs, as stored by AssessmentStore
+        """
+        sketch = cls()
+        np.add.at(sketch.counts, np.asarray(bins, dtype=int), np.asarray(counts, dtype=np.int64))
+        return sketch
+
+    @property
+    def total(self):
+        return int(self.cumulative[-1])
+
+    @property
+    def cumulative(self):
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self.counts)
+        return self._cumulative
+
+    def add(self, scores, count=1):
+        """
+        Count scores into the sketch (a negative count removes them again)
+        """
+        np.add.at(self.counts, score_bins(np.atleast_1d(scores)), count)
+        self._cumulative = None
+
+    def merge(self, other):
+        """
+        Return the sketch of both populations
+        """
+        return PercentileSketch(self.counts + other.counts)
+
+    def percentile(self, score):
+        """
+        Return the share (0-100) of the population scoring below a score, counting the score's own bin
+        up to the score's position in it; nan for an empty sketch
+        """
+        if self.total == 0:
+            return float("nan")
+        low, high = SCORE_RANGE
+        position = min(max((score - low) / (high - low) * SKETCH_BINS, 0.0), float(SKETCH_BINS))
+        b = min(int(position), SKETCH_BINS - 1)
+        below = self.cumulative[b - 1] if b > 0 else 0
+        return float(100.0 * (below + (position - b) * self.counts[b]) / self.total)
+
+    def quantile(self, share):
+        """
+        Return the score below which a share (0-1) of the population falls, interpolated within its bin
+        """
+        if self.total == 0:
+            return float("nan")
+        rank = share * self.total
+        b = min(int(np.searchsorted(self.cumulative, rank, side="left")), SKETCH_BINS - 1)
+        below = self.cumulative[b - 1] if b > 0 else 0
+        within = (rank - below) / self.counts[b] if self.counts[b] else 0.0
+        low, high = SCORE_RANGE
+        return float(low + (b + min(max(within, 0.0), 1.0)) * (high - low) / SKETCH_BINS)
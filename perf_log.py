@@ -0,0 +1,111 @@
+"""
+Asynchronous, size-rotated JSON-lines performance log for app reruns and batch jobs
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Log path; performance logging is off unless this is set
+PERF_LOG_ENV = "AI_READINESS_PERF_LOG"
+
+# Rotate at this many bytes, keeping this many old files (override with the env vars below)
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+_logger = None
+_listener = None
+_lock = threading.Lock()
+
+
+def current_rss_bytes():
+    """
+    Return the resident set size of this process (peak RSS where /proc is unavailable, 0 where neither
+    /proc nor the resource module is, e.g. on Windows)
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_perf_logger():
+    """
+    Return the performance logger, or None when AI_READINESS_PERF_LOG is not set.
+    Records are queued and written by a background listener thread, so callers never wait on disk.
+    """
+    global _logger, _listener
+    path = os.environ.get(PERF_LOG_ENV)
+    if not path:
+        return None
+
+    with _lock:
+        if _logger is None:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                path,
+                maxBytes=int(os.environ.get("AI_READINESS_PERF_LOG_MAX_BYTES", DEFAULT_MAX_BYTES)),
+                backupCount=int(os.environ.get("AI_READINESS_PERF_LOG_BACKUPS", DEFAULT_BACKUP_COUNT)),
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+            records = queue.SimpleQueue()
+            _listener = QueueListener(records, file_handler)
+            _listener.start()
+            atexit.register(_listener.stop)
+
+            logger = logging.getLogger("ai_readiness.perf")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(QueueHandler(records))
+            _logger = logger
+    return _logger
+
+
+def log_event(kind, **fields):
+    """
+    Queue one JSON-lines record (timestamp, pid and RSS are added); a no-op when logging is off
+    """
+    logger = get_perf_logger()
+    if logger is None:
+        return
+    record = {"ts": round(time.time(), 3), "kind": kind, "pid": os.getpid(), "rss_bytes": current_rss_bytes()}
+    record.update(fields)
+    logger.info(json.dumps(record, separators=(",", ":")))
+
+
+def log_rerun(rerun, figures=None):
+    """
+    Log a rerun record from perf_timing.finish_rerun()
+    """
+    log_event(
+        "rerun",
+        page=rerun["page"],
+        total_ms=round(rerun["total"] * 1000, 2),
+        stages_ms={stage: round(seconds * 1000, 2) for stage, seconds in rerun["stages"].items()},
+        sizes=rerun["sizes"],
+        figures=figures,
+    )
+
+
+def is_enabled():
+    """
+    Return True when performance logging is configured
+    """
+    return bool(os.environ.get(PERF_LOG_ENV))
@@ -0,0 +1,60 @@
+"""
+On-demand cProfile capture of individual app reruns
+"""
+import cProfile
+import os
+import pstats
+import re
+import time
+
+# Directory for saved profiles (override with AI_READINESS_PROFILE_DIR)
+DEFAULT_PROFILE_DIR = os.environ.get(
+    "AI_READINESS_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+)
+
+# Upper bound on the reruns one request may profile
+MAX_PROFILED_RERUNS = 20
+
+
+def profile_call(func, label, saved_paths, directory=DEFAULT_PROFILE_DIR):
+    """
+    Run func under cProfile and append the saved profile's path to saved_paths, even if func raises
+    (e.g. Streamlit's rerun exception). cProfile hooks only the calling thread, so other sessions are
+    not affected. Profiles are .prof files (pstats format, readable by snakeviz, flameprof and gprof2dot).
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        saved_paths.append(save_profile(profiler, label, directory))
+
+
+def save_profile(profiler, label, directory=DEFAULT_PROFILE_DIR):
+    """
+    Write a profiler's stats to directory and return the file path
+    """
+    os.makedirs(directory, exist_ok=True)
+    safe_label = re.sub(r"[^A-Za-z0-9_-]+", "-", label).strip("-") or "rerun"
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{safe_label}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def top_functions(path, limit=15, sort="cumulative"):
+    """
+    Return the top functions of a saved profile as dicts (function, calls, total and cumulative ms)
+    """
+    stats = pstats.Stats(path)
+    total_seconds = stats.total_tt
+    key = {"cumulative": 3, "tottime": 2}[sort]
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][key], reverse=True)[:limit]
+    return total_seconds, [
+        {
+            "function": f"{funcname} ({os.path.basename(filename)}:{lineno})" if filename != "~" else funcname,
+            "calls": str(calls) if primitive_calls == calls else f"{calls}/{primitive_calls}",
+            "tottime_ms": tottime * 1000,
+            "cumtime_ms": cumtime * 1000,
+        }
+        for (filename, lineno, funcname), (primitive_calls, calls, tottime, cumtime, _) in rows
+    ]
@@ -0,0 +1,113 @@
+"""
+Summarise the JSON-lines performance log written by perf_log.
+
+Usage:
+    python perf_report.py perf.jsonl [--kind rerun] [--since 2024-05-01T00:00]
+
+Reads the log and its rotated backups (perf.jsonl.1, perf.jsonl.2, ...) and prints
+latency percentiles per page, per-stage percentiles, payload sizes and peak RSS.
+"""
+import argparse
+import datetime
+import glob
+import json
+import sys
+
+from perf_timing import percentile
+
+
+def read_records(path):
+    """
+    Yield records from a log file and its rotated backups, oldest first
+    """
+    backups = sorted(glob.glob(f"{glob.escape(path)}.[0-9]*"), key=lambda p: int(p.rsplit(".", 1)[1]), reverse=True)
+    for file_path in [*backups, path]:
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # a partial line from a crash mid-write
+        except FileNotFoundError:
+            continue
+
+
+def summarise(records):
+    """
+    Return {(kind, page): summary} with count, total percentiles, stage percentiles, mean sizes and peak RSS
+    """
+    groups = {}
+    for record in records:
+        if "total_ms" not in record:
+            continue
+        group = groups.setdefault((record["kind"], record.get("page") or "-"), {
+            "totals": [], "stages": {}, "sizes": {}, "rss": [], "figures": []
+        })
+        group["totals"].append(record["total_ms"])
+        for stage, ms in (record.get("stages_ms") or {}).items():
+            group["stages"].setdefault(stage, []).append(ms)
+        for name, nbytes in (record.get("sizes") or {}).items():
+            group["sizes"].setdefault(name, []).append(nbytes)
+        if record.get("rss_bytes"):
+            group["rss"].append(record.get("worker_rss_bytes") or record["rss_bytes"])
+        if record.get("figures") is not None:
+            group["figures"].append(record["figures"])
+
+    return {
+        key: {
+            "count": len(group["totals"]),
+            "p50": percentile(group["totals"], 50),
+            "p95": percentile(group["totals"], 95),
+            "p99": percentile(group["totals"], 99),
+            "max": max(group["totals"]),
+            "stages": {
+                stage: (percentile(values, 50), percentile(values, 95))
+                for stage, values in sorted(group["stages"].items())
+            },
+            "sizes": {name: sum(values) / len(values) for name, values in sorted(group["sizes"].items())},
+            "peak_rss_mb": max(group["rss"]) / 1024 / 1024 if group["rss"] else None,
+            "max_figures": max(group["figures"]) if group["figures"] else None,
+        }
+        for key, group in sorted(groups.items())
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise the AI Readiness performance log.")
+    parser.add_argument("log_path", help="Path to the performance log (AI_READINESS_PERF_LOG)")
+    parser.add_argument("--kind", help="Only include one record kind (rerun, pdf_job, bulk_group, ...)")
+    parser.add_argument("--since", help="Only include records at or after this ISO timestamp")
+    args = parser.parse_args(argv)
+
+    since = datetime.datetime.fromisoformat(args.since).timestamp() if args.since else None
+    records = (
+        record for record in read_records(args.log_path)
+        if (args.kind is None or record.get("kind") == args.kind) and (since is None or record.get("ts", 0) >= since)
+    )
+    summary = summarise(records)
+    if not summary:
+        print("No matching records", file=sys.stderr)
+        return 1
+
+    print(f"{'kind':<12} {'page':<14} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'RSS MB':>8}")
+    for (kind, page), row in summary.items():
+        rss = f"{row['peak_rss_mb']:.0f}" if row["peak_rss_mb"] is not None else "-"
+        print(f"{kind:<12} {page:<14} {row['count']:>7} {row['p50']:>9.1f} {row['p95']:>9.1f} "
+              f"{row['p99']:>9.1f} {row['max']:>9.1f} {rss:>8}")
+
+    for (kind, page), row in summary.items():
+        if not row["stages"] and not row["sizes"]:
+            continue
+        print(f"\n{kind} / {page}")
+        for stage, (p50, p95) in row["stages"].items():
+            print(f"  {stage:<24} p50 {p50:>9.1f} ms   p95 {p95:>9.1f} ms")
+        for name, mean_bytes in row["sizes"].items():
+            print(f"  {name:<24} mean {mean_bytes / 1024:>8.1f} KB")
+        if row["max_figures"]:
+            print(f"  {'open figures':<24} max {row['max_figures']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
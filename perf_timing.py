@@ -0,0 +1,120 @@
+"""
+Lightweight timing spans for app reruns, collected per session and per process
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Number of recent reruns kept for percentile summaries
+SAMPLE_WINDOW = 500
+
+_local = threading.local()
+_process_reruns = deque(maxlen=SAMPLE_WINDOW)
+_process_lock = threading.Lock()
+
+
+def start_rerun(enabled=True):
+    """
+    Begin timing a rerun on the current thread (each Streamlit session runs its script on its own thread)
+    """
+    _local.stages = {} if enabled else None
+    _local.sizes = {} if enabled else None
+    _local.started = time.perf_counter() if enabled else None
+
+
+@contextmanager
+def span(name):
+    """
+    Time a stage of the current rerun; stages with the same name accumulate. A no-op when timing is disabled.
+    """
+    stages = getattr(_local, "stages", None)
+    if stages is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + (time.perf_counter() - started)
+
+
+def record_size(name, nbytes):
+    """
+    Record the size in bytes of a payload produced during the current rerun (e.g. chart images, reports)
+    """
+    sizes = getattr(_local, "sizes", None)
+    if sizes is not None:
+        sizes[name] = sizes.get(name, 0) + nbytes
+
+
+def finish_rerun(page, session_reruns=None):
+    """
+    Close the current rerun and record it for the process (and the session, if a deque is given).
+    Returns the rerun record, or None when timing was disabled.
+    """
+    stages = getattr(_local, "stages", None)
+    if stages is None:
+        return None
+    record = {
+        "page": page,
+        "timestamp": time.time(),
+        "total": time.perf_counter() - _local.started,
+        "stages": stages,
+        "sizes": _local.sizes,
+    }
+    _local.stages = None
+    _local.sizes = None
+
+    with _process_lock:
+        _process_reruns.append(record)
+    if session_reruns is not None:
+        session_reruns.append(record)
+    return record
+
+
+def new_session_reruns():
+    """
+    Return an empty per-session rerun buffer
+    """
+    return deque(maxlen=SAMPLE_WINDOW)
+
+
+def process_reruns():
+    """
+    Return a snapshot of the reruns recorded in this process
+    """
+    with _process_lock:
+        return list(_process_reruns)
+
+
+def percentile(values, pct):
+    """
+    Return the pct-th percentile (nearest rank) of a list of numbers
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(reruns):
+    """
+    Return {stage: {"latest", "p50", "p95", "count"}} in milliseconds; rerun totals appear as "rerun: <page>"
+    """
+    samples = {}
+    for record in reruns:
+        samples.setdefault(f"rerun: {record['page']}", []).append(record["total"])
+        for stage, seconds in record["stages"].items():
+            samples.setdefault(stage, []).append(seconds)
+
+    return {
+        stage: {
+            "latest": values[-1] * 1000,
+            "p50": percentile(values, 50) * 1000,
+            "p95": percentile(values, 95) * 1000,
+            "count": len(values),
+        }
+        for stage, values in sorted(samples.items())
+    }
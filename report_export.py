@@ -0,0 +1,267 @@
+"""
+Static report exports for AI Readiness Assessment results
+"""
+import datetime
+import textwrap
+from html import escape
+from io import BytesIO, StringIO
+
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+from results_helpers import (
+    get_color_for_score, get_readiness_level, create_radar_chart, create_bar_chart, create_gauge_chart,
+    get_strength_comment, get_improvement_comment, get_recommendations
+)
+
+REPORT_TITLE = "AI Readiness Assessment Results"
+
+# A4 portrait, in inches
+PDF_PAGE_SIZE = (8.27, 11.69)
+
+REPORT_CSS = """
+body { font-family: 'Inter', 'Helvetica Neue', Arial, sans-serif; background: #F8FAFC; color: #334155; margin: 0; }
+main { max-width: 1100px; margin: 0 auto; padding: 2rem 1.5rem; }
+h1, h2, h3, h4 { color: #1E293B; }
+h1 { font-size: 2rem; margin-bottom: 0.25rem; }
+.subtitle { color: #64748B; margin-top: 0; }
+.card { background: white; border: 1px solid #E2E8F0; border-radius: 0.375rem; padding: 1rem 1.25rem; margin-bottom: 1rem; }
+.card.primary { border-left: 4px solid #0284C7; }
+.card.success { background: #059669; color: white; border: none; }
+.card.error { background: #EF4444; color: white; border: none; }
+.card.success h4, .card.error h4, .card.success p, .card.error p { color: white; }
+.row { display: flex; gap: 1rem; flex-wrap: wrap; }
+.col { flex: 1 1 320px; }
+.chart svg { width: 100%; height: auto; }
+.badge { color: white; padding: 0.25rem 0.5rem; border-radius: 9999px; font-weight: 600; font-size: 0.75rem; }
+.bar { height: 0.5rem; background: #E2E8F0; border-radius: 9999px; overflow: hidden; }
+.bar div { height: 100%; border-radius: 9999px; }
+.score-head { display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem; }
+.score-head h4 { margin: 0; }
+footer { color: #94A3B8; font-size: 0.8rem; margin-top: 2rem; }
+"""
+
+
+def figure_to_svg(fig):
+    """
+    Render a matplotlib figure to inline SVG markup and release it
+    """
+    buf = StringIO()
+    fig.savefig(buf, format="svg", bbox_inches="tight")
+    plt.close(fig)
+    svg = buf.getvalue()
+    # Drop the XML prolog and doctype so the markup can be embedded in HTML
+    return svg[svg.index("<svg"):]
+
+
+def build_report_content(category_scores, overall_score):
+    """
+    Return the text content of a results report (strengths, improvement areas and priorities)
+    """
+    sorted_scores = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
+    priority_categories = sorted(category_scores.items(), key=lambda x: x[1])
+
+    return {
+        "readiness_level": get_readiness_level(overall_score),
+        "strengths": [
+            (category, int(score), get_strength_comment(category, int(score)))
+            for category, score in sorted_scores[:2]
+        ],
+        "improvements": [
+            (category, int(score), get_improvement_comment(category, int(score)))
+            for category, score in sorted_scores[-2:]
+        ],
+        "priorities": [
+            (category, int(score), get_recommendations(category, score))
+            for category, score in priority_categories[:3]
+        ],
+    }
+
+
+def render_report_figures(category_scores, overall_score):
+    """
+    Create the gauge, radar and bar chart figures for a results report
+    """
+    categories = list(category_scores.keys())
+    scores = [category_scores[cat] for cat in categories]
+    display_categories = [cat.replace('AI ', '') for cat in categories]
+
+    return {
+        "gauge": create_gauge_chart(overall_score),
+        "radar": create_radar_chart(display_categories, scores),
+        "bar": create_bar_chart(categories, scores),
+    }
+
+
+def _score_card(category, score_percent, comment, color):
+    return f"""
+    <div class="card">
+        <div class="score-head">
+            <h4>{escape(category.replace('AI ', ''))}</h4>
+            <span class="badge" style="background-color: {color};">{score_percent}%</span>
+        </div>
+        <div class="bar"><div style="width: {score_percent}%; background-color: {color};"></div></div>
+        <p>{escape(comment)}</p>
+    </div>"""
+
+
+def render_report_svgs(category_scores, overall_score):
+    """
+    Render the report charts to inline SVG markup
+    """
+    return {name: figure_to_svg(fig) for name, fig in render_report_figures(category_scores, overall_score).items()}
+
+
+def render_html_report(category_scores, overall_score, organisation=None, generated_at=None, charts=None):
+    """
+    Render the full results page into a single self-contained HTML document with inline SVG charts.
+    Pass charts from render_report_svgs() to reuse renders across reports with the same scores.
+    """
+    generated_at = generated_at or datetime.datetime.now()
+    content = build_report_content(category_scores, overall_score)
+    charts = charts or render_report_svgs(category_scores, overall_score)
+    level = content["readiness_level"]
+
+    strengths = "".join(_score_card(c, p, text, "#10B981") for c, p, text in content["strengths"])
+    improvements = "".join(_score_card(c, p, text, "#EF4444") for c, p, text in content["improvements"])
+    dimension_rows = "".join(
+        f"<tr><td>{escape(category.replace('AI ', ''))}</td>"
+        f"<td style=\"color: {get_color_for_score(int(score))}; font-weight: 600;\">{int(score)}%</td></tr>"
+        for category, score in category_scores.items()
+    )
+    priorities = "".join(
+        f"""
+    <div class="card primary">
+        <h4>Priority {i+1}: Enhance {escape(category.replace('AI ', ''))}</h4>
+        <p>Current score: <strong>{score_percent}%</strong></p>
+        <ul>{''.join(f'<li>{escape(rec)}</li>' for rec in recommendations)}</ul>
+    </div>"""
+        for i, (category, score_percent, recommendations) in enumerate(content["priorities"])
+    )
+    subtitle = f"Prepared for {escape(organisation)}" if organisation else "Your organization's AI readiness profile"
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{REPORT_TITLE}</title>
+<style>{REPORT_CSS}</style>
+</head>
+<body>
+<main>
+    <h1>{REPORT_TITLE}</h1>
+    <p class="subtitle">{subtitle} &middot; Generated {generated_at:%d %B %Y}</p>
+
+    <div class="row">
+        <div class="col">
+            <h3>Overall Readiness Score</h3>
+            <div class="chart">{charts["gauge"]}</div>
+            <div class="card">
+                <h4>AI Readiness Level: <span style="color: {get_color_for_score(overall_score)};">{level}</span></h4>
+                <p>Your organization is at a <strong>{level.lower()}</strong> level of AI readiness.</p>
+            </div>
+        </div>
+        <div class="col" style="flex-grow: 2;">
+            <h3>Dimension Analysis</h3>
+            <div class="chart">{charts["radar"]}</div>
+        </div>
+    </div>
+
+    <h3>Strengths &amp; Improvement Areas</h3>
+    <div class="row">
+        <div class="col">
+            <div class="card success"><h4>Key Strengths</h4><p>Your organization demonstrates strong capabilities in these areas:</p></div>
+            {strengths}
+        </div>
+        <div class="col">
+            <div class="card error"><h4>Improvement Areas</h4><p>Focus on enhancing capabilities in these dimensions:</p></div>
+            {improvements}
+        </div>
+    </div>
+
+    <h3>Detailed Dimension Scores</h3>
+    <div class="chart">{charts["bar"]}</div>
+    <div class="card"><table>{dimension_rows}</table></div>
+
+    <h3>Recommended Actions</h3>
+    {priorities}
+
+    <footer>Enterprise AI Readiness Assessment</footer>
+</main>
+</body>
+</html>
+"""
+
+
+def _text_page(title, blocks):
+    """
+    Create a portrait text page; blocks are (heading, [paragraphs]) pairs
+    """
+    fig = plt.figure(figsize=PDF_PAGE_SIZE, facecolor='white')
+    y = 0.94
+    fig.text(0.08, y, title, fontsize=20, fontweight='bold', color='#1E293B', va='top')
+    y -= 0.06
+    for heading, paragraphs in blocks:
+        if heading:
+            fig.text(0.08, y, heading, fontsize=13, fontweight='bold', color='#1E293B', va='top')
+            y -= 0.035
+        for paragraph in paragraphs:
+            lines = textwrap.wrap(paragraph, width=90) or [""]
+            fig.text(0.08, y, "\n".join(lines), fontsize=10, color='#334155', va='top', linespacing=1.4)
+            y -= 0.02 * len(lines) + 0.012
+        y -= 0.015
+    return fig
+
+
+def render_pdf_report(category_scores, overall_score, organisation=None, generated_at=None, figures=None):
+    """
+    Render the results page into a multi-page PDF using matplotlib's PDF backend.
+    Pass figures from render_report_figures() to reuse charts across reports; the caller then closes them.
+    """
+    generated_at = generated_at or datetime.datetime.now()
+    content = build_report_content(category_scores, overall_score)
+    level = content["readiness_level"]
+    prepared_for = f"Prepared for {organisation}" if organisation else "Your organization's AI readiness profile"
+
+    summary = _text_page(REPORT_TITLE, [
+        (None, [f"{prepared_for} - generated {generated_at:%d %B %Y}"]),
+        ("Overall Readiness Score", [
+            f"{int(overall_score)}% - your organization is at a {level.lower()} level of AI readiness."
+        ]),
+        ("Dimension Scores", [
+            f"{category.replace('AI ', '')}: {int(score)}%" for category, score in category_scores.items()
+        ]),
+        ("Key Strengths", [
+            f"{category.replace('AI ', '')} ({score_percent}%): {comment}"
+            for category, score_percent, comment in content["strengths"]
+        ]),
+        ("Improvement Areas", [
+            f"{category.replace('AI ', '')} ({score_percent}%): {comment}"
+            for category, score_percent, comment in content["improvements"]
+        ]),
+    ])
+    recommendations = _text_page("Recommended Actions", [
+        (f"Priority {i+1}: Enhance {category.replace('AI ', '')} (current score {score_percent}%)",
+         [f"- {rec}" for rec in recs])
+        for i, (category, score_percent, recs) in enumerate(content["priorities"])
+    ])
+
+    owns_charts = figures is None
+    charts = list((figures or render_report_figures(category_scores, overall_score)).values())
+    buf = BytesIO()
+    with PdfPages(buf, metadata={"Title": REPORT_TITLE, "Subject": prepared_for}) as pdf:
+        for fig in [summary, *charts, recommendations]:
+            pdf.savefig(fig, bbox_inches='tight')
+    for fig in [summary, recommendations, *(charts if owns_charts else [])]:
+        plt.close(fig)
+    return buf.getvalue()
+
+
+def generate_pdf_report(category_scores, overall_score, organisation=None):
+    """
+    Worker entry point for background PDF generation (runs in a separate process)
+    """
+    matplotlib.use("Agg")
+    return render_pdf_report(category_scores, overall_score, organisation=organisation)
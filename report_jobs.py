@@ -0,0 +1,75 @@
+"""
+Background PDF report generation on a process pool
+"""
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import perf_log
+from report_export import generate_pdf_report
+
+
+class ReportJobs:
+    """
+    Runs PDF report renders in worker processes so the Streamlit script thread never blocks.
+
+    Jobs are keyed by the result they render (answer token, scoring profile and organisation), so
+    identical answer sets share one job and, once finished, one cached PDF. The most
+    recent max_cached jobs are kept.
+    """
+
+    def __init__(self, max_workers=None, max_cached=256):
+        # Spawned (not forked) workers, since the Streamlit server process is multi-threaded
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_cached = max_cached
+
+    def submit(self, key, category_scores, overall_score, organisation=None):
+        """
+        Start rendering the PDF for key unless a job for it already exists; returns the job's future
+        """
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._jobs.move_to_end(key)
+                return future
+
+            future = self._executor.submit(generate_pdf_report, dict(category_scores), overall_score, organisation)
+            if perf_log.is_enabled():
+                future.add_done_callback(self._log_job(time.perf_counter()))
+            self._jobs[key] = future
+            while len(self._jobs) > self.max_cached:
+                self._jobs.popitem(last=False)
+            return future
+
+    @staticmethod
+    def _log_job(submitted):
+        """
+        Return a done-callback that logs the job's duration and PDF size
+        """
+        def log(future):
+            failed = future.cancelled() or future.exception() is not None
+            perf_log.log_event(
+                "pdf_job",
+                page="Results",
+                total_ms=round((time.perf_counter() - submitted) * 1000, 2),
+                ok=not failed,
+                sizes={} if failed else {"pdf_report": len(future.result())},
+            )
+        return log
+
+    def get(self, key):
+        """
+        Return the future for key, or None if no job was submitted (or it was evicted)
+        """
+        with self._lock:
+            return self._jobs.get(key)
+
+    def shutdown(self):
+        """
+        Stop the worker processes
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
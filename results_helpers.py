@@ -0,0 +1,276 @@
+"""
+Chart and commentary helpers for the AI Readiness Assessment results page
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.patches as patches
+
+# Define color theme for the results page (matches the app's enterprise palette)
+theme_colors = {
+    'primary': '#1E293B',     # Slate 800
+}
+
+def get_color_for_score(score):
+    """Return a color based on the score value."""
+    if score < 30:
+        return "#EF4444"  # Red for low scores
+    elif score < 60:
+        return "#F59E0B"  # Amber for medium scores
+    elif score < 80:
+        return "#10B981"  # Green for good scores
+    else:
+        return "#0284C7"  # Blue for excellent scores
+
+def get_readiness_level(score):
+    """Return the readiness level label for an overall score."""
+    return "Low" if score < 30 else "Moderate" if score < 60 else "High" if score < 80 else "Advanced"
+
+def create_radar_chart(categories, scores):
+    """Create a radar chart for the category scores."""
+    # Number of variables
+    N = len(categories)
+    
+    # What will be the angle of each axis in the plot
+    angles = [n / float(N) * 2 * np.pi for n in range(N)]
+    angles += angles[:1]  # Close the loop
+    
+    # Scores need to be in the same order and length as angles
+    scores_for_plot = scores.copy()
+    scores_for_plot += scores_for_plot[:1]  # Close the loop
+    
+    # Initialize the figure
+    fig = plt.figure(figsize=(8, 6), facecolor='white')
+    ax = fig.add_subplot(111, polar=True)
+    
+    # Draw one axis per variable and add labels
+    plt.xticks(angles[:-1], categories, color='#475569', size=10)
+    
+    # Draw the y-axis labels (0-100)
+    ax.set_rlabel_position(0)
+    plt.yticks([25, 50, 75, 100], ["25", "50", "75", "100"], color="#475569", size=8)
+    plt.ylim(0, 100)
+    
+    # Plot the scores on the radar chart
+    ax.plot(angles, scores_for_plot, linewidth=2, linestyle='solid', color='#0284C7')
+    ax.fill(angles, scores_for_plot, alpha=0.1, color='#0284C7')
+    
+    # Add a grid
+    ax.grid(True, color='#E2E8F0')
+    
+    # Set the background color
+    ax.set_facecolor('#F8FAFC')
+    
+    # Add a title
+    plt.title('AI Readiness by Dimension', size=14, color='#1E293B', pad=20)
+    
+    # Adjust the layout
+    plt.tight_layout()
+    
+    return fig
+
+def create_bar_chart(categories, scores, errors=None):
+    """Create a horizontal bar chart for category scores.
+
+    errors, if given, are (below, above) distances from each score (e.g. to the bounds of a
+    confidence interval), drawn as error bars.
+    """
+    # Format categories for display
+    display_categories = [cat.replace('AI ', '') for cat in categories]
+    
+    # Create the bar chart
+    fig, ax = plt.figure(figsize=(10, 6)), plt.axes()
+    
+    # Plot horizontal bars
+    xerr = None if errors is None else np.transpose(np.asarray(errors, dtype=float))
+    bars = ax.barh(display_categories, scores, color='#0284C7', alpha=0.7, height=0.5, xerr=xerr,
+                   error_kw={'ecolor': '#1E293B', 'capsize': 4, 'elinewidth': 1.5})
+    
+    # Add value labels to the right of each bar (past its error bar)
+    for i, bar in enumerate(bars):
+        width = bar.get_width()
+        label_x = width + (xerr[1][i] if xerr is not None else 0)
+        ax.text(label_x + 2, bar.get_y() + bar.get_height()/2, f'{int(width)}%',
+                ha='left', va='center', color='#475569', fontweight='bold')
+    
+    # Customize the chart
+    ax.set_xlim(0, 100)
+    ax.set_xlabel('Score (%)', color='#475569')
+    ax.set_title('Dimension Scores', color='#1E293B', pad=20)
+    
+    # Customize the grid
+    ax.grid(axis='x', linestyle='--', alpha=0.7, color='#E2E8F0')
+    ax.set_axisbelow(True)
+    
+    # Remove the frame
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    
+    # Set background color
+    ax.set_facecolor('#F8FAFC')
+    fig.patch.set_facecolor('#F8FAFC')
+    
+    plt.tight_layout()
+    return fig
+
+def create_gauge_chart(score):
+    """Create a gauge chart for the overall score."""
+    # Define the score ranges and colors
+    ranges = [0, 30, 60, 80, 100]
+    colors = ['#EF4444', '#F59E0B', '#10B981', '#0284C7']
+    
+    # Create the figure
+    fig, ax = plt.subplots(figsize=(4, 4), subplot_kw={'projection': 'polar'})
+    
+    # Set the gauge limits (in radians)
+    start_angle = 3*np.pi/4
+    end_angle = -np.pi/4
+    
+    # Define radius for consistent use
+    radius = 1.0
+    
+    # Plot the colored ranges
+    for i in range(len(ranges)-1):
+        # Convert score range to angles in radians
+        angle1 = start_angle - (ranges[i] / 100) * (start_angle - end_angle)
+        angle2 = start_angle - (ranges[i+1] / 100) * (start_angle - end_angle)
+        
+        # Create a colored region
+        arc = patches.Wedge(
+            (0, 0), radius * 0.9, 
+            np.degrees(angle1), np.degrees(angle2),
+            width=0.2, color=colors[i], alpha=0.6
+        )
+        ax.add_patch(arc)
+    
+    # Create the pointer for the current score
+    score_angle = start_angle - (score / 100) * (start_angle - end_angle)
+    arrow_length = 0.75
+    
+    # Plot the arrow
+    ax.arrow(0, 0, arrow_length * np.cos(score_angle), arrow_length * np.sin(score_angle),
+             width=0.05, head_width=0.15, head_length=0.15, fc='#1E293B', ec='#1E293B')
+    
+    # Add a circle at the arrow base
+    circle = plt.Circle((0, 0), 0.1, fc='#1E293B', ec='#1E293B')
+    ax.add_patch(circle)
+    
+    # Add score text
+    ax.text(0, -0.2, f'{int(score)}%', ha='center', va='center', fontsize=24, fontweight='bold', color='#1E293B')
+    
+    # Add a label
+    labels = ["Low", "Moderate", "High", "Excellent"]
+    label_positions = [15, 45, 70, 90]
+    for i, label in enumerate(labels):
+        angle = start_angle - (label_positions[i] / 100) * (start_angle - end_angle)
+        ax.text(angle, radius + 0.1, label, 
+                ha='center', va='center', fontsize=8, 
+                color='#475569', fontweight='medium',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8, edgecolor=theme_colors["primary"]))
+    
+    # Draw tick marks
+    for value, angle in zip([0, 25, 50, 75, 100], [3*np.pi/4, 3*np.pi/4 + (25/100) * (6*np.pi/4), 3*np.pi/4 + (50/100) * (6*np.pi/4), 3*np.pi/4 + (75/100) * (6*np.pi/4), 9*np.pi/4]):
+        ax.text(0.95 * np.cos(angle), 0.95 * np.sin(angle), f"{value}%", 
+                ha='center', va='center', fontsize=9)
+    
+    # Remove ticks, labels, and grid
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_frame_on(False)
+    
+    # Set limits to ensure proper aspect ratio
+    ax.set_ylim(-1, 1)
+    
+    # Set background color
+    ax.set_facecolor('#F8FAFC')
+    fig.patch.set_facecolor('#F8FAFC')
+    
+    return fig
+
+def get_strength_comment(category, score):
+    """Return a comment about the organization's strength in a specific category."""
+    if "Data" in category:
+        return "Strong data management practices and governance provide a solid foundation for AI initiatives."
+    elif "Infrastructure" in category:
+        return "Robust technical infrastructure and computing resources enable efficient AI model training and deployment."
+    elif "Talent" in category:
+        return "Well-developed AI talent acquisition, training, and retention strategies support AI capabilities."
+    elif "Strategy" in category:
+        return "Clear AI strategy aligned with business objectives provides direction for AI initiatives."
+    elif "Culture" in category:
+        return "Strong innovation culture and change management capabilities enable AI adoption."
+    elif "Governance" in category:
+        return "Established governance frameworks ensure ethical and responsible AI implementation."
+    else:
+        return "Your organization demonstrates significant strengths in this area."
+
+def get_improvement_comment(category, score):
+    """Return a comment about areas for improvement in a specific category."""
+    if "Data" in category:
+        return "Enhance data quality, accessibility, governance, and management practices to build a stronger foundation for AI."
+    elif "Infrastructure" in category:
+        return "Invest in technical infrastructure, cloud resources, and MLOps capabilities to support AI initiatives."
+    elif "Talent" in category:
+        return "Develop structured talent acquisition, upskilling programs, and retention strategies for AI professionals."
+    elif "Strategy" in category:
+        return "Create a more comprehensive AI strategy aligned with business objectives and develop clear roadmaps."
+    elif "Culture" in category:
+        return "Foster a more innovative culture with stronger change management capabilities to accelerate AI adoption."
+    elif "Governance" in category:
+        return "Establish more robust governance frameworks to ensure ethical, responsible AI implementation."
+    else:
+        return "Focus on improving capabilities in this area to enhance overall AI readiness."
+
+def get_recommendations(category, score):
+    """Return specific recommendations based on category and score."""
+    recommendations = []
+    
+    if "Data" in category:
+        recommendations = [
+            "Implement a comprehensive data governance framework with clear ownership and quality standards",
+            "Develop a centralized data catalog to improve accessibility and discoverability",
+            "Establish data quality monitoring processes specific to AI use cases",
+            "Create standardized data preparation pipelines for common AI scenarios"
+        ]
+    elif "Infrastructure" in category:
+        recommendations = [
+            "Evaluate and scale cloud infrastructure to support AI workloads effectively",
+            "Implement MLOps practices for model deployment, monitoring, and lifecycle management",
+            "Establish a standardized AI development environment with necessary tools and frameworks",
+            "Create clear infrastructure scaling strategies to handle growing AI demands"
+        ]
+    elif "Talent" in category:
+        recommendations = [
+            "Develop a structured AI talent acquisition strategy with clear role definitions",
+            "Create internal upskilling programs for existing technical staff",
+            "Establish partnerships with academic institutions or AI research centers",
+            "Implement knowledge sharing mechanisms for AI expertise across teams"
+        ]
+    elif "Strategy" in category:
+        recommendations = [
+            "Define a clear enterprise AI strategy with specific business outcomes",
+            "Create a prioritized roadmap for AI use cases aligned with business value",
+            "Establish processes to measure and communicate AI initiative ROI",
+            "Develop a structured approach to AI security and risk management"
+        ]
+    elif "Culture" in category:
+        recommendations = [
+            "Foster executive-level AI championship and visible leadership support",
+            "Implement structured change management processes for AI initiatives",
+            "Create mechanisms for cross-functional collaboration on AI projects",
+            "Establish innovation channels for employees to propose AI use cases"
+        ]
+    elif "Governance" in category:
+        recommendations = [
+            "Create a comprehensive AI ethics framework and review process",
+            "Establish AI governance committee with clear responsibilities",
+            "Develop processes for ongoing compliance monitoring of AI systems",
+            "Implement transparent AI documentation standards and model cards"
+        ]
+    
+    # Return top 3 recommendations based on score
+    if score < 30:
+        return recommendations[:3]  # Return first 3 for low scores
+    elif score < 60:
+        return recommendations[1:4]  # Return middle 3 for medium scores
+    else:
+        return recommendations[1:]  # Return last 3 for higher scores
@@ -0,0 +1,104 @@
+"""
+Bootstrap confidence intervals for the scores of every completed assessment in a store.
+
+Usage:
+    python score_intervals.py assessments.db --output intervals.csv [--profile flat-average-v1] \
+        [--resamples 2000] [--confidence 0.9]
+
+Each dimension score averages a few answers per sub-category, so it is a noisy estimate. Every
+assessment is resampled (each sub-category's answers redrawn with replacement) and rescored, and
+the central share of the resampled scores gives the interval. All resamples of a block of
+assessments are scored in one set of array operations (ScoringModel.bootstrap_intervals). Scores are
+weighted by a scoring profile, as in the app. The CSV has one row per assessment and dimension, plus an
+"Overall" row per assessment, each with the scoring profile version it was computed with.
+"""
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+from answer_codec import decode_answers_array
+from assessment_store import load_completed_answers
+from scoring_model import BOOTSTRAP_CONFIDENCE, BOOTSTRAP_RESAMPLES
+from scoring_profiles import get_profile_model, load_profiles
+from weight_trainer import load_weights_artifact
+
+OVERALL = "Overall"
+
+
+def interval_rows(model, rows, scores, intervals):
+    """
+    Yield CSV rows (assessment id, organisation, dimension, score, lower, upper) for stored assessments
+    """
+    for i, (assessment_id, organisation, _) in enumerate(rows):
+        for d, dimension in enumerate(model.dimensions):
+            yield (assessment_id, organisation or "", dimension,
+                   scores["dimensions"][i, d], *intervals["dimensions"][i, d])
+        yield (assessment_id, organisation or "", OVERALL, scores["overall"][i], *intervals["overall"][i])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals for stored assessment scores.")
+    parser.add_argument("db_path", help="Path to the SQLite assessment store")
+    parser.add_argument("--output", help="Write one row per assessment and dimension to this CSV file")
+    parser.add_argument("--resamples", type=int, default=BOOTSTRAP_RESAMPLES, help="Resamples per assessment")
+    parser.add_argument("--confidence", type=float, default=BOOTSTRAP_CONFIDENCE,
+                        help="Share of resampled scores each interval spans")
+    parser.add_argument("--layout", help="Questionnaire hash (default: the one with most assessments)")
+    parser.add_argument("--profile", help="Scoring profile ID, as in the app (default: the default profile)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the resamples")
+    args = parser.parse_args(argv)
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1")
+    try:
+        profiles, default_id = load_profiles(weights_artifact=load_weights_artifact())
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Scoring profiles could not be loaded: {exc}", file=sys.stderr)
+        return 1
+
+    try:
+        layout_hash, layout, rows = load_completed_answers(args.db_path, args.layout)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    profile = profiles.get(args.profile or default_id)
+    if profile is None:
+        parser.error(f"Unknown scoring profile {args.profile!r}; choose from {', '.join(sorted(profiles))}")
+    if not profile.applies_to(layout_hash):
+        parser.error(f"Scoring profile {profile.id!r} does not apply to questionnaire {layout_hash[:8]}")
+
+    started = time.perf_counter()
+    model = get_profile_model(profile, layout)
+    answers = decode_answers_array([row[2] for row in rows], layout_hash, model.question_count)
+    scores = model.score_batch(answers)
+    intervals = model.bootstrap_intervals(answers, args.resamples, args.confidence, seed=args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(rows)} assessments x {args.resamples} resamples in {elapsed:.2f} s "
+          f"(questionnaire {layout_hash[:8]}, profile {profile.version}, {args.confidence:.0%} intervals)")
+    widths = np.concatenate([
+        intervals["dimensions"][..., 1] - intervals["dimensions"][..., 0],
+        (intervals["overall"][:, 1] - intervals["overall"][:, 0])[:, np.newaxis],
+    ], axis=1)
+    print(f"{'dimension':<28} {'scored':>7} {'mean width':>11} {'p95 width':>10}")
+    for name, column in zip([*model.dimensions, OVERALL], widths.T):
+        scored = column[~np.isnan(column)]
+        if len(scored):
+            print(f"{name:<28} {len(scored):>7} {scored.mean():>11.1f} {np.percentile(scored, 95):>10.1f}")
+        else:
+            print(f"{name:<28} {0:>7} {'-':>11} {'-':>10}")
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["assessment_id", "organisation", "dimension", "score", "lower", "upper", "scoring_profile"])
+            for row in interval_rows(model, rows, scores, intervals):
+                writer.writerow([*row[:3], *("" if np.isnan(value) else f"{value:.2f}" for value in row[3:]),
+                                 profile.version])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
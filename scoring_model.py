@@ -0,0 +1,440 @@
+"""
+Questionnaire layouts compiled into aggregation matrices for vectorized scoring
+"""
+import numpy as np
+
+from answer_codec import iter_question_slots, flatten_answers, questionnaire_hash
+
+# Answers are 0-4; scores are reported on a 0-100 scale
+SCORE_SCALE = 25
+ANSWER_LEVELS = 5
+
+# How unanswered questions count in partial scores: left out of the averages (None), or imputed as an answer
+UNANSWERED_POLICIES = {
+    "exclude": None,
+    "not_implemented": 0.0,
+    "defined": 2.0,
+}
+
+# Q-learning parameters of calculate_scores: learning rate, discount factor, reward, update sweeps and
+# softmax temperature of the sub-category weights
+QLEARNING_DEFAULTS = {"alpha": 0.1, "gamma": 0.9, "reward": 1.0, "iterations": 10, "eta": 1.0}
+
+# Bootstrap confidence intervals: resamples per assessment and the central share of them an interval spans
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_CONFIDENCE = 0.9
+
+# Assessment x resample x sub-category cells scored per block; bounds the bootstrap working arrays
+BOOTSTRAP_BLOCK_CELLS = 2_000_000
+
+_models = {}
+
+
+class ScoringModel:
+    """
+    Aggregation matrices for one questionnaire layout (question -> sub-category -> dimension -> overall).
+
+    One pass of segment sums gives every sub-category's answer total and count for one assessment or
+    a whole batch; dimensions are weighted means of their sub-categories' questions and the overall
+    score a weighted mean of the dimensions. Unanswered questions (NaN) are left out and the
+    remaining weights renormalised; a level with no answers scores NaN.
+
+    By default every question in a dimension weighs the same and every dimension weighs the same,
+    which is the flat average shown on the Results page. sub_category_weights ({dimension: weights
+    in sub-category order}) weight sub-categories instead, e.g. with Q-learning softmax weights.
+
+    Sub-category totals are sums of whole answers and so exact; dimension and overall scores are
+    accumulated in a fixed order, so IncrementalScorer reproduces batch results bit for bit.
+    """
+
+    # Compiled once per process and referenced from session state, so session memory accounting skips it
+    shared_across_sessions = True
+
+    def __init__(self, all_questionnaires, sub_category_weights=None, dimension_weights=None):
+        slots = list(iter_question_slots(all_questionnaires))
+        self.dimensions = list(all_questionnaires.keys())
+        self.sub_categories = [
+            (dimension, q_category)
+            for dimension, questionnaire in all_questionnaires.items()
+            for q_category in questionnaire
+        ]
+        self.question_slots = slots
+        self.question_count = len(slots)
+
+        sub_index = {key: i for i, key in enumerate(self.sub_categories)}
+        dimension_index = {dimension: i for i, dimension in enumerate(self.dimensions)}
+        self.question_sub = np.array([sub_index[(d, s)] for d, s, _ in slots], dtype=np.intp)
+        self.sub_dimension = np.array([dimension_index[d] for d, _ in self.sub_categories], dtype=np.intp)
+        self.dimension_subs = [np.flatnonzero(self.sub_dimension == i) for i in range(len(self.dimensions))]
+        self.question_dimension = self.sub_dimension[self.question_sub]
+        self.dimension_sizes = np.bincount(self.question_dimension, minlength=len(self.dimensions))
+
+        # Question -> sub-category: a sub-category's questions are contiguous in layout order
+        self.sub_sizes = np.bincount(self.question_sub, minlength=len(self.sub_categories))
+        self.sub_starts = np.concatenate([[0], np.cumsum(self.sub_sizes)[:-1]]).astype(np.intp)
+
+        # Sub-category -> dimension: the weight of each of the sub-category's questions
+        self.sub_weights = np.ones(len(self.sub_categories))
+        if sub_category_weights is not None:
+            for dimension, weights in sub_category_weights.items():
+                for q_category, weight in zip(all_questionnaires[dimension], weights):
+                    i = sub_index[(dimension, q_category)]
+                    self.sub_weights[i] = weight / self.sub_sizes[i] if self.sub_sizes[i] else 0.0
+
+        self.dimension_weights = (
+            np.ones(len(self.dimensions)) if dimension_weights is None
+            else np.array([dimension_weights[d] for d in self.dimensions], dtype=float)
+        )
+
+        # Plain-list copies for IncrementalScorer, whose per-answer updates avoid numpy scalar overhead
+        self.layout_lists = {
+            "question_sub": self.question_sub.tolist(),
+            "question_dimension": self.question_dimension.tolist(),
+            "sub_dimension": self.sub_dimension.tolist(),
+            "dimension_subs": [subs.tolist() for subs in self.dimension_subs],
+            "sub_weights": self.sub_weights.tolist(),
+            "dimension_weights": self.dimension_weights.tolist(),
+        }
+
+    def answers_array(self, responses, all_questionnaires):
+        """
+        Return session-state responses as a float vector in layout order, NaN for unanswered questions
+        """
+        return np.array(
+            [np.nan if a is None else a for a in flatten_answers(responses, all_questionnaires)],
+            dtype=float
+        )
+
+    def impute(self, answers, policy="exclude"):
+        """
+        Return answers with unanswered questions (NaN) filled under an UNANSWERED_POLICIES policy
+        """
+        fill = UNANSWERED_POLICIES[policy]
+        answers = np.asarray(answers, dtype=float)
+        return answers if fill is None else np.where(np.isnan(answers), fill, answers)
+
+    def answered_counts(self, answers):
+        """
+        Return the number of answered questions per dimension for an (n, questions) array
+        """
+        answers = np.atleast_2d(np.asarray(answers, dtype=float))
+        membership = self.question_dimension[:, np.newaxis] == np.arange(len(self.dimensions))
+        return (~np.isnan(answers)).astype(int) @ membership.astype(int)
+
+    def sub_totals(self, answers):
+        """
+        Return answer totals and answered counts per sub-category for an (n, questions) array
+        """
+        answered = ~np.isnan(answers)
+        stacked = np.concatenate([np.where(answered, answers, 0.0), answered.astype(float)])
+        # Segment sums over the layout; linear in the number of questions, with no dense membership matrix
+        sums = np.zeros((len(stacked), len(self.sub_categories)))
+        filled = self.sub_sizes > 0
+        if filled.any():
+            sums[:, filled] = np.add.reduceat(stacked, self.sub_starts[filled], axis=1)
+        totals, counts = np.split(sums, 2)
+        return totals, counts
+
+    def score_batch(self, answers, policy="exclude"):
+        """
+        Score an (n, questions) array of answers (NaN = unanswered) on the 0-100 scale,
+        treating unanswered questions according to policy (see UNANSWERED_POLICIES).
+        Returns a dict of arrays: sub_categories (n, S), dimensions (n, D) and overall (n,).
+        """
+        answers = self.impute(np.atleast_2d(np.asarray(answers, dtype=float)), policy)
+        totals, counts = self.sub_totals(answers)
+        n = len(answers)
+
+        dimension_totals = np.zeros((n, len(self.dimensions)))
+        dimension_weights = np.zeros((n, len(self.dimensions)))
+        for s, d in enumerate(self.sub_dimension):
+            dimension_totals[:, d] += totals[:, s] * self.sub_weights[s]
+            dimension_weights[:, d] += counts[:, s] * self.sub_weights[s]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sub_scores = totals / counts * SCORE_SCALE
+            dimension_scores = dimension_totals / dimension_weights * SCORE_SCALE
+            overall = self._overall(dimension_scores)
+        return {"sub_categories": sub_scores, "dimensions": dimension_scores, "overall": overall}
+
+    def _overall(self, dimension_scores):
+        # Weighted mean of the scored dimensions, accumulated in dimension order
+        total = np.zeros(dimension_scores.shape[:-1])
+        weight = np.zeros(dimension_scores.shape[:-1])
+        for d, dimension_weight in enumerate(self.dimension_weights):
+            scored = ~np.isnan(dimension_scores[..., d])
+            total += np.where(scored, dimension_scores[..., d], 0.0) * dimension_weight
+            weight += scored * dimension_weight
+        return total / weight
+
+    def rank_improvements(self, answers, policy="exclude", per_question=False, limit=None):
+        """
+        Evaluate every single-answer improvement of one assessment in one vectorized pass: each question
+        raised to each higher level, or an unanswered one answered at any level (one step more than its level).
+        Returns a dict of arrays ranked by overall gain per step, then overall gain: question, from_level
+        (NaN = unanswered), to_level, steps, dimension_gain and overall_gain (score points) and gain_per_step.
+        per_question keeps only each question's best-ranked improvement.
+        """
+        answers = self.impute(np.asarray(answers, dtype=float), policy)
+        base = self.score_batch(answers)
+        totals, counts = self.sub_totals(answers[np.newaxis, :])
+        dimension_totals = np.bincount(self.sub_dimension, totals[0] * self.sub_weights, len(self.dimensions))
+        dimension_weights = np.bincount(self.sub_dimension, counts[0] * self.sub_weights, len(self.dimensions))
+        base_dimensions = base["dimensions"][0]
+        dimension_scored = ~np.isnan(base_dimensions)
+        overall_total = np.sum(np.where(dimension_scored, base_dimensions, 0.0) * self.dimension_weights)
+        overall_weight = np.sum(dimension_scored * self.dimension_weights)
+
+        # Candidates: (question, level) pairs above the current answer
+        with np.errstate(invalid="ignore"):
+            question, to_level = np.nonzero(
+                np.isnan(answers)[:, np.newaxis] | (np.arange(ANSWER_LEVELS) > answers[:, np.newaxis])
+            )
+        from_level = answers[question]
+        unanswered = np.isnan(from_level)
+        to_level = to_level.astype(float)
+
+        # Only the candidate's sub-category, dimension and the overall mean change
+        s = self.question_sub[question]
+        d = self.sub_dimension[s]
+        added_total = (to_level - np.where(unanswered, 0.0, from_level)) * self.sub_weights[s]
+        added_weight = unanswered * self.sub_weights[s]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            new_dimension = (dimension_totals[d] + added_total) / (dimension_weights[d] + added_weight) * SCORE_SCALE
+        old_dimension = np.where(dimension_scored[d], base_dimensions[d], 0.0)
+        dimension_weight = self.dimension_weights[d]
+        new_overall = (
+            (overall_total - old_dimension * dimension_weight + new_dimension * dimension_weight)
+            / (overall_weight - dimension_scored[d] * dimension_weight + dimension_weight)
+        )
+
+        overall_gain = new_overall - np.nan_to_num(base["overall"][0])
+        steps = to_level - np.where(unanswered, -1.0, from_level)
+        gain_per_step = overall_gain / steps
+        order = np.lexsort((-overall_gain, -gain_per_step))
+        if per_question:
+            _, first = np.unique(question[order], return_index=True)
+            order = order[np.sort(first)]
+        order = order[:limit]
+        return {
+            "question": question[order],
+            "from_level": from_level[order],
+            "to_level": to_level[order],
+            "steps": steps[order],
+            "dimension_gain": (new_dimension - old_dimension)[order],
+            "overall_gain": overall_gain[order],
+            "gain_per_step": gain_per_step[order],
+        }
+
+    def resample_counts(self, resamples, seed=0):
+        """
+        Return (resamples, questions) draw counts: each resample draws as many questions from every
+        sub-category as it has, with replacement
+        """
+        rng = np.random.default_rng(seed)
+        sizes = self.sub_sizes[self.question_sub]
+        draws = self.sub_starts[self.question_sub] + (rng.random((resamples, self.question_count)) * sizes).astype(np.intp)
+        draws += np.arange(resamples)[:, np.newaxis] * self.question_count
+        counts = np.bincount(draws.ravel(), minlength=resamples * self.question_count)
+        return counts.reshape(resamples, self.question_count).astype(float)
+
+    def bootstrap_intervals(self, answers, resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE,
+                            policy="exclude", seed=0):
+        """
+        Percentile bootstrap intervals for the dimension and overall scores of an (n, questions) array.
+        Every resample redraws each sub-category's questions with replacement (unanswered draws stay left
+        out under "exclude"), and the same resamples are applied to every assessment, so all resamples of
+        a block of assessments are scored with one matrix product per sub-category rather than a loop.
+        Returns a dict of (lower, upper) bounds: dimensions (n, D, 2) and overall (n, 2); NaN where unscored.
+        """
+        answers = self.impute(np.atleast_2d(np.asarray(answers, dtype=float)), policy)
+        answered = (~np.isnan(answers)).astype(float)
+        values = np.where(answered > 0, answers, 0.0)
+        draws = self.resample_counts(resamples, seed)
+        tail = (1 - confidence) / 2
+        n = len(answers)
+        dimension_count = len(self.dimensions)
+
+        dimensions = np.empty((n, dimension_count, 2))
+        overall = np.empty((n, 2))
+        block = max(1, BOOTSTRAP_BLOCK_CELLS // (resamples * max(len(self.sub_categories), 1)))
+        for start in range(0, n, block):
+            rows = slice(start, start + block)
+            shape = (len(values[rows]), resamples, dimension_count)
+            dimension_totals = np.zeros(shape)
+            dimension_weights = np.zeros(shape)
+            for s, d in enumerate(self.sub_dimension):
+                questions = slice(self.sub_starts[s], self.sub_starts[s] + self.sub_sizes[s])
+                dimension_totals[..., d] += values[rows, questions] @ draws[:, questions].T * self.sub_weights[s]
+                dimension_weights[..., d] += answered[rows, questions] @ draws[:, questions].T * self.sub_weights[s]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                resampled = dimension_totals / dimension_weights * SCORE_SCALE
+                resampled_overall = self._overall(resampled)
+            dimensions[rows] = np.moveaxis(_nan_quantiles(resampled, (tail, 1 - tail)), 0, -1)
+            overall[rows] = _nan_quantiles(resampled_overall, (tail, 1 - tail)).T
+        return {"dimensions": dimensions, "overall": overall}
+
+    def score(self, responses, all_questionnaires):
+        """
+        Score one assessment; returns ({dimension: score}, overall score) for dimensions with answers
+        """
+        result = self.score_batch(self.answers_array(responses, all_questionnaires))
+        return self.as_dimension_scores(result["dimensions"][0], result["overall"][0])
+
+    def as_dimension_scores(self, dimension_scores, overall):
+        """
+        Return ({dimension: score}, overall score) for scored dimensions from one row of scores
+        """
+        scores = {
+            dimension: float(score)
+            for dimension, score in zip(self.dimensions, dimension_scores)
+            if not np.isnan(score)
+        }
+        return scores, 0 if np.isnan(overall) else float(overall)
+
+
+def _nan_quantiles(samples, probabilities):
+    # Linear-interpolation quantiles along axis 1 ignoring NaN (sorted last); np.nanquantile loops per slice
+    ordered = np.sort(samples, axis=1)
+    valid = np.sum(~np.isnan(ordered), axis=1, keepdims=True)
+    quantiles = []
+    for probability in probabilities:
+        position = probability * np.maximum(valid - 1, 0)
+        below = np.floor(position).astype(np.intp)
+        above = np.minimum(below + 1, np.maximum(valid - 1, 0))
+        low = np.take_along_axis(ordered, below, axis=1)
+        high = np.take_along_axis(ordered, above, axis=1)
+        quantile = (low + (high - low) * (position - below)).squeeze(1)
+        quantiles.append(np.where(valid.squeeze(1) > 0, quantile, np.nan))
+    return np.stack(quantiles)
+
+
+def _ratio(total, weight):
+    # total / weight with numpy's NaN for an empty level
+    return total / weight if weight else np.nan
+
+
+class IncrementalScorer:
+    """
+    Running sub-category totals and counts for one assessment. Changing an answer updates only its
+    sub-category and dimension (the overall is re-read from the handful of dimension scores), and
+    the scores equal ScoringModel.score_batch() on the same answers and policy exactly.
+    """
+
+    def __init__(self, model, answers=None, policy="exclude"):
+        self.model = model
+        self.policy = policy
+        self.answers = (
+            np.full(model.question_count, np.nan) if answers is None else np.array(answers, dtype=float)
+        )
+        self.answered = model.answered_counts(self.answers)[0]
+        effective = model.impute(self.answers, policy)
+        totals, counts = model.sub_totals(effective[np.newaxis, :])
+        result = model.score_batch(effective)
+        self.sub_scores = result["sub_categories"][0]
+        self.dimension_scores = result["dimensions"][0]
+        self.overall = float(result["overall"][0])
+
+        # Plain floats: the same IEEE operations as the batch path without numpy scalar overhead
+        self._totals = totals[0].tolist()
+        self._counts = counts[0].tolist()
+        self._dimension_scores = self.dimension_scores.tolist()
+        self._fill = UNANSWERED_POLICIES[policy]
+
+    def update(self, question, value):
+        """
+        Set the answer at a layout position (None or NaN clears it) and rescore what it affects
+        """
+        old = float(self.answers[question])
+        new = np.nan if value is None else float(value)
+        if old == new or (old != old and new != new):
+            return
+        self.answers[question] = new
+        if (old == old) != (new == new):
+            self.answered[self.model.layout_lists["question_dimension"][question]] += 1 if new == new else -1
+
+        # The policy's imputed answer stands in for unanswered questions
+        if self._fill is not None:
+            old = self._fill if old != old else old
+            new = self._fill if new != new else new
+            if old == new:
+                return
+
+        layout = self.model.layout_lists
+        s = layout["question_sub"][question]
+        if old == old:
+            self._totals[s] -= old
+            self._counts[s] -= 1.0
+        if new == new:
+            self._totals[s] += new
+            self._counts[s] += 1.0
+        self.sub_scores[s] = _ratio(self._totals[s], self._counts[s]) * SCORE_SCALE
+
+        d = layout["sub_dimension"][s]
+        total = 0.0
+        weight = 0.0
+        for sub in layout["dimension_subs"][d]:
+            total += self._totals[sub] * layout["sub_weights"][sub]
+            weight += self._counts[sub] * layout["sub_weights"][sub]
+        self._dimension_scores[d] = _ratio(total, weight) * SCORE_SCALE
+        self.dimension_scores[d] = self._dimension_scores[d]
+
+        # Same order as ScoringModel._overall() (its zero terms for unscored dimensions change nothing)
+        total = 0.0
+        weight = 0.0
+        for score, dimension_weight in zip(self._dimension_scores, layout["dimension_weights"]):
+            if score == score:
+                total += score * dimension_weight
+                weight += dimension_weight
+        self.overall = _ratio(total, weight)
+
+    def set_answers(self, answers):
+        """
+        Bring the scorer up to date with a full answer vector, updating only the questions that changed;
+        returns the number of changed answers
+        """
+        answers = np.asarray(answers, dtype=float)
+        changed = np.flatnonzero((answers != self.answers) & ~(np.isnan(answers) & np.isnan(self.answers)))
+        for question in changed.tolist():
+            self.update(question, answers[question])
+        return len(changed)
+
+    def scores(self):
+        """
+        Return ({dimension: score}, overall score) for the scored dimensions
+        """
+        return self.model.as_dimension_scores(self.dimension_scores, self.overall)
+
+
+def qlearning_weights(initial_q, alpha, gamma, reward, iterations, eta):
+    """
+    Run calculate_scores' Q-learning for one dimension under many parameter profiles at once.
+    initial_q holds the sub-categories' starting Q-values (S,); the parameters are scalars or (P,) arrays.
+    Returns (final Q-values, softmax sub-category weights), both (P, S).
+    """
+    alpha, gamma, reward, eta = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (alpha, gamma, reward, eta))
+    iterations = np.atleast_1d(np.asarray(iterations, dtype=int))
+    profiles = np.broadcast(alpha, gamma, reward, iterations, eta).shape
+    q = np.broadcast_to(np.asarray(initial_q, dtype=float), profiles + (len(initial_q),)).copy()
+
+    # Sub-categories update in turn, each seeing the ones already updated in this sweep;
+    # profiles with fewer sweeps keep their Q-values once done
+    for sweep in range(int(iterations.max(initial=0))):
+        active = np.broadcast_to(sweep < iterations, profiles)
+        for c in range(q.shape[-1]):
+            updated = q[..., c] + alpha * (reward + gamma * q.max(axis=-1) - q[..., c])
+            q[..., c] = np.where(active, updated, q[..., c])
+
+    exp_q = np.exp(np.broadcast_to(eta, profiles)[..., np.newaxis] * q)
+    return q, exp_q / np.sum(exp_q, axis=-1, keepdims=True)
+
+
+def get_scoring_model(all_questionnaires):
+    """
+    Return the default (flat average) scoring model for a questionnaire layout, compiled once per process
+    """
+    key = questionnaire_hash(all_questionnaires)
+    model = _models.get(key)
+    if model is None:
+        model = _models[key] = ScoringModel(all_questionnaires)
+    return model
@@ -0,0 +1,139 @@
+"""
+Named, versioned scoring profiles stored as data and compiled once per process into scoring models
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from answer_codec import questionnaire_hash
+from scoring_model import QLEARNING_DEFAULTS, ScoringModel, get_scoring_model, qlearning_weights
+
+# Profile definitions (override with the AI_READINESS_SCORING_PROFILES environment variable)
+DEFAULT_PROFILES_PATH = os.environ.get(
+    "AI_READINESS_SCORING_PROFILES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_profiles.json")
+)
+
+# Profile used when none is selected, unless the profiles file names a default
+# (override with the AI_READINESS_SCORING_PROFILE environment variable)
+DEFAULT_PROFILE_ID = "flat-average-v1"
+
+# Weighting methods: flat averages, seeded simulated Q-learning, or explicit weights (e.g. trained on outcomes)
+PROFILE_METHODS = ("flat", "qlearning", "weights")
+
+_compiled = {}
+
+
+class ScoringProfile:
+    """
+    One scoring profile: an ID, a weighting method and its parameters, optionally bound to one questionnaire
+    layout (schema_hash). version is the ID plus a digest of everything that affects scores, so results
+    and caches keyed by it never mix up weights, even when a profile is edited without a new ID.
+    """
+
+    def __init__(self, profile_id, method, parameters=None, schema_hash=None, name=None, description=""):
+        if method not in PROFILE_METHODS:
+            raise ValueError(f"Scoring profile {profile_id!r} has unknown method {method!r}")
+        self.id = profile_id
+        self.method = method
+        self.parameters = dict(parameters or {})
+        self.schema_hash = schema_hash
+        self.name = name or profile_id
+        self.description = description
+        definition = json.dumps([method, self.parameters, schema_hash], sort_keys=True, ensure_ascii=False)
+        self.version = f"{profile_id}@{hashlib.sha256(definition.encode('utf-8')).hexdigest()[:12]}"
+
+    def applies_to(self, layout_hash):
+        """
+        Return True if the profile can score assessments of a questionnaire layout
+        """
+        return self.schema_hash is None or self.schema_hash == layout_hash
+
+    def weights(self, all_questionnaires):
+        """
+        Return (sub_category_weights, dimension_weights) in ScoringModel's form; None for flat averages
+        """
+        if self.method == "flat":
+            return None, None
+        if self.method == "qlearning":
+            parameters = {**QLEARNING_DEFAULTS, **self.parameters}
+            rng = np.random.default_rng(parameters.pop("seed", 0))
+            # One draw of initial Q-values per dimension, in layout order, as parameter_sweep does
+            sub_category_weights = {}
+            for dimension, questionnaire in all_questionnaires.items():
+                _, weights = qlearning_weights(rng.uniform(0, 1, len(questionnaire)), **parameters)
+                sub_category_weights[dimension] = weights[0].tolist()
+            return sub_category_weights, None
+        dimension_weights = self.parameters.get("dimension_weights")
+        return (
+            self.parameters.get("sub_category_weights"),
+            None if dimension_weights is None else {d: dimension_weights.get(d, 1.0) for d in all_questionnaires},
+        )
+
+    def compile(self, all_questionnaires):
+        """
+        Return a ScoringModel with this profile's weights folded into its aggregation arrays
+        """
+        if self.method == "flat":
+            return get_scoring_model(all_questionnaires)
+        sub_category_weights, dimension_weights = self.weights(all_questionnaires)
+        return ScoringModel(all_questionnaires, sub_category_weights, dimension_weights)
+
+
+def profile_from_artifact(artifact):
+    """
+    Return the scoring profile of a weights artifact from weight_trainer.py, named by the artifact's version
+    """
+    return ScoringProfile(
+        artifact["version"],
+        "weights",
+        {
+            "sub_category_weights": artifact["sub_category_weights"],
+            "dimension_weights": artifact["dimension_weights"],
+        },
+        schema_hash=artifact["questionnaire_hash"],
+        name=f"Trained on outcomes ({artifact['assessments']} assessments, {artifact['trained_at'][:10]})",
+        description="Sub-category and dimension weights learned from assessment outcomes",
+    )
+
+
+def load_profiles(path=DEFAULT_PROFILES_PATH, weights_artifact=None):
+    """
+    Return ({profile id: ScoringProfile}, default profile id) from the profiles file, plus the profile of a
+    trained weights artifact; the default is AI_READINESS_SCORING_PROFILE, the file's default or flat-average-v1
+    """
+    data = {"profiles": []}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    profiles = {}
+    for entry in data["profiles"]:
+        profile = ScoringProfile(
+            entry["id"], entry["method"], entry.get("parameters"), entry.get("schema_hash"),
+            entry.get("name"), entry.get("description", "")
+        )
+        if profile.id in profiles:
+            raise ValueError(f"Duplicate scoring profile id {profile.id!r} in {path}")
+        profiles[profile.id] = profile
+    if weights_artifact is not None:
+        trained = profile_from_artifact(weights_artifact)
+        profiles.setdefault(trained.id, trained)
+    if DEFAULT_PROFILE_ID not in profiles:
+        profiles[DEFAULT_PROFILE_ID] = ScoringProfile(DEFAULT_PROFILE_ID, "flat", name="Flat average")
+    default_id = os.environ.get("AI_READINESS_SCORING_PROFILE") or data.get("default") or DEFAULT_PROFILE_ID
+    if default_id not in profiles:
+        raise ValueError(f"Default scoring profile {default_id!r} is not defined")
+    return profiles, default_id
+
+
+def get_profile_model(profile, all_questionnaires):
+    """
+    Return the scoring model of a profile for a questionnaire layout, compiled once per process
+    """
+    key = (profile.version, questionnaire_hash(all_questionnaires))
+    model = _compiled.get(key)
+    if model is None:
+        model = _compiled[key] = profile.compile(all_questionnaires)
+    return model
@@ -0,0 +1,98 @@
+"""
+Deep-size memory accounting and budget enforcement for per-session state
+"""
+import os
+import sys
+import types
+from collections import deque
+
+# Per-session budget in KiB (AI_READINESS_SESSION_BUDGET_KB); accounting is off unless a budget is set
+DEFAULT_BUDGET_KB = 0
+
+# Objects shared by every session are not charged to any of them; classes can opt in with
+# a true shared_across_sessions attribute (e.g. process-wide compiled models held by session objects)
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def session_budget_bytes():
+    """
+    Return the configured per-session budget in bytes, or None when accounting is disabled
+    """
+    budget_kb = int(os.environ.get("AI_READINESS_SESSION_BUDGET_KB", DEFAULT_BUDGET_KB))
+    return budget_kb * 1024 if budget_kb > 0 else None
+
+
+def deep_size(obj, seen=None):
+    """
+    Return the approximate deep size of obj in bytes, following containers and instance attributes.
+    Pass the same seen set across calls to charge shared objects only once.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES) or getattr(type(item), "shared_across_sessions", False):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif isinstance(item, (str, bytes, bytearray, int, float, bool)) or item is None:
+            continue
+        else:
+            attributes = getattr(item, "__dict__", None)
+            if attributes is not None:
+                stack.append(attributes)
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return size
+
+
+def measure_state(state, group=None, exclude=()):
+    """
+    Return {"total": bytes, "keys": {name: bytes}} for a session state mapping.
+    group(key) may map keys to a shared name (e.g. all question widgets) so they are reported together.
+    """
+    seen = set()
+    sizes = {}
+    for key, value in state.items():
+        if key in exclude:
+            continue
+        name = group(key) if group else key
+        sizes[name] = sizes.get(name, 0) + deep_size(key, seen) + deep_size(value, seen)
+    return {
+        "total": sum(sizes.values()),
+        "keys": dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True)),
+    }
+
+
+def compact_state(state, budget, steps, group=None, exclude=()):
+    """
+    Apply compaction steps in order until the state fits the budget.
+    Each step is (key, keep): sequences are trimmed to their last keep items, and keep=0 evicts the key.
+    Returns (usage after compaction, list of applied steps).
+    """
+    usage = measure_state(state, group, exclude)
+    applied = []
+    for key, keep in steps:
+        if usage["total"] <= budget:
+            break
+        if key not in state:
+            continue
+        value = state[key]
+        if keep == 0:
+            del state[key]
+        elif len(value) > keep:
+            trimmed = list(value)[-keep:]
+            state[key] = deque(trimmed, maxlen=value.maxlen) if isinstance(value, deque) else trimmed
+        else:
+            continue
+        applied.append((key, keep))
+        usage = measure_state(state, group, exclude)
+    return usage, applied
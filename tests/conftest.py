@@ -0,0 +1,78 @@
+"""
+Shared fixtures for the tests: repository imports, a throwaway assessment store and AppTest helpers
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# The app opens its store at import time, so point it at a scratch database before anything imports it
+os.environ["AI_READINESS_DB"] = os.path.join(tempfile.mkdtemp(prefix="ai-readiness-tests-"), "assessments.db")
+
+APP_PATH = os.path.join(ROOT, "ai_readiness_assessment_app.py")
+
+
+def restore_radio_labels(at):
+    """
+    AppTest reports radios that use a format_func by index; set them back to their option labels
+    """
+    for radio in at.radio:
+        if isinstance(radio.value, int):
+            radio.set_value(radio.options[radio.value])
+
+
+def navigate(at, page):
+    """
+    Switch pages through the sidebar navigation, as a user would
+    """
+    at.sidebar.radio[0].set_value(page).run()
+    # The page change reruns the script; run again to get the new page's elements
+    at.run()
+    restore_radio_labels(at)
+    return at
+
+
+def sidebar_selectbox(at, key):
+    return next(selectbox for selectbox in at.sidebar.selectbox if selectbox.key == key)
+
+
+def answer_all(at, seed=0):
+    """
+    Answer every question on the Assessment page with seeded random levels
+    """
+    rng = np.random.default_rng(seed)
+    for radio in at.radio:
+        if radio.key and "_" in radio.key and not radio.key.startswith("perf"):
+            radio.set_value(radio.options[int(rng.integers(len(radio.options)))])
+    at.run()
+    restore_radio_labels(at)
+    return at
+
+
+def button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def submit(at):
+    """
+    Submit the answered assessment; the app then reruns onto the Results page
+    """
+    button(at, "Submit Assessment").click().run()
+    at.run()
+    restore_radio_labels(at)
+    return at
+
+
+@pytest.fixture
+def app():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+    return at
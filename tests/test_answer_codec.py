@@ -0,0 +1,79 @@
+"""
+Answers survive packing, encoding and tokens unchanged, and encodings for another questionnaire are rejected
+"""
+import numpy as np
+import pytest
+
+from answer_codec import (
+    CODEC_VERSION, HEADER, MAX_ANSWER, UNANSWERED_CODE, decode_answers, decode_answers_array, decode_responses,
+    deserialize_answers, encode_answers, encode_responses, pack_answers, questionnaire_hash, serialize_answers,
+    unpack_answers
+)
+
+QUESTIONNAIRE = {
+    "AI Strategy": {"Vision": ["Is there a strategy?", "Is it funded?"], "Roadmap": ["Is there a roadmap?"]},
+    "AI Culture": {"Change": ["Is change supported?", "Are staff trained?", "Is AI use encouraged?"]},
+}
+LEVELS = [None, *range(MAX_ANSWER + 1)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 8, 9, 117])
+def test_pack_round_trip_for_every_level(count):
+    answers = [LEVELS[i % len(LEVELS)] for i in range(count)]
+    packed = pack_answers(answers)
+    assert len(packed) == (3 * count + 7) // 8
+    assert unpack_answers(packed, count) == answers
+
+
+def test_unanswered_packs_as_code_7():
+    assert pack_answers([None]) == bytes([UNANSWERED_CODE])
+    assert pack_answers([None, 0, None]) == (UNANSWERED_CODE | UNANSWERED_CODE << 6).to_bytes(2, "little")
+
+
+def test_pack_rejects_levels_outside_the_scale():
+    with pytest.raises(ValueError):
+        pack_answers([MAX_ANSWER + 1])
+    with pytest.raises(ValueError):
+        unpack_answers(bytes([5]), 1)
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_responses_round_trip_through_tokens(level):
+    responses = {
+        "AI Strategy": {"Vision": [level, 4], "Roadmap": [None]},
+        "AI Culture": {"Change": [0, level, 3]},
+    }
+    assert decode_responses(encode_responses(responses, QUESTIONNAIRE), QUESTIONNAIRE) == responses
+    token = serialize_answers(responses, QUESTIONNAIRE)
+    assert "=" not in token
+    assert deserialize_answers(token, QUESTIONNAIRE) == responses
+
+
+def test_batch_decoding_matches_single_decoding():
+    layout_hash = questionnaire_hash(QUESTIONNAIRE)
+    rng = np.random.default_rng(0)
+    rows = [[LEVELS[i] for i in rng.integers(len(LEVELS), size=9)] for _ in range(20)]
+    decoded = decode_answers_array([encode_answers(row, layout_hash) for row in rows], layout_hash, 9)
+    expected = np.array([[np.nan if a is None else a for a in row] for row in rows], dtype=float)
+    assert np.array_equal(decoded, expected, equal_nan=True)
+
+
+def test_rejects_answers_for_another_questionnaire():
+    data = encode_responses({}, QUESTIONNAIRE)
+    other = {**QUESTIONNAIRE, "AI Data": {"Quality": ["Is data quality measured?"]}}
+    with pytest.raises(ValueError, match="different questionnaire"):
+        decode_responses(data, other)
+    with pytest.raises(ValueError):
+        deserialize_answers(serialize_answers({}, QUESTIONNAIRE), other)
+    with pytest.raises(ValueError):
+        decode_answers_array([data], questionnaire_hash(other), 6)
+
+
+def test_rejects_other_versions_and_damaged_encodings():
+    data = encode_responses({}, QUESTIONNAIRE)
+    with pytest.raises(ValueError, match="version"):
+        decode_responses(bytes([CODEC_VERSION + 1]) + data[1:], QUESTIONNAIRE)
+    with pytest.raises(ValueError, match="truncated"):
+        decode_responses(data[:HEADER.size - 1], QUESTIONNAIRE)
+    with pytest.raises(ValueError, match="length"):
+        decode_answers(data[:-1], questionnaire_hash(QUESTIONNAIRE))
@@ -0,0 +1,105 @@
+"""
+The store's write-behind thread keeps buffered assessments through failed writes, and its benchmark sketches
+follow resubmissions
+"""
+import sqlite3
+import time
+
+import pytest
+
+from answer_codec import encode_responses
+from assessment_store import SCHEMA_VERSION, AssessmentStore
+
+QUESTIONNAIRE = {"AI Strategy": {"Vision": ["Is there a strategy?"]}}
+ANSWERS = encode_responses({"AI Strategy": {"Vision": [2]}}, QUESTIONNAIRE)
+
+
+def stored_ids(store):
+    # Read the database directly: list_assessments() would flush on this thread and hide the writer's state
+    return [row["id"] for row in store._read_conn().execute("SELECT id FROM assessments ORDER BY id")]
+
+
+def test_writer_thread_survives_unexpected_errors(tmp_path, monkeypatch):
+    store = AssessmentStore(str(tmp_path / "assessments.db"), flush_interval=0.01)
+    layout_hash = store.register_questionnaire(QUESTIONNAIRE)
+    write_batch = store._write_batch
+    failures = []
+
+    def failing_once(batch, drafts):
+        if not failures:
+            failures.append(batch)
+            raise RuntimeError("unexpected failure")
+        return write_batch(batch, drafts)
+
+    monkeypatch.setattr(store, "_write_batch", failing_once)
+    try:
+        store.save_assessment("assessment-1", ANSWERS, layout_hash, status="completed")
+        deadline = time.time() + 5
+        while not failures and time.time() < deadline:
+            time.sleep(0.01)
+        assert failures
+
+        store.save_assessment("assessment-2", ANSWERS, layout_hash, status="completed")
+        deadline = time.time() + 5
+        while len(stored_ids(store)) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert store._writer.is_alive()
+        assert stored_ids(store) == ["assessment-1", "assessment-2"]
+    finally:
+        store.close()
+
+
+def test_listing_reads_do_not_wait_on_buffered_writes(tmp_path):
+    # A long flush interval keeps the save buffered for the duration of the test
+    store = AssessmentStore(str(tmp_path / "assessments.db"), flush_interval=60)
+    layout_hash = store.register_questionnaire(QUESTIONNAIRE)
+    try:
+        store.save_assessment("assessment-1", ANSWERS, layout_hash, status="completed",
+                              scores={"AI Strategy": 50.0}, overall_score=50.0, scoring_profile="flat@1")
+        assert store.list_assessments() == []
+        assert store.benchmark_sketches("flat@1", layout_hash) == {}
+        assert store.get_assessment("assessment-1")["status"] == "completed"
+
+        store.flush()
+        assert [row["id"] for row in store.list_assessments()] == ["assessment-1"]
+        assert store.benchmark_sketches("flat@1", layout_hash)["AI Strategy"].total == 1
+    finally:
+        store.close()
+
+
+def test_rejects_databases_from_a_newer_schema(tmp_path):
+    path = str(tmp_path / "assessments.db")
+    AssessmentStore(path).close()
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE schema_meta SET value = ? WHERE key = 'schema_version'", (str(SCHEMA_VERSION + 1),))
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(RuntimeError, match="newer than supported"):
+        AssessmentStore(path)
+
+
+def test_resaving_without_scores_keeps_the_assessment_in_the_benchmark(tmp_path):
+    store = AssessmentStore(str(tmp_path / "assessments.db"), flush_interval=60)
+    layout_hash = store.register_questionnaire(QUESTIONNAIRE)
+    try:
+        store.save_assessment("assessment-1", ANSWERS, layout_hash, status="completed", industry="Retail",
+                              scores={"AI Strategy": 50.0}, overall_score=50.0, scoring_profile="flat@1")
+        store.flush()
+        store.save_assessment("assessment-1", ANSWERS, layout_hash, organisation="Acme", status="completed",
+                              industry="Retail")
+        store.flush()
+
+        stored = store.get_assessment("assessment-1")
+        assert (stored["organisation"], stored["overall_score"], stored["scoring_profile"]) == ("Acme", 50.0, "flat@1")
+        assert store.get_scores("assessment-1") == {"AI Strategy": 50.0}
+        sketches = store.benchmark_sketches("flat@1", layout_hash)
+        assert sketches["AI Strategy"].total == 1
+        assert store.benchmark_sketches("flat@1", layout_hash, industry="Retail")["Overall"].total == 1
+
+        # A rebuild from the stored scores agrees with the incremental updates
+        store.rebuild_sketches()
+        assert store.benchmark_sketches("flat@1", layout_hash)["AI Strategy"].counts.tolist() == \
+            sketches["AI Strategy"].counts.tolist()
+    finally:
+        store.close()
@@ -0,0 +1,48 @@
+"""
+Bulk report runs resume from their checkpoint without mixing up report formats, and render charts once
+per set of displayed scores
+"""
+import os
+
+from assessment_store import AssessmentStore
+import bulk_reports
+
+QUESTIONNAIRE = {"AI Strategy": {"Vision": ["Is there a strategy?"]}, "AI Culture": {"Change": ["Is change supported?"]}}
+
+
+def make_store(path):
+    store = AssessmentStore(str(path))
+    layout_hash = store.register_questionnaire(QUESTIONNAIRE)
+    for i, organisation in enumerate(["Acme", "Globex"]):
+        scores = {"AI Strategy": 40.0 + i * 10, "AI Culture": 60.0}
+        store.save_assessment(f"assessment-{i}", b"\x00", layout_hash, organisation=organisation, status="completed",
+                              scores=scores, overall_score=sum(scores.values()) / 2)
+    store.close()
+
+
+def reports(output_dir, extension):
+    return sorted(name for name in os.listdir(output_dir) if name.endswith(extension))
+
+
+def test_pdf_run_after_html_run_renders_pdfs(tmp_path, capsys):
+    db_path = tmp_path / "assessments.db"
+    output_dir = tmp_path / "reports"
+    make_store(db_path)
+    arguments = [str(db_path), "--output-dir", str(output_dir), "--workers", "1"]
+
+    bulk_reports.main(arguments + ["--format", "html"])
+    assert len(reports(output_dir, ".html")) == 2
+
+    bulk_reports.main(arguments + ["--format", "pdf"])
+    assert len(reports(output_dir, ".pdf")) == 2
+    assert "2 reports to render" in capsys.readouterr().out
+
+    # A repeated run of either format has nothing left to do
+    bulk_reports.main(arguments + ["--format", "html"])
+    assert "0 reports to render in 0 unique chart sets (2 already done)" in capsys.readouterr().out
+
+
+def test_scores_that_display_the_same_share_a_chart_set():
+    shown = bulk_reports.chart_key({"AI Strategy": 40.2, "AI Culture": 60.9}, 50.55)
+    assert bulk_reports.chart_key({"AI Culture": 60.1, "AI Strategy": 40.8}, 50.45) == shown
+    assert bulk_reports.chart_key({"AI Strategy": 41.0, "AI Culture": 60.9}, 50.95) != shown
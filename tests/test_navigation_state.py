@@ -0,0 +1,38 @@
+"""
+Sidebar choices must survive page changes, which rerun the script before the sidebar widgets render
+"""
+from conftest import answer_all, navigate, sidebar_selectbox, submit
+
+NON_DEFAULT_PROFILE = "qlearning-simulated-v1"
+
+
+def test_scoring_profile_is_kept_across_pages_and_used_for_results(app):
+    assert NON_DEFAULT_PROFILE in sidebar_selectbox(app, "scoring_profile").options
+    sidebar_selectbox(app, "scoring_profile").set_value(NON_DEFAULT_PROFILE).run()
+
+    navigate(app, "Assessment")
+    assert app.session_state["scoring_profile"] == NON_DEFAULT_PROFILE
+    answer_all(app)
+    submit(app)
+
+    assert not app.exception
+    assert app.session_state["nav"] == "Results"
+    captions = [caption.value for caption in app.caption if caption.value.startswith("Scored with")]
+    assert captions and f"({NON_DEFAULT_PROFILE}@" in captions[0]
+    assert any(f"profile={NON_DEFAULT_PROFILE}" in code.value for code in app.code)
+
+    from ai_readiness_assessment_app import get_assessment_store
+    stored = get_assessment_store().get_assessment(app.session_state["assessment_id"])
+    assert stored["scoring_profile"].startswith(f"{NON_DEFAULT_PROFILE}@")
+
+
+def test_preview_policy_is_kept_across_pages(app):
+    navigate(app, "Assessment")
+    sidebar_selectbox(app, "preview_policy").set_value("Count as Defined").run()
+
+    navigate(app, "Home")
+    navigate(app, "Assessment")
+
+    assert not app.exception
+    assert app.session_state["preview_policy"] == "Count as Defined"
+    assert sidebar_selectbox(app, "preview_policy").value == "Count as Defined"
@@ -0,0 +1,31 @@
+"""
+The performance log imports and measures memory on platforms without the resource module
+"""
+import builtins
+import importlib
+import sys
+
+import perf_log
+
+
+def test_imports_and_reads_rss_without_resource_module(monkeypatch):
+    # As on Windows: no resource module and no /proc
+    monkeypatch.setitem(sys.modules, "resource", None)
+    real_open = builtins.open
+
+    def open_without_proc(path, *args, **kwargs):
+        if str(path).startswith("/proc/"):
+            raise FileNotFoundError(path)
+        return real_open(path, *args, **kwargs)
+
+    try:
+        module = importlib.reload(perf_log)
+        assert module.resource is None
+        monkeypatch.setattr(builtins, "open", open_without_proc)
+        assert module.current_rss_bytes() == 0
+    finally:
+        monkeypatch.undo()
+        importlib.reload(perf_log)
+
+    assert perf_log.resource is not None
+    assert perf_log.current_rss_bytes() > 0
@@ -0,0 +1,40 @@
+"""
+Background PDF jobs render the same report header as the HTML export
+"""
+from concurrent.futures import Future
+
+from report_export import generate_pdf_report
+from report_jobs import ReportJobs
+
+SCORES = {"AI Strategy": 40.0, "AI Culture": 60.0}
+
+
+class RecordingExecutor:
+    """
+    Stands in for the process pool: records each call and returns an unfinished future
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, func, *args):
+        self.calls.append((func, args))
+        return Future()
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def test_pdf_jobs_render_for_the_organisation():
+    jobs = ReportJobs(max_workers=1)
+    jobs._executor.shutdown()
+    jobs._executor = RecordingExecutor()
+
+    acme = jobs.submit(("token", "flat@1", "Acme"), SCORES, 50.0, "Acme")
+    assert jobs._executor.calls == [(generate_pdf_report, (SCORES, 50.0, "Acme"))]
+
+    # A different organisation is a different report; the same one reuses its job
+    globex = jobs.submit(("token", "flat@1", "Globex"), SCORES, 50.0, "Globex")
+    assert globex is not acme
+    assert jobs.submit(("token", "flat@1", "Acme"), SCORES, 50.0, "Acme") is acme
+    assert [args[2] for _, args in jobs._executor.calls] == ["Acme", "Globex"]
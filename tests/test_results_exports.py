@@ -0,0 +1,34 @@
+"""
+Report exports on the Results page never hold the session's script thread
+"""
+import time
+
+from conftest import answer_all, button, navigate, submit
+
+PDF_PENDING = "Generating your PDF report..."
+
+
+def timed_run(at):
+    started = time.perf_counter()
+    at.run()
+    return time.perf_counter() - started
+
+
+def test_pending_pdf_job_does_not_slow_reruns(app):
+    navigate(app, "Assessment")
+    answer_all(app)
+    submit(app)
+    baseline = min(timed_run(app) for _ in range(2))
+
+    started = time.perf_counter()
+    button(app, "Export as PDF").click().run()
+    pending_runs = [time.perf_counter() - started]
+    # The worker process takes a few seconds to start, so the job is still pending for these reruns
+    assert PDF_PENDING in [info.value for info in app.info]
+    pending_runs.extend(timed_run(app) for _ in range(2))
+
+    assert not app.exception
+    assert PDF_PENDING in [info.value for info in app.info]
+    # A wait on the script thread would slow every pending rerun; the starting worker competes for the CPU
+    # with some of them, so compare the fastest
+    assert min(pending_runs) < baseline + 0.5, (baseline, pending_runs)
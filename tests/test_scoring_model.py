@@ -0,0 +1,165 @@
+"""
+The vectorized scoring paths agree with each other and with the dict loops they replaced
+"""
+import numpy as np
+import pytest
+
+from scoring_model import (
+    ANSWER_LEVELS, QLEARNING_DEFAULTS, SCORE_SCALE, UNANSWERED_POLICIES, IncrementalScorer, ScoringModel,
+    qlearning_weights
+)
+
+# Uneven sub-categories, including single-question ones, so weights and counts do not cancel out
+QUESTIONNAIRE = {
+    "AI Governance": {"Roles": ["q1", "q2", "q3"], "Compliance": ["q4"], "Ethics": ["q5", "q6"]},
+    "AI Culture": {"Leadership": ["q7", "q8", "q9", "q10"], "Skills": ["q11", "q12"]},
+    "AI Infrastructure": {"Data": ["q13"], "Compute": ["q14", "q15", "q16"], "Security": ["q17", "q18"]},
+}
+
+# What-if gains are differences of weighted means, so they carry a few units in the last place of a 0-100 score
+GAIN_TOLERANCE = 4 * np.spacing(100.0)
+
+
+def models():
+    rng = np.random.default_rng(0)
+    sub_category_weights = {
+        dimension: rng.dirichlet(np.ones(len(questionnaire))).tolist()
+        for dimension, questionnaire in QUESTIONNAIRE.items()
+    }
+    dimension_weights = {dimension: float(rng.uniform(0.5, 2)) for dimension in QUESTIONNAIRE}
+    return {
+        "flat": ScoringModel(QUESTIONNAIRE),
+        "weighted": ScoringModel(QUESTIONNAIRE, sub_category_weights, dimension_weights),
+    }
+
+
+def random_answers(rng, count, unanswered=0.3):
+    answers = rng.integers(ANSWER_LEVELS, size=count).astype(float)
+    answers[rng.random(count) < unanswered] = np.nan
+    return answers
+
+
+@pytest.mark.parametrize("policy", list(UNANSWERED_POLICIES))
+@pytest.mark.parametrize("model_name", ["flat", "weighted"])
+def test_incremental_scorer_equals_score_batch(model_name, policy):
+    model = models()[model_name]
+    rng = np.random.default_rng(1)
+    scorer = IncrementalScorer(model, random_answers(rng, model.question_count), policy)
+
+    for step in range(500):
+        if step % 100 == 99:
+            scorer.set_answers(random_answers(rng, model.question_count, unanswered=rng.random()))
+        else:
+            level = int(rng.integers(-1, ANSWER_LEVELS))
+            scorer.update(int(rng.integers(model.question_count)), None if level < 0 else level)
+
+        batch = model.score_batch(scorer.answers, policy)
+        assert np.array_equal(scorer.sub_scores, batch["sub_categories"][0], equal_nan=True)
+        assert np.array_equal(scorer.dimension_scores, batch["dimensions"][0], equal_nan=True)
+        assert np.array_equal(scorer.overall, batch["overall"][0], equal_nan=True)
+
+
+@pytest.mark.parametrize("policy", list(UNANSWERED_POLICIES))
+@pytest.mark.parametrize("model_name", ["flat", "weighted"])
+def test_rank_improvements_matches_rescoring_each_candidate(model_name, policy):
+    model = models()[model_name]
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        answers = model.impute(random_answers(rng, model.question_count, unanswered=rng.random()), policy)
+        ranked = model.rank_improvements(answers, policy)
+        base = model.score_batch(answers)
+
+        # Every question raised to every higher level, or answered at any level if unanswered
+        expected = sum(ANSWER_LEVELS if np.isnan(a) else ANSWER_LEVELS - 1 - int(a) for a in answers)
+        assert len(ranked["question"]) == expected
+
+        for question, to_level, dimension_gain, overall_gain in zip(
+            ranked["question"], ranked["to_level"], ranked["dimension_gain"], ranked["overall_gain"]
+        ):
+            improved = answers.copy()
+            improved[question] = to_level
+            rescored = model.score_batch(improved)
+            d = model.question_dimension[question]
+            assert overall_gain == pytest.approx(
+                rescored["overall"][0] - np.nan_to_num(base["overall"][0]), abs=GAIN_TOLERANCE
+            )
+            assert dimension_gain == pytest.approx(
+                rescored["dimensions"][0][d] - np.nan_to_num(base["dimensions"][0][d]), abs=GAIN_TOLERANCE
+            )
+
+
+def flat_loop_scores(responses):
+    # The Results page's original loop: mean answer per dimension over answered questions, unweighted overall
+    category_scores = {}
+    for category, category_responses in responses.items():
+        total = 0
+        count = 0
+        for answers in category_responses.values():
+            for answer in answers:
+                if answer is not None:
+                    total += answer
+                    count += 1
+        if count > 0:
+            category_scores[category] = total / count * 25
+    overall = sum(category_scores.values()) / len(category_scores) if category_scores else 0
+    return category_scores, overall
+
+
+def weighted_loop_scores(responses, softmax_weights):
+    # calculate_scores' original loop: softmax-weighted mean answer of each dimension's question categories
+    return {
+        category: sum(np.mean(answers) * softmax_weights[category][i] for i, answers in enumerate(data.values()))
+        for category, data in responses.items()
+    }
+
+
+def qlearning_loop(initial_q, alpha, gamma, reward, iterations, eta):
+    q = dict(enumerate(initial_q))
+    for _ in range(iterations):
+        for c in q:
+            q[c] = q[c] + alpha * (reward + gamma * max(q.values()) - q[c])
+    exp_q = np.exp(eta * np.array(list(q.values())))
+    return list(q.values()), exp_q / np.sum(exp_q)
+
+
+def responses_from(answers):
+    values = iter(answers.tolist())
+    return {
+        dimension: {
+            q_category: [None if np.isnan(a) else int(a) for a in (next(values) for _ in questions)]
+            for q_category, questions in questionnaire.items()
+        }
+        for dimension, questionnaire in QUESTIONNAIRE.items()
+    }
+
+
+def test_flat_model_matches_the_results_loop():
+    model = models()["flat"]
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        responses = responses_from(random_answers(rng, model.question_count, unanswered=rng.random()))
+        scores, overall = model.score(responses, QUESTIONNAIRE)
+        loop_scores, loop_overall = flat_loop_scores(responses)
+        assert scores.keys() == loop_scores.keys()
+        for dimension, score in scores.items():
+            assert score == pytest.approx(loop_scores[dimension], abs=1e-14)
+        assert overall == pytest.approx(loop_overall, abs=1e-14)
+
+
+def test_weighted_model_matches_the_q_learning_loops():
+    rng = np.random.default_rng(4)
+    softmax_weights = {}
+    for dimension, questionnaire in QUESTIONNAIRE.items():
+        initial_q = rng.uniform(0, 1, len(questionnaire))
+        q, weights = qlearning_weights(initial_q, **QLEARNING_DEFAULTS)
+        loop_q, loop_weights = qlearning_loop(initial_q, **QLEARNING_DEFAULTS)
+        assert q[0] == pytest.approx(loop_q, abs=1e-14)
+        assert weights[0] == pytest.approx(loop_weights, abs=1e-14)
+        softmax_weights[dimension] = weights[0]
+
+    model = ScoringModel(QUESTIONNAIRE, sub_category_weights=softmax_weights)
+    for _ in range(200):
+        answers = random_answers(rng, model.question_count, unanswered=0)
+        dimensions = model.score_batch(answers)["dimensions"][0]
+        loop_scores = weighted_loop_scores(responses_from(answers), softmax_weights)
+        assert dimensions / SCORE_SCALE == pytest.approx(list(loop_scores.values()), abs=1e-14)
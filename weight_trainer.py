@@ -0,0 +1,347 @@
+"""
+Offline trainer that learns sub-category and dimension weights from assessments labelled with outcomes.
+
+Usage:
+    python weight_trainer.py assessments.db --outcomes outcomes.csv --output scoring_weights.json --workers 4
+
+Outcomes are values between 0 and 1 recorded against completed assessments (e.g. 1 if the
+organisation's AI project succeeded, 0 if not); --outcomes imports them into the store from a CSV
+with assessment_id and outcome columns first. Each sub-category and dimension has a Q-value, and
+the weights are softmaxes of the Q-values (with temperature eta) within each dimension and across
+dimensions, as in calculate_scores. Instead of simulating updates with a constant reward, the
+Q-values are learned from the outcomes: the weighted overall score predicts the outcome through a
+logistic link, and the Q-values follow the gradient of its log loss over the whole dataset at once.
+All Q-values at zero reproduce the flat average of the Results page, and the L2 penalty pulls them
+back towards it. Temperature and penalty are chosen by k-fold cross-validation, with the fits run in
+parallel processes, and the chosen setting is refitted on all outcomes and written as a versioned
+JSON artifact that the app loads once at startup (AI_READINESS_WEIGHTS).
+"""
+import argparse
+import csv
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from answer_codec import decode_answers_array
+from assessment_store import AssessmentStore
+from scoring_model import ANSWER_LEVELS, get_scoring_model
+
+# Bump when the artifact layout changes; the app ignores artifacts of other formats
+ARTIFACT_FORMAT = 1
+
+# Default artifact location (override with the AI_READINESS_WEIGHTS environment variable)
+DEFAULT_WEIGHTS_PATH = os.environ.get(
+    "AI_READINESS_WEIGHTS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_weights.json")
+)
+
+# Gradient steps: Adam learning rate and full-dataset iterations per fit
+TRAINING_DEFAULTS = {"learning_rate": 0.05, "iterations": 1500}
+
+# Cross-validated grid: softmax temperatures and L2 penalties on the Q-values
+TEMPERATURES = (0.5, 1.0, 2.0)
+PENALTIES = (0.001, 0.01, 0.1)
+FOLDS = 5
+
+# Keeps log losses finite when a prediction saturates
+PROBABILITY_EPSILON = 1e-9
+
+
+def sub_category_features(model, answers):
+    """
+    Return (n, S) mean answers per sub-category on a 0-1 scale; unanswered sub-categories take the dataset mean
+    """
+    totals, counts = model.sub_totals(answers)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        features = totals / counts / (ANSWER_LEVELS - 1)
+    observed = ~np.isnan(features)
+    column_means = np.divide(
+        np.where(observed, features, 0.0).sum(axis=0), observed.sum(axis=0),
+        out=np.full(features.shape[1], 0.5), where=observed.any(axis=0)
+    )
+    return np.where(observed, features, column_means)
+
+
+def outcome_weights(model, sub_q, dimension_q, eta):
+    """
+    Return (sub-category weights within each dimension, dimension weights) from Q-values: softmaxes of
+    Q / eta, with sub-categories also weighted by their question count so zero Q-values give the flat average
+    """
+    logits = np.where(model.sub_sizes > 0, sub_q / eta + np.log(np.maximum(model.sub_sizes, 1)), -np.inf)
+    group_max = np.full(len(model.dimensions), -np.inf)
+    np.maximum.at(group_max, model.sub_dimension, logits)
+    exponentials = np.exp(logits - np.where(np.isfinite(group_max), group_max, 0.0)[model.sub_dimension])
+    sums = np.bincount(model.sub_dimension, exponentials, len(model.dimensions))
+    sub_weights = exponentials / np.where(sums > 0, sums, 1.0)[model.sub_dimension]
+    dimension_exponentials = np.exp(dimension_q / eta - np.max(dimension_q / eta))
+    return sub_weights, dimension_exponentials / dimension_exponentials.sum()
+
+
+def _forward(model, features, params, eta):
+    sub_weights, dimension_weights = outcome_weights(model, params["sub_q"], params["dimension_q"], eta)
+    membership = model.sub_dimension[:, np.newaxis] == np.arange(len(model.dimensions))
+    dimension_scores = (features * sub_weights) @ membership
+    overall = dimension_scores @ dimension_weights
+    probability = 1 / (1 + np.exp(-(params["scale"] * overall + params["bias"])))
+    return sub_weights, dimension_weights, dimension_scores, overall, probability
+
+
+def predict(model, features, params, eta):
+    """
+    Return the predicted outcome probability of each assessment under fitted parameters
+    """
+    return _forward(model, features, params, eta)[-1]
+
+
+def log_loss(probability, outcomes):
+    """
+    Return the mean binary cross-entropy of predictions against outcomes in [0, 1]
+    """
+    probability = np.clip(probability, PROBABILITY_EPSILON, 1 - PROBABILITY_EPSILON)
+    return float(-np.mean(outcomes * np.log(probability) + (1 - outcomes) * np.log(1 - probability)))
+
+
+def rank_auc(scores, outcomes):
+    """
+    Return the ROC AUC of scores for outcomes thresholded at 0.5, or None without both classes
+    """
+    positive = outcomes >= 0.5
+    n_positive = int(positive.sum())
+    n_negative = len(outcomes) - n_positive
+    if not n_positive or not n_negative:
+        return None
+    order = np.argsort(scores, kind="stable")
+    ranks = np.empty(len(scores))
+    ranks[order] = np.arange(1, len(scores) + 1)
+    # Tied scores share their mean rank
+    _, inverse, tie_counts = np.unique(scores, return_inverse=True, return_counts=True)
+    ranks = (np.bincount(inverse, ranks) / tie_counts)[inverse]
+    return float((ranks[positive].sum() - n_positive * (n_positive + 1) / 2) / (n_positive * n_negative))
+
+
+def fit_weights(model, features, outcomes, eta=1.0, l2=0.01, learning_rate=TRAINING_DEFAULTS["learning_rate"],
+                iterations=TRAINING_DEFAULTS["iterations"], learn_weights=True):
+    """
+    Fit Q-values (and the logistic link's scale and bias) to outcomes by full-batch Adam on the L2-penalised
+    log loss; every step is a handful of (n, S) array operations over the whole dataset.
+    learn_weights=False keeps the Q-values at zero, fitting only the link (the flat-average baseline).
+    Returns the parameters: sub_q (S,), dimension_q (D,), scale and bias.
+    """
+    mean_outcome = np.clip(outcomes.mean(), 0.01, 0.99)
+    params = {
+        "sub_q": np.zeros(len(model.sub_categories)),
+        "dimension_q": np.zeros(len(model.dimensions)),
+        "scale": np.array(0.0),
+        "bias": np.array(np.log(mean_outcome / (1 - mean_outcome))),
+    }
+    first = {name: np.zeros_like(value) for name, value in params.items()}
+    second = {name: np.zeros_like(value) for name, value in params.items()}
+    beta1, beta2 = 0.9, 0.999
+    n = len(features)
+
+    for step in range(1, iterations + 1):
+        sub_weights, dimension_weights, dimension_scores, overall, probability = _forward(model, features, params, eta)
+        residual = (probability - outcomes) / n
+        gradients = {"scale": np.array(residual @ overall), "bias": np.array(residual.sum())}
+        if learn_weights:
+            scaled = residual * params["scale"]
+            # Through the dimension softmax
+            dimension_grad = scaled @ dimension_scores
+            gradients["dimension_q"] = (
+                dimension_weights * (dimension_grad - dimension_grad @ dimension_weights) / eta
+                + l2 * params["dimension_q"]
+            )
+            # Through each dimension's sub-category softmax
+            sub_grad = (scaled @ features) * dimension_weights[model.sub_dimension]
+            group_mean = np.bincount(model.sub_dimension, sub_weights * sub_grad, len(model.dimensions))
+            gradients["sub_q"] = (
+                sub_weights * (sub_grad - group_mean[model.sub_dimension]) / eta + l2 * params["sub_q"]
+            )
+        for name, gradient in gradients.items():
+            first[name] = beta1 * first[name] + (1 - beta1) * gradient
+            second[name] = beta2 * second[name] + (1 - beta2) * gradient ** 2
+            corrected = first[name] / (1 - beta1 ** step)
+            params[name] = params[name] - learning_rate * corrected / (np.sqrt(second[name] / (1 - beta2 ** step)) + 1e-8)
+
+    return {name: value.tolist() if value.ndim else float(value) for name, value in params.items()}
+
+
+def _as_arrays(params):
+    return {name: np.asarray(value, dtype=float) for name, value in params.items()}
+
+
+def _validate(task):
+    # One cross-validation fit; module-level so it can run in a worker process
+    model, features, outcomes, train, valid, eta, l2, settings = task
+    params = _as_arrays(fit_weights(model, features[train], outcomes[train], eta, l2, **settings))
+    return log_loss(predict(model, features[valid], params, eta), outcomes[valid])
+
+
+def cross_validate(model, features, outcomes, temperatures=TEMPERATURES, penalties=PENALTIES, folds=FOLDS,
+                   workers=None, seed=0, **settings):
+    """
+    Return {(eta, l2): mean validation log loss} over k folds; the fits run in parallel processes
+    """
+    folds = max(2, min(folds, len(features)))
+    assignment = np.random.default_rng(seed).permutation(len(features)) % folds
+    grid = list(itertools.product(temperatures, penalties))
+    tasks = [
+        (model, features, outcomes, assignment != fold, assignment == fold, eta, l2, settings)
+        for eta, l2 in grid for fold in range(folds)
+    ]
+    if workers == 1:
+        losses = [_validate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            losses = list(executor.map(_validate, tasks))
+    return {setting: float(np.mean(losses[i * folds:(i + 1) * folds])) for i, setting in enumerate(grid)}
+
+
+def build_artifact(model, layout_hash, params, eta, l2, validation, assessments, settings):
+    """
+    Return the versioned weights artifact for fitted parameters; the version names the training date and weights
+    """
+    params = _as_arrays(params)
+    sub_weights, dimension_weights = outcome_weights(model, params["sub_q"], params["dimension_q"], eta)
+    q_values = {dimension: {} for dimension in model.dimensions}
+    sub_category_weights = {dimension: [] for dimension in model.dimensions}
+    for (dimension, q_category), q, weight in zip(model.sub_categories, params["sub_q"], sub_weights):
+        q_values[dimension][q_category] = float(q)
+        sub_category_weights[dimension].append(float(weight))
+    weights = {
+        "q_values": q_values,
+        "sub_category_weights": sub_category_weights,
+        "dimension_q_values": dict(zip(model.dimensions, params["dimension_q"].tolist())),
+        "dimension_weights": dict(zip(model.dimensions, dimension_weights.tolist())),
+    }
+    digest = hashlib.sha256(json.dumps([layout_hash, weights], sort_keys=True).encode("utf-8")).hexdigest()
+    trained_at = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": f"outcome-{trained_at:%Y%m%d}-{digest[:8]}",
+        "trained_at": trained_at.isoformat(timespec="seconds"),
+        "questionnaire_hash": layout_hash,
+        "assessments": assessments,
+        "parameters": {"eta": eta, "l2": l2, **settings},
+        "validation": validation,
+        "outcome_model": {"scale": float(params["scale"]), "bias": float(params["bias"])},
+        **weights,
+    }
+
+
+def write_weights_artifact(artifact, path):
+    """
+    Write a weights artifact atomically, so a running app never reads a partial file
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(artifact, file, indent=2, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+def load_weights_artifact(path=DEFAULT_WEIGHTS_PATH):
+    """
+    Return the weights artifact at path, or None if there is none; raises ValueError for an unreadable one
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        artifact = json.load(file)
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} has artifact format {artifact.get('format')}, expected {ARTIFACT_FORMAT}")
+    return artifact
+
+
+def read_outcomes_csv(path):
+    """
+    Return {assessment id: outcome} from a CSV with assessment_id and outcome columns
+    """
+    with open(path, "r", newline="", encoding="utf-8") as file:
+        return {row["assessment_id"]: float(row["outcome"]) for row in csv.DictReader(file)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Learn scoring weights from assessments labelled with outcomes.")
+    parser.add_argument("db_path", help="Path to the SQLite assessment store")
+    parser.add_argument("--outcomes", help="CSV of assessment_id,outcome to record in the store before training")
+    parser.add_argument("--output", default=DEFAULT_WEIGHTS_PATH, help="Weights artifact to write")
+    parser.add_argument("--layout", help="Questionnaire hash to train on (default: the one with most outcomes)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel cross-validation processes")
+    parser.add_argument("--folds", type=int, default=FOLDS, help="Cross-validation folds")
+    parser.add_argument("--eta", default=",".join(map(str, TEMPERATURES)), help="Softmax temperatures to try")
+    parser.add_argument("--l2", default=",".join(map(str, PENALTIES)), help="L2 penalties to try")
+    parser.add_argument("--iterations", type=int, default=TRAINING_DEFAULTS["iterations"], help="Gradient steps per fit")
+    parser.add_argument("--learning-rate", type=float, default=TRAINING_DEFAULTS["learning_rate"])
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the fold assignment")
+    args = parser.parse_args(argv)
+    settings = {"learning_rate": args.learning_rate, "iterations": args.iterations}
+
+    store = AssessmentStore(args.db_path)
+    try:
+        if args.outcomes:
+            outcomes = read_outcomes_csv(args.outcomes)
+            if any(not 0 <= value <= 1 for value in outcomes.values()):
+                parser.error("Outcomes must be between 0 and 1")
+            unknown = store.record_outcomes(outcomes)
+            print(f"Recorded {len(outcomes) - len(unknown)} outcomes ({len(unknown)} unknown assessment ids skipped)")
+        layouts = [args.layout] if args.layout else list(store.questionnaire_counts())
+        labelled = {layout_hash: store.list_labelled_answers(layout_hash) for layout_hash in layouts}
+        layout_hash = max(labelled, key=lambda h: len(labelled[h]), default=None)
+        layout = store.get_questionnaire(layout_hash) if layout_hash else None
+    finally:
+        store.close()
+    rows = labelled.get(layout_hash) or []
+    if layout is None or len(rows) < args.folds:
+        print(f"Need at least {args.folds} completed assessments with outcomes to train", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    model = get_scoring_model(layout)
+    answers = decode_answers_array([row[1] for row in rows], layout_hash, model.question_count)
+    outcomes = np.array([row[2] for row in rows], dtype=float)
+    features = sub_category_features(model, answers)
+
+    temperatures = [float(value) for value in args.eta.split(",")]
+    penalties = [float(value) for value in args.l2.split(",")]
+    losses = cross_validate(model, features, outcomes, temperatures, penalties, args.folds, args.workers,
+                            args.seed, **settings)
+    baseline = cross_validate(model, features, outcomes, [1.0], [0.0], args.folds, 1, args.seed,
+                              learn_weights=False, **settings)[(1.0, 0.0)]
+    eta, l2 = min(losses, key=losses.get)
+    params = fit_weights(model, features, outcomes, eta, l2, **settings)
+    flat = fit_weights(model, features, outcomes, learn_weights=False, **settings)
+    validation = {
+        "log_loss": losses[(eta, l2)],
+        "flat_log_loss": baseline,
+        "train_auc": rank_auc(predict(model, features, _as_arrays(params), eta), outcomes),
+        "flat_train_auc": rank_auc(predict(model, features, _as_arrays(flat), 1.0), outcomes),
+    }
+    artifact = build_artifact(model, layout_hash, params, eta, l2, validation, len(rows), settings)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(rows)} labelled assessments, {len(losses) * args.folds} cross-validation fits "
+          f"on {args.workers} workers in {elapsed:.1f} s")
+    print(f"{'eta':>6} {'l2':>7} {'cv log loss':>12}")
+    for (row_eta, row_l2), loss in sorted(losses.items()):
+        print(f"{row_eta:>6g} {row_l2:>7g} {loss:>12.4f}" + ("  (chosen)" if (row_eta, row_l2) == (eta, l2) else ""))
+    print(f"Flat-average baseline: cv log loss {baseline:.4f}")
+    if validation["train_auc"] is not None:
+        print(f"Training AUC {validation['train_auc']:.3f} (flat average {validation['flat_train_auc']:.3f})")
+    print("\nDimension weights")
+    for dimension, weight in artifact["dimension_weights"].items():
+        print(f"  {dimension:<28} {weight:.3f}")
+
+    write_weights_artifact(artifact, args.output)
+    print(f"\nWrote {artifact['version']} to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())